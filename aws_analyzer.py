@@ -1,187 +1,251 @@
 #!/usr/bin/env python3
-import boto3
 import json
-from datetime import datetime
-from collections import defaultdict
+import sys
+import time
+from contextlib import ExitStack, nullcontext
+from datetime import datetime, timezone
+
+from collector import COLLECTORS, CollectionEngine, get_tag_value
+from dot_render import DotEmitter, layout, safe_label, write_dot
+from incremental import diff_estates, diff_summary, refresh, save_diff
+from placement import SERVICE_TYPES
+from queries import filter_estate
+from reachability import ReachabilityIndex
+from render_views import render_views
+from report_writers import SINKS, report_records, write_report
+from routing import RouteIndex
+from snapshot import (DEFAULT_SNAPSHOT_DIR, SnapshotError, latest_snapshot, load_snapshot,
+                      save_snapshot, stale_collections)
+from topology import TopologyIndex
 
 class AWSArchitectureMapper:
-    def __init__(self):
-        self.ec2 = boto3.client('ec2', region_name='ap-northeast-2')
-        self.rds = boto3.client('rds', region_name='ap-northeast-2')
-        self.elbv2 = boto3.client('elbv2', region_name='ap-northeast-2')
+    def __init__(self, region='ap-northeast-2', regions=None, accounts=None, processes=None, max_workers=8,
+                 snapshot_dir=DEFAULT_SNAPSHOT_DIR, from_snapshot=None, offline=False, use_cache=True,
+                 incremental=False, backend='dot', splines='ortho', output_format='png', lod=None,
+                 per_vpc=False, profiler=None, profile_path=None, reachability=True,
+                 report_formats=('text',), filters=None, history=None):
+        # diagrams 백엔드는 상세 수준(LOD) 축약을 지원하지 않음 (VPC별 뷰는 항상 DOT 렌더링)
+        if backend != 'dot' and lod is not None and not per_vpc:
+            raise ValueError(f"상세 수준 모드는 dot 백엔드에서만 지원합니다 (backend: {backend})")
+        self.region = region
+        self.regions = regions
+        self.accounts = accounts
+        self.processes = processes
+        self.snapshot_dir = snapshot_dir
+        self.from_snapshot = from_snapshot
+        self.offline = offline
+        self.use_cache = use_cache
+        self.incremental = incremental
+        self.backend = backend
+        self.splines = splines
+        self.output_format = output_format
+        self.lod = lod
+        self.per_vpc = per_vpc
+        self.last_diff = None
+        self.profiler = profiler
+        self.profile_path = profile_path
+        self.reachability = reachability
+        self.report_formats = tuple(report_formats)
+        self.report_files = {}
+        self.filters = filters
+        self.history = history
+        self.max_workers = max_workers
+        self.fetched_at = {}
+        self._engine = None
+        self._topology = None
+        self._route_index = None
+        self._reachability = None
 
-    def collect_infrastructure_data(self):
-        """실제 인프라 구성 요소 수집"""
-        print("🔍 AWS 인프라 구성 요소 수집 중...")
+    @property
+    def engine(self):
+        """수집 엔진 (boto3 세션/클라이언트는 처음 수집할 때 생성)"""
+        if self._engine is None:
+            self._engine = CollectionEngine(region=self.region, max_workers=self.max_workers,
+                                            client_hooks=[self.profiler.instrument] if self.profiler else None)
+        return self._engine
+
+    @property
+    def ec2(self):
+        """EC2 클라이언트 (지연 생성)"""
+        return self.engine.client('ec2')
+
+    @property
+    def rds(self):
+        """RDS 클라이언트 (지연 생성)"""
+        return self.engine.client('rds')
+
+    @property
+    def elbv2(self):
+        """ELBv2 클라이언트 (지연 생성)"""
+        return self.engine.client('elbv2')
+
+    def stage(self, name):
+        """프로파일링 단계 타이머 (프로파일러가 없으면 아무 일도 하지 않음)"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def load_infrastructure_data(self):
+        """스냅샷 재생 또는 TTL 캐시를 고려한 인프라 데이터 확보"""
+        # 오프라인 재생 (API 호출 없음)
+        if self.from_snapshot or self.offline:
+            path = self.from_snapshot or latest_snapshot(self.snapshot_dir)
+            if not path:
+                raise SnapshotError(f"오프라인 모드: {self.snapshot_dir} 에 스냅샷이 없습니다")
+            print(f"💾 스냅샷에서 로드 (API 호출 없음): {path}")
+            data, self.fetched_at = load_snapshot(path)
+            return data
+        
+        # 단일 리전 스캔은 TTL이 지난 리소스 타입만 재수집
+        cached = None
+        if (self.use_cache or self.incremental) and not (self.regions or self.accounts):
+            cached = latest_snapshot(self.snapshot_dir)
+        
+        fetched_at = None
+        if cached:
+            data, fetched_at = load_snapshot(cached)
+            if data.get('scope', {}).get('regions') != [self.region]:
+                data, fetched_at = None, None
+        
+        if fetched_at is not None and self.incremental:
+            return self.refresh_infrastructure_data(cached, data, fetched_at)
+        
+        if fetched_at is None:
+            self.fetched_at = {}
+            return self.recollect({}, list(COLLECTORS))
+        
+        self.fetched_at = fetched_at
+        stale = stale_collections(fetched_at, COLLECTORS, partial=data.get('partial'))
+        if not stale:
+            print(f"💾 캐시된 스냅샷이 유효하여 재사용: {cached}")
+            return data
+        
+        print(f"💾 캐시된 스냅샷 기준 만료 항목만 재수집: {', '.join(stale)}")
+        return self.recollect(data, stale)
+
+    def recollect(self, data, names):
+        """지정한 리소스 타입만 재수집하여 기존 데이터에 병합하고 스냅샷 저장 (타입별 수집 시각 갱신)"""
+        started = datetime.now(timezone.utc)
+        new_data = dict(data)
+        new_data.pop('partial', None)
+        new_data.update(self.collect_infrastructure_data(names))
+        self.fetched_at = dict(self.fetched_at, **{name: started for name in names})
+        
+        path = save_snapshot(new_data, self.snapshot_dir, self.fetched_at)
+        print(f"💾 스냅샷 저장: {path}")
+        self.record_history(new_data)
+        return new_data
+
+    def record_history(self, data):
+        """이력 저장소가 지정된 경우 수집 결과를 변경분만 기록 (실패해도 수집 결과는 그대로 사용)"""
+        if not self.history:
+            return
+        from history_store import HistoryError, HistoryStore
+
+        try:
+            with HistoryStore(self.history) as store:
+                snapshot_id, added = store.record(data, self.get_topology(data), self.fetched_at)
+        except HistoryError as e:
+            print(f"⚠️ {e}")
+            return
+        print(f"🗄️ 이력 기록: 스냅샷 #{snapshot_id}, 변경 행 {added}개 ({self.history})")
+
+    def load_scoped_data(self):
+        """인프라 데이터 확보 후 범위 필터(VPC ID / VPC 태그 / 리전) 적용"""
+        data = self.load_infrastructure_data()
+        if self.filters:
+            data = filter_estate(data, **self.filters)
+            print(f"🔎 범위 필터 적용: VPC {len(data['vpcs'])}개, 서브넷 {len(data['subnets'])}개")
+        return data
+
+    def refresh_infrastructure_data(self, base, data, fetched_at):
+        """기준 스냅샷에서 변경된 타입만 재수집하고 diff 저장"""
+        print(f"🔄 증분 갱신 (기준 스냅샷: {base})")
+        started = datetime.now(timezone.utc)
+        
+        new_data, refreshed = refresh(self.engine, data, fetched_at, list(COLLECTORS))
+        print(f"  - 재수집 항목: {', '.join(refreshed) if refreshed else '없음'}")
         
-        data = {}
+        self.last_diff = diff_estates(data, new_data)
+        for name, (added, removed, changed) in diff_summary(self.last_diff).items():
+            if added or removed or changed:
+                print(f"  - {name}: +{added} / -{removed} / ~{changed}")
         
-        # 네트워크 기본 구조
-        print("  - VPC 및 서브넷 정보...")
-        data['vpcs'] = self.ec2.describe_vpcs()['Vpcs']
-        data['subnets'] = self.ec2.describe_subnets()['Subnets']
-        data['route_tables'] = self.ec2.describe_route_tables()['RouteTables']
-        data['igws'] = self.ec2.describe_internet_gateways()['InternetGateways']
-        data['nats'] = self.ec2.describe_nat_gateways()['NatGateways']
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        diff_path = save_diff(self.last_diff, f"aws_infrastructure_diff_{timestamp}.json", base)
+        print(f"  - 변경 내역 저장: {diff_path}")
+        
+        # 변경 이벤트로 확인했거나 재수집한 타입만 갱신 시각으로 기록
+        self.fetched_at = {name: started for name in COLLECTORS if name in fetched_at or name in refreshed}
+        path = save_snapshot(new_data, self.snapshot_dir, self.fetched_at)
+        print(f"💾 스냅샷 저장: {path}")
+        self.record_history(new_data)
+        return new_data
+
+    def collect_infrastructure_data(self, names=None):
+        """실제 인프라 구성 요소 수집"""
+        print("🔍 AWS 인프라 구성 요소 수집 중...")
         
-        # 실제 배치된 리소스들
-        print("  - EC2 인스턴스...")
-        data['instances'] = self.get_ec2_instances()
+        # 다중 계정/리전 팬아웃
+        if self.regions or self.accounts:
+            from fanout import scan_estate
+            return scan_estate(self.accounts, self.regions or [self.region],
+                               self.processes, self.max_workers)
         
-        print("  - RDS 데이터베이스...")
-        data['rds_instances'] = self.get_rds_instances()
+        names = list(names or COLLECTORS)
+        print(f"  - VPC, 서브넷, 라우팅, EC2, RDS, 로드밸런서, ENI, 보안 그룹, NACL 병렬 수집 ({len(names)}개 수집기)...")
         
-        print("  - 로드밸런서...")
-        data['load_balancers'] = self.get_load_balancers()
+        data = self.engine.collect(names)
+        data['scope'] = {'accounts': [], 'regions': [self.region]}
+        if self.engine.errors:
+            data['partial'] = self.engine.partial()
         
+        print(f"  - 수집 완료 ({self.engine.elapsed:.1f}s)")
         return data
 
     def get_ec2_instances(self):
         """EC2 인스턴스 상세 정보"""
-        instances = []
-        try:
-            response = self.ec2.describe_instances()
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    if instance['State']['Name'] == 'terminated':
-                        continue
-                    
-                    instance_info = {
-                        'InstanceId': instance['InstanceId'],
-                        'InstanceType': instance['InstanceType'],
-                        'State': instance['State']['Name'],
-                        'SubnetId': instance.get('SubnetId'),
-                        'VpcId': instance.get('VpcId'),
-                        'PrivateIpAddress': instance.get('PrivateIpAddress'),
-                        'PublicIpAddress': instance.get('PublicIpAddress'),
-                        'AvailabilityZone': instance.get('Placement', {}).get('AvailabilityZone'),
-                        'SecurityGroups': [sg['GroupId'] for sg in instance.get('SecurityGroups', [])],
-                        'Name': self.get_tag_value(instance.get('Tags', []), 'Name'),
-                        'LaunchTime': instance.get('LaunchTime'),
-                        'Platform': instance.get('Platform', 'Linux'),
-                        'KeyName': instance.get('KeyName')
-                    }
-                    instances.append(instance_info)
-        except Exception as e:
-            print(f"    EC2 수집 오류: {e}")
-        
-        return instances
+        return self.engine.collect(['instances'])['instances']
 
     def get_rds_instances(self):
         """RDS 인스턴스 정보"""
-        rds_instances = []
-        try:
-            response = self.rds.describe_db_instances()
-            for db in response['DBInstances']:
-                if db['DBInstanceStatus'] == 'deleting':
-                    continue
-                
-                db_info = {
-                    'DBInstanceIdentifier': db['DBInstanceIdentifier'],
-                    'DBInstanceClass': db['DBInstanceClass'],
-                    'Engine': db['Engine'],
-                    'EngineVersion': db['EngineVersion'],
-                    'DBInstanceStatus': db['DBInstanceStatus'],
-                    'AvailabilityZone': db.get('AvailabilityZone'),
-                    'MultiAZ': db.get('MultiAZ', False),
-                    'VpcId': db.get('DBSubnetGroup', {}).get('VpcId'),
-                    'SubnetIds': [subnet['SubnetIdentifier'] for subnet in db.get('DBSubnetGroup', {}).get('Subnets', [])],
-                    'Endpoint': db.get('Endpoint', {}).get('Address'),
-                    'Port': db.get('Endpoint', {}).get('Port'),
-                    'AllocatedStorage': db.get('AllocatedStorage'),
-                    'DBName': db.get('DBName')
-                }
-                rds_instances.append(db_info)
-        except Exception as e:
-            print(f"    RDS 수집 오류: {e}")
-        
-        return rds_instances
+        return self.engine.collect(['rds_instances'])['rds_instances']
 
     def get_load_balancers(self):
         """로드밸런서 정보"""
-        load_balancers = []
-        try:
-            response = self.elbv2.describe_load_balancers()
-            for lb in response['LoadBalancers']:
-                lb_info = {
-                    'LoadBalancerName': lb['LoadBalancerName'],
-                    'LoadBalancerArn': lb['LoadBalancerArn'],
-                    'Type': lb['Type'],
-                    'Scheme': lb['Scheme'],
-                    'State': lb['State']['Code'],
-                    'VpcId': lb.get('VpcId'),
-                    'SubnetIds': [az['SubnetId'] for az in lb.get('AvailabilityZones', [])],
-                    'DNSName': lb.get('DNSName'),
-                    'CreatedTime': lb.get('CreatedTime')
-                }
-                load_balancers.append(lb_info)
-        except Exception as e:
-            print(f"    ELB 수집 오류: {e}")
-        
-        return load_balancers
+        return self.engine.collect(['load_balancers'])['load_balancers']
 
     def get_tag_value(self, tags, key):
         """태그에서 값 추출"""
-        for tag in tags:
-            if tag['Key'] == key:
-                return tag['Value']
-        return None
+        return get_tag_value(tags, key)
+
+    def get_topology(self, data):
+        """수집 데이터에 대한 토폴로지 인덱스 (데이터당 한 번만 생성)"""
+        if self._topology is None or self._topology.data is not data:
+            self._topology = TopologyIndex(
+                data, classify=lambda subnet: self.analyze_subnet_type(subnet, data['route_tables'])
+            )
+        return self._topology
+
+    def get_reachability(self, data):
+        """SG/NACL/라우트 기반 도달성 인덱스 (데이터당 한 번만 생성, --no-reachability면 None)"""
+        if not self.reachability:
+            return None
+        if self._reachability is None or self._reachability.data is not data:
+            self._reachability = ReachabilityIndex(data, self.get_topology(data), self.get_route_index(data['route_tables']))
+        return self._reachability
+
+    def get_route_index(self, route_tables):
+        """라우트 테이블 목록에 대한 서브넷 -> 유효 라우트 테이블 인덱스"""
+        if self._route_index is None or self._route_index.route_tables is not route_tables:
+            self._route_index = RouteIndex(route_tables)
+        return self._route_index
 
     def analyze_subnet_type(self, subnet, route_tables):
         """서브넷 타입 분석"""
-        subnet_id = subnet['SubnetId']
-        vpc_id = subnet['VpcId']
-        
-        # 연결된 라우트 테이블 찾기
-        associated_rt = None
-        for rt in route_tables:
-            if rt['VpcId'] != vpc_id:
-                continue
-            for assoc in rt.get('Associations', []):
-                if assoc.get('SubnetId') == subnet_id:
-                    associated_rt = rt
-                    break
-            if associated_rt:
-                break
-        
-        # 메인 라우트 테이블 확인
-        if not associated_rt:
-            for rt in route_tables:
-                if rt['VpcId'] == vpc_id:
-                    for assoc in rt.get('Associations', []):
-                        if assoc.get('Main', False):
-                            associated_rt = rt
-                            break
-                if associated_rt:
-                    break
-        
-        if not associated_rt:
-            return 'unknown'
-        
-        # 라우트 분석
-        for route in associated_rt.get('Routes', []):
-            if route.get('DestinationCidrBlock') == '0.0.0.0/0':
-                if route.get('GatewayId', '').startswith('igw-'):
-                    return 'public'
-                elif route.get('NatGatewayId'):
-                    return 'private'
-        
-        return 'isolated'
+        return self.get_route_index(route_tables).classify(subnet)
 
     def calculate_text_safe_name(self, text, max_length=15):
         """텍스트 길이를 안전하게 제한"""
-        if not text:
-            return "Unknown"
-        
-        if len(text) <= max_length:
-            return text
-        
-        # 긴 텍스트를 여러 줄로 분할
-        lines = []
-        for i in range(0, len(text), max_length):
-            lines.append(text[i:i+max_length])
-        
-        return '\n'.join(lines[:2])  # 최대 2줄까지만
+        return safe_label(text, max_length)
 
     def analyze_complexity(self, data):
         """인프라 복잡도 분석"""
@@ -198,21 +262,78 @@ class AWSArchitectureMapper:
         else:
             return "low", 1.0, "TB"
 
+    def generate_dot_diagram(self, data):
+        """diagrams 라이브러리 없이 DOT를 직접 생성하고 Graphviz로 렌더링"""
+        complexity, spacing, direction = self.analyze_complexity(data)
+        topology = self.get_topology(data)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        diagram_name = f"aws_architecture_fixed_{timestamp}"
+        
+        print(f"🎨 DOT 다이어그램 생성 중... (복잡도: {complexity}, 방향: {direction}, splines: {self.splines})")
+        
+        started = time.perf_counter()
+        emitter = DotEmitter(direction=direction, spacing=spacing, splines=self.splines,
+                             lod=self.lod, drilldown_dir=f"{diagram_name}_drilldown",
+                             reachability=self.get_reachability(data), drilldown_format=self.output_format)
+        dot_path = write_dot(f"{diagram_name}.dot", emitter.emit(data, topology))
+        emit_time = time.perf_counter() - started
+        
+        output, layout_time = layout(dot_path, self.output_format)
+        print(f"   노드 {emitter.node_count}개 (상세 수준: {emitter.level}), "
+              f"DOT 생성 {emit_time * 1000:.1f}ms, Graphviz 레이아웃 {layout_time:.2f}s")
+        
+        # 축약된 서브넷의 상세 보기
+        drilldowns = emitter.write_drilldowns(topology)
+        for path in drilldowns:
+            layout(path, self.output_format)
+        if drilldowns:
+            print(f"   축약된 서브넷 상세 보기 {len(drilldowns)}개: {diagram_name}_drilldown/")
+        
+        if output is None:
+            print("⚠️ Graphviz(dot)가 설치되지 않아 DOT 파일만 생성했습니다.")
+            return dot_path
+        
+        print(f"✅ 아키텍처 다이어그램 생성 완료: {output}")
+        return output
+
+    def generate_view_diagrams(self, data):
+        """VPC별 뷰와 개요 다이어그램을 병렬 렌더링 (변경 없는 뷰는 렌더 캐시 사용)"""
+        complexity, spacing, direction = self.analyze_complexity(data)
+        topology = self.get_topology(data)
+        
+        print(f"🎨 VPC별 뷰 렌더링 중... (VPC {len(data['vpcs'])}개, 방향: {direction})")
+        overview, _, _ = render_views(
+            data, topology, fmt=self.output_format, direction=direction, spacing=spacing,
+            splines=self.splines, lod=self.lod, workers=self.processes,
+            reachability=self.get_reachability(data)
+        )
+        
+        print(f"✅ 개요 다이어그램: {overview}")
+        return overview
+
     def generate_architecture_diagram(self, data):
         """동적 레이아웃이 적용된 아키텍처 다이어그램 생성"""
+        if self.per_vpc:
+            return self.generate_view_diagrams(data)
+        if self.backend == 'dot':
+            return self.generate_dot_diagram(data)
+        
         try:
             from diagrams import Diagram, Cluster
-            from diagrams.aws.compute import EC2
+            from diagrams.aws.compute import EC2, ECS, EKS, Lambda
             from diagrams.aws.database import RDS
-            from diagrams.aws.network import ELB, InternetGateway, NATGateway
+            from diagrams.aws.network import ELB, Endpoint, InternetGateway, NATGateway
             from diagrams.onprem.network import Internet
         except ImportError:
             print("❌ diagrams 라이브러리가 설치되지 않았습니다.")
             print("   설치 명령: pip install diagrams")
             return None
+        service_nodes = {'lambda': Lambda, 'ecs': ECS, 'eks': EKS, 'vpc_endpoint': Endpoint}
         
         # 복잡도 분석
         complexity, spacing, direction = self.analyze_complexity(data)
+        topology = self.get_topology(data)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         diagram_name = f"aws_architecture_fixed_{timestamp}"
@@ -221,7 +342,7 @@ class AWSArchitectureMapper:
         
         # 그래프 속성 설정
         graph_attr = {
-            "splines": "ortho",
+            "splines": self.splines,
             "nodesep": str(0.8 * spacing),
             "ranksep": str(1.0 * spacing),
             "pad": "1.0"
@@ -242,13 +363,8 @@ class AWSArchitectureMapper:
                 vpc_id = vpc['VpcId']
                 vpc_name = self.get_tag_value(vpc.get('Tags', []), 'Name') or f"VPC-{vpc_id[-8:]}"
                 
-                # VPC의 리소스 수 계산
-                vpc_subnets = [s for s in data['subnets'] if s['VpcId'] == vpc_id]
-                total_resources = 0
-                for subnet in vpc_subnets:
-                    total_resources += len([i for i in data['instances'] if i.get('SubnetId') == subnet['SubnetId']])
-                    total_resources += len([r for r in data['rds_instances'] if subnet['SubnetId'] in r.get('SubnetIds', [])])
-                    total_resources += len([l for l in data['load_balancers'] if subnet['SubnetId'] in l.get('SubnetIds', [])])
+                # VPC의 리소스 수
+                total_resources = topology.vpc_count(vpc_id)
                 
                 vpc_display_name = self.calculate_text_safe_name(vpc_name, 20)
                 
@@ -256,28 +372,15 @@ class AWSArchitectureMapper:
                     
                     # Internet Gateway
                     igw_node = None
-                    for igw in data['igws']:
-                        for attachment in igw.get('Attachments', []):
-                            if attachment.get('VpcId') == vpc_id and attachment.get('State') == 'available':
-                                igw_node = InternetGateway("IGW")
-                                internet >> igw_node
-                                break
+                    for igw in topology.vpc_igws.get(vpc_id, []):
+                        igw_node = InternetGateway("IGW")
+                        internet >> igw_node
                     
-                    # 가용영역별 그룹화
-                    az_groups = defaultdict(list)
-                    for subnet in vpc_subnets:
-                        az = subnet['AvailabilityZone']
-                        az_groups[az].append(subnet)
-                    
-                    # 각 AZ 처리
-                    for az, subnets in az_groups.items():
+                    # 가용영역별 처리
+                    for az, subnets in topology.vpc_azs.get(vpc_id, {}).items():
                         
-                        # AZ별 리소스 수 계산
-                        az_resources = 0
-                        for subnet in subnets:
-                            az_resources += len([i for i in data['instances'] if i.get('SubnetId') == subnet['SubnetId']])
-                            az_resources += len([r for r in data['rds_instances'] if subnet['SubnetId'] in r.get('SubnetIds', [])])
-                            az_resources += len([l for l in data['load_balancers'] if subnet['SubnetId'] in l.get('SubnetIds', [])])
+                        # AZ별 리소스 수
+                        az_resources = topology.az_count(vpc_id, az)
                         
                         if az_resources == 0:
                             continue  # 리소스가 없는 AZ는 건너뛰기
@@ -291,18 +394,16 @@ class AWSArchitectureMapper:
                                 if not subnet_name:
                                     subnet_name = f"subnet-{subnet_id[-8:]}"
                                 
-                                subnet_type = self.analyze_subnet_type(subnet, data['route_tables'])
-                                
                                 # 서브넷의 리소스들
-                                subnet_instances = [i for i in data['instances'] if i.get('SubnetId') == subnet_id]
-                                subnet_rds = [r for r in data['rds_instances'] if subnet_id in r.get('SubnetIds', [])]
-                                subnet_elbs = [l for l in data['load_balancers'] if subnet_id in l.get('SubnetIds', [])]
-                                
-                                subnet_resource_count = len(subnet_instances) + len(subnet_rds) + len(subnet_elbs)
-                                
-                                if subnet_resource_count == 0:
+                                if topology.subnet_count(subnet_id) == 0:
                                     continue  # 리소스가 없는 서브넷은 건너뛰기
                                 
+                                subnet_type = topology.subnet_type(subnet_id)
+                                resources = topology.resources(subnet_id)
+                                subnet_instances = resources['instances']
+                                subnet_rds = resources['rds_instances']
+                                subnet_elbs = resources['load_balancers']
+                                
                                 subnet_display_name = self.calculate_text_safe_name(subnet_name, 15)
                                 
                                 with Cluster(f"{subnet_display_name}\n({subnet_type})\n{subnet['CidrBlock']}"):
@@ -338,11 +439,15 @@ class AWSArchitectureMapper:
                                         # IGW 연결 (Public 서브넷인 경우)
                                         if subnet_type == 'public' and igw_node:
                                             igw_node >> elb_node
+                                    
+                                    # ENI로 배치된 서비스
+                                    for service in resources['services']:
+                                        safe_name = self.calculate_text_safe_name(service['ServiceId'], 12)
+                                        service_nodes[service['ServiceType']](f"{safe_name}\n{SERVICE_TYPES[service['ServiceType']]}")
                             
                             # NAT Gateway 처리
-                            for nat in data['nats']:
-                                nat_subnet_id = nat.get('SubnetId')
-                                if nat_subnet_id and nat_subnet_id in [s['SubnetId'] for s in subnets]:
+                            for subnet in subnets:
+                                for nat in topology.subnet_nats.get(subnet['SubnetId'], []):
                                     if nat.get('State') == 'available':
                                         nat_node = NATGateway(f"NAT-{nat['NatGatewayId'][-8:]}")
                                         if igw_node:
@@ -353,70 +458,53 @@ class AWSArchitectureMapper:
         
         return f"{diagram_name}.png"
 
-    def generate_summary_report(self, data):
-        """인프라 요약 보고서 생성"""
+    def generate_summary_report(self, data, formats=None, output=None):
+        """인프라 요약 보고서 생성 (형식별 싱크로 스트리밍, 단일 형식이면 output 경로 또는 '-' = stdout) - 첫 번째 형식의 경로 반환"""
+        # NumPy(CIDR 분석)는 보고서를 만들 때만 로드
+        from cidr_analysis import analyze_address_space
+
+        formats = formats or self.report_formats
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"aws_infrastructure_report_{timestamp}.txt"
         
         complexity, spacing, direction = self.analyze_complexity(data)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("=" * 70 + "\n")
-            f.write("AWS INFRASTRUCTURE ANALYSIS REPORT\n")
-            f.write("=" * 70 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Region: ap-northeast-2 (Seoul)\n")
-            f.write(f"Layout Complexity: {complexity}\n")
-            f.write(f"Spacing Multiplier: {spacing:.1f}\n")
-            f.write(f"Diagram Direction: {direction}\n\n")
-            
-            # 전체 통계
-            f.write("📊 INFRASTRUCTURE OVERVIEW\n")
-            f.write("-" * 30 + "\n")
-            f.write(f"VPCs: {len(data['vpcs'])}\n")
-            f.write(f"Subnets: {len(data['subnets'])}\n")
-            f.write(f"EC2 Instances: {len(data['instances'])}\n")
-            f.write(f"RDS Instances: {len(data['rds_instances'])}\n")
-            f.write(f"Load Balancers: {len(data['load_balancers'])}\n")
-            f.write(f"Internet Gateways: {len(data['igws'])}\n")
-            f.write(f"NAT Gateways: {len(data['nats'])}\n\n")
-            
-            # VPC별 상세 정보
-            for i, vpc in enumerate(data['vpcs'], 1):
-                vpc_id = vpc['VpcId']
-                vpc_name = self.get_tag_value(vpc.get('Tags', []), 'Name') or f"VPC-{i}"
-                
-                f.write(f"🏢 VPC #{i}: {vpc_name}\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"VPC ID: {vpc_id}\n")
-                f.write(f"CIDR Block: {vpc['CidrBlock']}\n")
-                f.write(f"State: {vpc['State']}\n")
-                f.write(f"Default VPC: {'Yes' if vpc.get('IsDefault', False) else 'No'}\n\n")
-                
-                # 이 VPC의 서브넷들
-                vpc_subnets = [s for s in data['subnets'] if s['VpcId'] == vpc_id]
-                f.write(f"  📍 Subnets ({len(vpc_subnets)}):\n")
-                
-                for subnet in vpc_subnets:
-                    subnet_name = self.get_tag_value(subnet.get('Tags', []), 'Name') or subnet['SubnetId']
-                    subnet_type = self.analyze_subnet_type(subnet, data['route_tables'])
-                    
-                    # 서브넷의 리소스 수
-                    subnet_instances = [i for i in data['instances'] if i.get('SubnetId') == subnet['SubnetId']]
-                    subnet_rds = [r for r in data['rds_instances'] if subnet['SubnetId'] in r.get('SubnetIds', [])]
-                    subnet_elbs = [l for l in data['load_balancers'] if subnet['SubnetId'] in l.get('SubnetIds', [])]
-                    
-                    f.write(f"    - {subnet_name} ({subnet_type.upper()})\n")
-                    f.write(f"      CIDR: {subnet['CidrBlock']}\n")
-                    f.write(f"      AZ: {subnet['AvailabilityZone']}\n")
-                    f.write(f"      Available IPs: {subnet.get('AvailableIpAddressCount', 'N/A')}\n")
-                    f.write(f"      EC2 Instances: {len(subnet_instances)}\n")
-                    f.write(f"      RDS Instances: {len(subnet_rds)}\n")
-                    f.write(f"      Load Balancers: {len(subnet_elbs)}\n\n")
-                
-                f.write("\n")
-        
-        return filename
+        topology = self.get_topology(data)
+        address_space = analyze_address_space(data)
+        records = report_records(data, topology, (complexity, spacing, direction), address_space,
+                                 self.get_reachability(data), self.region)
+        
+        with ExitStack() as stack:
+            paths, sinks = [], []
+            for name in formats:
+                sink = SINKS[name]
+                path = output if output and len(formats) == 1 else \
+                    f"aws_infrastructure_report_{timestamp}.{sink.extension}"
+                if path == '-':
+                    stream = sys.stdout
+                else:
+                    stream = stack.enter_context(open(path, 'w', encoding='utf-8', newline=sink.newline))
+                paths.append(path)
+                sinks.append(sink(stream))
+            write_report(records, sinks)
+        
+        self.report_files = dict(zip(formats, paths))
+        return paths[0]
+
+    def print_overview(self, data):
+        """수집 현황 출력"""
+        partial = data.get('partial', {})
+        mark = lambda name: " (부분 수집)" if name in partial else ""
+        print(f"\n📊 인프라 현황:")
+        print(f"  - VPC: {len(data['vpcs'])}개{mark('vpcs')}")
+        print(f"  - 서브넷: {len(data['subnets'])}개{mark('subnets')}")
+        print(f"  - EC2 인스턴스: {len(data['instances'])}개{mark('instances')}")
+        print(f"  - RDS 인스턴스: {len(data['rds_instances'])}개{mark('rds_instances')}")
+        print(f"  - 로드밸런서: {len(data['load_balancers'])}개{mark('load_balancers')}")
+        if data.get('network_interfaces'):
+            print(f"  - ENI: {len(data['network_interfaces'])}개{mark('network_interfaces')}")
+        if partial:
+            print(f"  - ⚠️ 부분 수집: {', '.join(partial)} (스로틀/오류로 일부만 수집, 보고서 참조)")
+        if data.get('scan_errors'):
+            print(f"  - ⚠️ 스캔 오류: {len(data['scan_errors'])}건 (보고서 참조)")
 
     def run(self):
         """메인 실행"""
@@ -424,18 +512,18 @@ class AWSArchitectureMapper:
         print("=" * 55)
         
         # 데이터 수집
-        infrastructure_data = self.collect_infrastructure_data()
+        with self.stage('collect'):
+            infrastructure_data = self.load_scoped_data()
         
         # 통계 출력
-        print(f"\n📊 인프라 현황:")
-        print(f"  - VPC: {len(infrastructure_data['vpcs'])}개")
-        print(f"  - 서브넷: {len(infrastructure_data['subnets'])}개")
-        print(f"  - EC2 인스턴스: {len(infrastructure_data['instances'])}개")
-        print(f"  - RDS 인스턴스: {len(infrastructure_data['rds_instances'])}개")
-        print(f"  - 로드밸런서: {len(infrastructure_data['load_balancers'])}개")
-        
-        # 복잡도 분석
-        complexity, spacing, direction = self.analyze_complexity(infrastructure_data)
+        self.print_overview(infrastructure_data)
+        
+        # 복잡도 분석 + 토폴로지 인덱스/서브넷 분류
+        with self.stage('analyze'):
+            complexity, spacing, direction = self.analyze_complexity(infrastructure_data)
+            topology = self.get_topology(infrastructure_data)
+            for subnet_id in topology.subnets:
+                topology.subnet_type(subnet_id)
         print(f"\n🔍 복잡도 분석:")
         print(f"  - 복잡도 레벨: {complexity}")
         print(f"  - 간격 배수: {spacing:.1f}x")
@@ -444,20 +532,23 @@ class AWSArchitectureMapper:
         # PNG 다이어그램 생성
         print(f"\n🏗️ 아키텍처 다이어그램 생성 중...")
         try:
-            png_file = self.generate_architecture_diagram(infrastructure_data)
+            with self.stage('render'):
+                png_file = self.generate_architecture_diagram(infrastructure_data)
         except Exception as e:
             print(f"❌ PNG 생성 오류: {e}")
             png_file = None
         
         # 요약 보고서 생성
         print(f"\n📋 요약 보고서 생성 중...")
-        report_file = self.generate_summary_report(infrastructure_data)
+        with self.stage('report'):
+            report_file = self.generate_summary_report(infrastructure_data)
         
         # 결과 요약
         print(f"\n🎉 작업 완료!")
         if png_file:
             print(f"  📄 PNG 다이어그램: {png_file}")
-        print(f"  📋 텍스트 보고서: {report_file}")
+        for name, path in self.report_files.items():
+            print(f"  📋 {SINKS[name].label} 보고서: {path}")
         
         # 서브넷별 리소스 배치 요약
         print(f"\n📋 서브넷별 리소스 배치:")
@@ -465,19 +556,23 @@ class AWSArchitectureMapper:
             vpc_name = self.get_tag_value(vpc.get('Tags', []), 'Name') or vpc['VpcId']
             print(f"  🏢 {vpc_name}:")
             
-            vpc_subnets = [s for s in infrastructure_data['subnets'] if s['VpcId'] == vpc['VpcId']]
-            for subnet in vpc_subnets:
+            for subnet in topology.vpc_subnets.get(vpc['VpcId'], []):
                 subnet_name = self.get_tag_value(subnet.get('Tags', []), 'Name') or subnet['SubnetId']
-                subnet_instances = [i for i in infrastructure_data['instances'] if i.get('SubnetId') == subnet['SubnetId']]
-                subnet_rds = [r for r in infrastructure_data['rds_instances'] if subnet['SubnetId'] in r.get('SubnetIds', [])]
-                subnet_elbs = [l for l in infrastructure_data['load_balancers'] if subnet['SubnetId'] in l.get('SubnetIds', [])]
-                
-                resource_count = len(subnet_instances) + len(subnet_rds) + len(subnet_elbs)
-                subnet_type = self.analyze_subnet_type(subnet, infrastructure_data['route_tables'])
+                resource_count = topology.subnet_count(subnet['SubnetId'])
                 
                 if resource_count > 0:  # 리소스가 있는 서브넷만 표시
+                    subnet_type = topology.subnet_type(subnet['SubnetId'])
                     print(f"    📍 {subnet_name} ({subnet_type}): {resource_count}개 리소스")
+        
+        # 프로파일 요약
+        if self.profiler:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            trace_file = self.profiler.write_trace(self.profile_path or f"aws_profile_{timestamp}.json")
+            print(f"\n⏱️ 프로파일 요약 (trace: {trace_file}):")
+            for line in self.profiler.summary_lines():
+                print(line)
 
 if __name__ == "__main__":
-    mapper = AWSArchitectureMapper()
-    mapper.run()
\ No newline at end of file
+    from cli import main
+
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""합성 에스테이트 규모별 수집/분석/보고서/다이어그램 단계 벤치마크"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import boto3
+
+from aws_analyzer import AWSArchitectureMapper
+from cidr_analysis import analyze_address_space
+from collector import CollectionEngine
+from dot_render import DotEmitter
+from lod import LevelOfDetail
+from model import pack, unpack
+from routing import RouteIndex
+from synthetic_estate import SCALES, SyntheticResponder, generate_estate
+
+DEFAULT_OUTPUT = 'benchmark_results.json'
+REGRESSION_THRESHOLD = 1.25
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextlib.contextmanager
+def timed(stages, name):
+    started = time.perf_counter()
+    yield
+    stages[name] = time.perf_counter() - started
+
+
+def run_scale(name, params, latency=0.0):
+    """하나의 규모에 대한 단계별 소요 시간"""
+    estate = generate_estate(**params)
+    stages = {}
+
+    session = boto3.session.Session(aws_access_key_id='bench', aws_secret_access_key='bench')
+    engine = CollectionEngine(session=session)
+    responder = SyntheticResponder(estate, latency=latency)
+    for service in ('ec2', 'rds', 'elbv2'):
+        responder.attach(engine.client(service))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with timed(stages, 'collect'):
+            data = engine.collect()
+
+        # 팬아웃 워커 -> 부모 프로세스 전달 비용
+        with timed(stages, 'pickle_roundtrip'):
+            payload = pickle.dumps({name: pack(items) for name, items in data.items()},
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+            {name: unpack(*packed) for name, packed in pickle.loads(payload).items()}
+
+        data['scope'] = {'accounts': [], 'regions': [engine.region]}
+
+        with timed(stages, 'analyze_subnet_type'):
+            route_index = RouteIndex(data['route_tables'])
+            for subnet in data['subnets']:
+                route_index.classify(subnet)
+
+        with timed(stages, 'address_space'):
+            analyze_address_space(data)
+
+        mapper = AWSArchitectureMapper()
+        with timed(stages, 'topology_index'):
+            topology = mapper.get_topology(data)
+            for subnet_id in topology.subnets:
+                topology.subnet_type(subnet_id)
+
+        # 보고서/다이어그램은 매퍼에 캐시된 도달성 인덱스를 재사용
+        with timed(stages, 'reachability'):
+            mapper.get_reachability(data).edges()
+
+        with tempfile.TemporaryDirectory() as workdir:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                with timed(stages, 'report'):
+                    mapper.generate_summary_report(data)
+            finally:
+                os.chdir(cwd)
+
+        with timed(stages, 'diagram_emit'):
+            DotEmitter().emit(data, topology)
+
+        with timed(stages, 'diagram_emit_lod'):
+            DotEmitter(lod=LevelOfDetail()).emit(data, topology)
+
+    resources = len(data['instances']) + len(data['rds_instances']) + len(data['load_balancers'])
+    return {
+        'scale': name,
+        'resources': resources,
+        'subnets': len(data['subnets']),
+        'api_calls': responder.calls,
+        'pickle_bytes': len(payload),
+        'stages': stages,
+    }
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """이전 결과 파일과 비교하여 느려진 단계 목록"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['scale']: r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['scale'])
+        if not previous:
+            continue
+        for stage, seconds in result['stages'].items():
+            before = previous['stages'].get(stage)
+            if before and seconds > before * threshold and seconds - before > 0.01:
+                regressions.append((result['scale'], stage, before, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AWS Architecture Mapper 벤치마크")
+    parser.add_argument('--scales', default=','.join(SCALES), help=f"실행할 규모 (쉼표 구분: {', '.join(SCALES)})")
+    parser.add_argument('--latency', type=float, default=0.0, help="API 호출당 모의 지연 (초)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="결과 JSON 파일")
+    parser.add_argument('--compare', metavar='BASELINE', help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    print("⏱️ AWS Architecture Mapper 벤치마크")
+    print("=" * 55)
+
+    results = []
+    for name in args.scales.split(','):
+        result = run_scale(name, SCALES[name], args.latency)
+        results.append(result)
+        print(f"\n📦 {name}: 리소스 {result['resources']}개, 서브넷 {result['subnets']}개, API 호출 {result['api_calls']}회, "
+              f"전달 크기 {result['pickle_bytes'] / 1e6:.1f} MB")
+        for stage, seconds in result['stages'].items():
+            print(f"  - {stage:<22} {seconds * 1000:10.1f} ms")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'latency': args.latency,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'results': results,
+        }, f, indent=2)
+    print(f"\n📋 결과 저장: {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        if regressions:
+            print(f"\n⚠️ 성능 저하 ({REGRESSION_THRESHOLD:.2f}x 초과):")
+            for scale, stage, before, after in regressions:
+                print(f"  - {scale}/{stage}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+            raise SystemExit(1)
+        print("\n✅ 이전 결과 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
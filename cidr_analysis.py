@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""VPC/서브넷 CIDR을 정렬된 정수 구간 배열로 적재하여 중복 대역과 주소 사용률/단편화 분석 (NumPy)
+
+CIDR 블록끼리는 서로 겹치지 않거나 한쪽이 다른 쪽을 포함하므로, 겹침 판정은
+접두사 길이별로 상위 비트를 잘라 searchsorted로 포함 관계를 찾는 것으로 충분하다.
+IPv6는 VPC(/56)와 서브넷(/64) 할당 단위에 맞춰 상위 64비트만 사용한다.
+"""
+import ipaddress
+import socket
+
+from model import vpc_key
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# AWS가 서브넷마다 예약하는 주소 수
+RESERVED_PER_SUBNET = 5
+
+# IP 버전 -> 분석에 쓰는 비트 수
+VERSION_BITS = {4: 32, 6: 64}
+
+
+def parse_cidr(cidr):
+    """CIDR -> (IP 버전, 시작 값, 접두사 길이) - IPv6는 상위 64비트 기준"""
+    address, _, length = cidr.partition('/')
+    if ':' not in address:
+        value = int.from_bytes(socket.inet_aton(address), 'big')
+        length = int(length or 32)
+        return 4, value >> (32 - length) << (32 - length), length
+
+    network = ipaddress.IPv6Network(cidr, strict=False)
+    return 6, int(network.network_address) >> 64, min(network.prefixlen, 64)
+
+
+def format_cidr(version, start, length):
+    if version == 4:
+        return f"{ipaddress.IPv4Address(start)}/{length}"
+    return f"{ipaddress.IPv6Address(start << 64)}/{length}"
+
+
+def interval_arrays(rows, bits):
+    """(시작, 접두사 길이, 소유 VPC 번호) 행 -> 시작 순으로 정렬된 (시작, 끝, 길이, 소유) 배열"""
+    start = np.fromiter((row[0] for row in rows), dtype=np.uint64, count=len(rows))
+    length = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    owner = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+
+    order = np.lexsort((length, start))
+    start, length, owner = start[order], length[order], owner[order]
+    end = start + (np.uint64(1) << (bits - length).astype(np.uint64))
+    return start, end, length, owner
+
+
+def containment_pairs(start, length, bits):
+    """서로 다른 CIDR 간 포함 관계 (바깥 인덱스, 안쪽 인덱스) - start는 정렬되고 중복이 없어야 함"""
+    outer, inner = [], []
+    for prefix in np.unique(length):
+        candidates = np.flatnonzero(length == prefix)
+        shift = np.uint64(bits - prefix)
+        keys = start[candidates] >> shift
+
+        # 더 긴 접두사의 상위 prefix 비트가 후보 CIDR과 같으면 포함됨
+        covered = np.flatnonzero(length > prefix)
+        position = np.searchsorted(keys, start[covered] >> shift)
+        position = np.minimum(position, len(keys) - 1)
+        hit = keys[position] == start[covered] >> shift
+
+        outer.append(candidates[position[hit]])
+        inner.append(covered[hit])
+
+    if not outer:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(outer), np.concatenate(inner)
+
+
+def largest_aligned_block(gap_start, gap_end, bits):
+    """각 빈 구간 안에 들어가는 가장 큰 정렬된 CIDR 블록의 접두사 길이 (없으면 bits + 1)"""
+    best = np.full(len(gap_start), bits + 1, dtype=np.int64)
+    for prefix in range(bits, -1, -1):
+        block = np.uint64(1) << np.uint64(bits - prefix)
+        aligned = (gap_start + block - np.uint64(1)) // block * block
+        best = np.where(aligned + block <= gap_end, prefix, best)
+    return best
+
+
+def free_intervals(vpc_blocks, subnet_blocks):
+    """VPC 블록 안에서 서브넷에 할당되지 않은 구간 -> (소유 VPC, 시작, 끝) 배열
+
+    빈 구간은 (VPC 블록 시작 또는 서브넷 끝)에서 (다음 서브넷 시작 또는 VPC 블록 끝)까지이므로,
+    두 경계 집합을 각각 (소유 VPC, 위치) 순으로 정렬하면 같은 위치끼리 짝이 맞는다.
+    """
+    vpc_start, vpc_end, _, vpc_owner = vpc_blocks
+    sub_start, sub_end, _, sub_owner = subnet_blocks
+
+    opens = np.concatenate([vpc_start, sub_end])
+    closes = np.concatenate([vpc_end, sub_start])
+    owners = np.concatenate([vpc_owner, sub_owner])
+
+    open_order = np.lexsort((opens, owners))
+    close_order = np.lexsort((closes, owners))
+    starts, ends, owners = opens[open_order], closes[close_order], owners[open_order]
+
+    keep = ends > starts
+    return owners[keep], starts[keep], ends[keep]
+
+
+def find_overlaps(rows, version, keys):
+    """VPC 블록 간 중복 (같은 CIDR 공유 + 포함 관계)"""
+    bits = VERSION_BITS[version]
+    start, _, length, owner = interval_arrays(rows, bits)
+
+    # 같은 CIDR은 하나로 묶고 소유 VPC 목록만 유지 (기본 VPC 172.31.0.0/16 등 대량 중복 대비)
+    first = np.flatnonzero(np.concatenate([[True], (start[1:] != start[:-1]) | (length[1:] != length[:-1])]))
+    groups = [sorted({keys[o] for o in group}) for group in np.split(owner, first[1:])]
+    start, length = start[first], length[first]
+
+    overlaps = []
+    for u, vpcs in enumerate(groups):
+        if len(vpcs) > 1:
+            overlaps.append({'cidr': format_cidr(version, int(start[u]), int(length[u])), 'vpcs': vpcs})
+
+    outer, inner = containment_pairs(start, length, bits)
+    for o, i in sorted(zip(outer.tolist(), inner.tolist())):
+        if groups[o] == groups[i] and len(groups[o]) == 1:
+            continue
+        overlaps.append({
+            'cidr': format_cidr(version, int(start[o]), int(length[o])), 'vpcs': groups[o],
+            'contains': format_cidr(version, int(start[i]), int(length[i])), 'other_vpcs': groups[i],
+        })
+    return overlaps
+
+
+def analyze_address_space(data):
+    """전체 에스테이트의 CIDR 중복 대역과 VPC별 IPv4 사용률/단편화"""
+    if np is None:
+        print("❌ numpy가 설치되지 않아 CIDR 분석을 건너뜁니다.")
+        print("   설치 명령: pip install numpy")
+        return None
+
+    keys = [vpc_key(vpc) for vpc in data['vpcs']]
+    index = {key: i for i, key in enumerate(keys)}
+
+    vpc_rows = {4: [], 6: []}
+    for i, vpc in enumerate(data['vpcs']):
+        for cidr in list(vpc.get('CidrBlocks') or [vpc['CidrBlock']]) + list(vpc.get('Ipv6CidrBlocks') or []):
+            version, start, length = parse_cidr(cidr)
+            vpc_rows[version].append((start, length, i))
+
+    subnet_rows = {4: [], 6: []}
+    reserved = np.zeros(len(keys), dtype=np.int64)
+    available = np.zeros(len(keys), dtype=np.int64)
+    for subnet in data['subnets']:
+        owner = index.get(vpc_key(subnet))
+        if owner is None:
+            continue
+        cidrs = list(subnet.get('Ipv6CidrBlocks') or [])
+        if subnet.get('CidrBlock'):
+            cidrs.append(subnet['CidrBlock'])
+            reserved[owner] += RESERVED_PER_SUBNET
+            available[owner] += subnet.get('AvailableIpAddressCount') or 0
+        for cidr in cidrs:
+            version, start, length = parse_cidr(cidr)
+            subnet_rows[version].append((start, length, owner))
+
+    # VPC 간 중복 대역 (IPv4 + IPv6)
+    overlaps = []
+    for version in (4, 6):
+        if vpc_rows[version]:
+            overlaps.extend(find_overlaps(vpc_rows[version], version, keys))
+
+    # VPC별 IPv4 할당률/사용률과 빈 공간 단편화
+    vpcs = {}
+    bits = VERSION_BITS[4]
+    if vpc_rows[4]:
+        vpc_blocks = interval_arrays(vpc_rows[4], bits)
+        subnet_blocks = interval_arrays(subnet_rows[4], bits)
+        total = np.bincount(vpc_blocks[3], weights=(vpc_blocks[1] - vpc_blocks[0]).astype(np.float64),
+                            minlength=len(keys))
+        allocated = np.bincount(subnet_blocks[3], weights=(subnet_blocks[1] - subnet_blocks[0]).astype(np.float64),
+                                minlength=len(keys))
+
+        owners, starts, ends = free_intervals(vpc_blocks, subnet_blocks)
+        free = np.bincount(owners, weights=(ends - starts).astype(np.float64), minlength=len(keys))
+        free_count = np.bincount(owners, minlength=len(keys))
+        largest = np.full(len(keys), bits + 1, dtype=np.int64)
+        np.minimum.at(largest, owners, largest_aligned_block(starts, ends, bits))
+
+        for i, key in enumerate(keys):
+            if not total[i]:
+                continue
+            largest_size = 0 if largest[i] > bits else 1 << (bits - int(largest[i]))
+            vpcs[key] = {
+                'total': int(total[i]),
+                'allocated': int(allocated[i]),
+                'used': int(max(allocated[i] - reserved[i] - available[i], 0)),
+                'free': int(free[i]),
+                'free_blocks': int(free_count[i]),
+                'largest_free_prefix': None if largest[i] > bits else int(largest[i]),
+                # 빈 공간 중 가장 큰 정렬 블록 하나로 쓸 수 없는 비율 (0 = 한 덩어리)
+                'fragmentation': round(1 - largest_size / float(free[i]), 3) if free[i] else 0.0,
+            }
+
+    return {'overlaps': overlaps, 'vpcs': vpcs}
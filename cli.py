@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""AWS Architecture Mapper CLI (run / collect / report / render / diff / query / daemon / history 서브커맨드)
+
+매퍼와 무거운 의존성(boto3, NumPy, diagrams/Graphviz)은 서브커맨드 처리 함수 안에서만 import하므로,
+스냅샷 기반 report/query는 수집/렌더링 스택을 로드하지 않고 바로 시작한다.
+서브커맨드 없이 옵션만 주면 기존처럼 run (수집 + 다이어그램 + 보고서)으로 동작한다.
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+
+from dot_render import SPLINE_MODES
+from history_store import DEFAULT_HISTORY_PATH
+from lod import GROUP_BY_CHOICES
+from report_writers import SINKS
+from snapshot import DEFAULT_SNAPSHOT_DIR
+
+DEFAULT_REGION = 'ap-northeast-2'
+COMMANDS = ('run', 'collect', 'report', 'render', 'diff', 'query', 'daemon', 'history')
+
+
+def _split(value):
+    return value.split(',') if value else None
+
+
+def _collect_options():
+    """수집 대상/캐시 옵션"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("수집")
+    group.add_argument('--region', default=DEFAULT_REGION, help="단일 리전 스캔 대상")
+    group.add_argument('--scan-regions', metavar='REGIONS',
+                       help="팬아웃 스캔 리전 목록 (쉼표 구분, 'all' = 활성화된 전체 리전)")
+    group.add_argument('--accounts', help="팬아웃 계정 목록 (역할 ARN 또는 프로파일 이름, 쉼표 구분)")
+    group.add_argument('--processes', type=int, help="팬아웃 워커 프로세스 수 (기본: CPU 코어 수)")
+    group.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR, help="스냅샷 저장/캐시 디렉터리")
+    group.add_argument('--no-cache', action='store_true', help="TTL 캐시를 무시하고 전체 재수집")
+    group.add_argument('--incremental', action='store_true',
+                       help="최근 스냅샷 기준으로 변경된 리소스 타입만 재수집하고 diff 저장")
+    group.add_argument('--profile', nargs='?', const='', metavar='TRACE_PATH',
+                       help="API 호출/단계별 계측 후 Chrome trace JSON 저장 및 요약 표 출력")
+    group.add_argument('--history', nargs='?', const=DEFAULT_HISTORY_PATH, metavar='DB_PATH',
+                       help=f"수집할 때마다 변경분을 SQLite 이력 저장소에 기록 (기본: {DEFAULT_HISTORY_PATH})")
+    return parser
+
+
+def _source_options():
+    """스냅샷 재생 옵션"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("데이터 소스")
+    group.add_argument('--from-snapshot', metavar='PATH', help="지정한 스냅샷 파일로 분석/렌더링 (API 호출 없음)")
+    group.add_argument('--offline', action='store_true', help="가장 최근 스냅샷으로 분석/렌더링 (API 호출 없음)")
+    return parser
+
+
+def _scope_options():
+    """범위 필터 옵션 (수집 대상은 바꾸지 않음 - 팬아웃 스캔 리전은 --scan-regions)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("범위 필터")
+    group.add_argument('--vpc', action='append', metavar='VPC_ID', help="대상 VPC ID (반복 또는 쉼표 구분)")
+    group.add_argument('--tag', action='append', metavar='KEY[=VALUE]', help="VPC 태그 조건 (반복 가능)")
+    group.add_argument('--regions', help="리전 범위 필터 (쉼표 구분)")
+    return parser
+
+
+def _render_options():
+    """다이어그램 렌더링 옵션"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("다이어그램")
+    group.add_argument('--backend', choices=['dot', 'diagrams'], default='dot',
+                       help="다이어그램 렌더링 백엔드 (dot: diagrams 없이 DOT 직접 생성)")
+    group.add_argument('--splines', choices=SPLINE_MODES, default='ortho', help="Graphviz 간선 모드")
+    group.add_argument('--format', dest='output_format', choices=['png', 'svg'], default='png',
+                       help="다이어그램 출력 형식 (dot 백엔드)")
+    group.add_argument('--per-vpc', action='store_true',
+                       help="VPC별 뷰 + 개요 다이어그램을 병렬 렌더링 (변경 없는 뷰는 캐시 사용)")
+    group.add_argument('--lod-threshold', type=int,
+                       help="서브넷 리소스가 이 수를 넘으면 그룹 노드로 축약 (상세 수준 모드)")
+    group.add_argument('--lod-group-by', choices=GROUP_BY_CHOICES, default='asg',
+                       help="축약 그룹 기준 (asg / type / tag)")
+    group.add_argument('--lod-tag', default='Name', help="--lod-group-by tag 사용 시 태그 키")
+    group.add_argument('--max-nodes', type=int, default=400, help="상세 수준 모드의 최대 노드 수")
+    group.add_argument('--no-reachability', action='store_true',
+                       help="SG/NACL 기반 도달성 간선(ELB->EC2, EC2->RDS, NAT 경유 인터넷)을 그리지 않음")
+    return parser
+
+
+def _report_options():
+    """요약 보고서 옵션"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_argument_group("보고서")
+    group.add_argument('--report-format', default='text', help=f"요약 보고서 형식 (쉼표 구분: {', '.join(SINKS)})")
+    return parser
+
+
+def build_parser():
+    """서브커맨드 파서 구성"""
+    collect, source, scope = _collect_options(), _source_options(), _scope_options()
+    render, report = _render_options(), _report_options()
+
+    parser = argparse.ArgumentParser(prog='aws_analyzer', description="AWS Architecture Mapper")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    commands.add_parser('run', parents=[collect, source, scope, render, report],
+                        help="수집 + 다이어그램 + 보고서 (기본 동작)")
+    commands.add_parser('collect', parents=[collect], help="수집 후 스냅샷 저장")
+
+    parser_report = commands.add_parser('report', parents=[collect, source, scope, report], help="요약 보고서 생성")
+    parser_report.add_argument('-o', '--output', help="출력 경로 (단일 형식, '-' = stdout)")
+
+    commands.add_parser('render', parents=[collect, source, scope, render], help="아키텍처 다이어그램 렌더링")
+
+    parser_diff = commands.add_parser('diff', parents=[scope], help="두 스냅샷 간 변경 사항 (기본: 가장 최근 두 스냅샷)")
+    parser_diff.add_argument('old', nargs='?', help="기준 스냅샷 경로")
+    parser_diff.add_argument('new', nargs='?', help="비교 스냅샷 경로")
+    parser_diff.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR, help="스냅샷 디렉터리")
+    parser_diff.add_argument('-o', '--output', help="전체 diff JSON 저장 경로 ('-' = stdout)")
+
+    parser_query = commands.add_parser('query', parents=[collect, source, scope],
+                                       help="VPC/서브넷 요약, 리소스 위치 또는 도달성 조회 (대상 없으면 전체 VPC 요약)")
+    parser_query.add_argument('target', nargs='?',
+                              help="VPC ID, 서브넷 ID, 리소스 ID/이름/ARN 또는 'reach' (--from/--to/--port 도달성 판정)")
+    parser_query.add_argument('--from', dest='reach_from', metavar='RESOURCE_ID',
+                              help="reach: 출발 리소스 (인스턴스 ID, DB 식별자, ELB 이름/ARN)")
+    parser_query.add_argument('--to', dest='reach_to', metavar='RESOURCE_ID',
+                              help="reach: 도착 리소스 ('internet' = 인터넷)")
+    parser_query.add_argument('--port', dest='reach_port', type=int, metavar='PORT', help="reach: 도착 포트")
+    parser_query.add_argument('--protocol', dest='reach_protocol', default='tcp', choices=['tcp', 'udp'],
+                              help="reach: 프로토콜")
+    parser_query.add_argument('--json', action='store_true', help="JSON으로 출력")
+
+    parser_daemon = commands.add_parser('daemon', parents=[collect, source, scope, render],
+                                        help="에스테이트를 메모리에 유지하고 로컬 HTTP API로 조회 응답")
+    parser_daemon.add_argument('--host', default='127.0.0.1', help="바인드 주소")
+    parser_daemon.add_argument('--port', type=int, default=8787, help="포트")
+    parser_daemon.add_argument('--interval', type=float, default=300,
+                               help="주기적 갱신 간격 (초, 0 = 주기 갱신 없음)")
+    parser_daemon.add_argument('--events', metavar='PATH',
+                               help="변경 이벤트 파일 (EventBridge 대용 JSON Lines, 추가된 줄의 타입만 재수집)")
+
+    history_db = argparse.ArgumentParser(add_help=False)
+    history_db.add_argument('--db', default=DEFAULT_HISTORY_PATH, help="이력 저장소 경로")
+    parser_history = commands.add_parser('history', help="SQLite 이력 저장소 적재/조회")
+    actions = parser_history.add_subparsers(dest='action', metavar='ACTION', required=True)
+
+    parser_ingest = actions.add_parser('ingest', parents=[history_db], help="스냅샷 파일을 시간순으로 이력에 적재")
+    parser_ingest.add_argument('paths', nargs='*', help="스냅샷 경로 (기본: --snapshot-dir의 전체 스냅샷)")
+    parser_ingest.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR, help="스냅샷 디렉터리")
+
+    parser_snapshots = actions.add_parser('snapshots', parents=[history_db], help="기록된 스냅샷과 저장소 행 수")
+    parser_snapshots.add_argument('--days', type=float, help="최근 N일만")
+
+    parser_subnet = actions.add_parser('subnet', parents=[history_db], help="서브넷 타입 변경 이력")
+    parser_subnet.add_argument('subnet_id', help="서브넷 ID")
+    parser_subnet.add_argument('--json', action='store_true', help="JSON으로 출력")
+
+    parser_counts = actions.add_parser('counts', parents=[history_db], help="서브넷별 리소스 수 추이")
+    parser_counts.add_argument('--subnet', metavar='SUBNET_ID', help="대상 서브넷 (기본: 전체)")
+    parser_counts.add_argument('--kind', default='instances',
+                               choices=['instances', 'rds_instances', 'load_balancers', 'nats', 'network_interfaces'],
+                               help="리소스 종류")
+    parser_counts.add_argument('--days', type=float, default=90, help="최근 N일")
+    parser_counts.add_argument('--json', action='store_true', help="JSON으로 출력")
+    return parser
+
+
+def scope_filters(args):
+    """--vpc / --tag / --regions -> filter_estate 인자 (조건이 없으면 None)"""
+    from queries import parse_tags
+
+    vpc_ids = [vpc_id for value in args.vpc or [] for vpc_id in value.split(',')]
+    tags = parse_tags(args.tag)
+    regions = _split(args.regions)
+    if not (vpc_ids or tags or regions):
+        return None
+    return {'vpc_ids': vpc_ids, 'tags': tags, 'regions': regions}
+
+
+def make_mapper(args, **options):
+    """공통 옵션으로 매퍼 생성"""
+    from aws_analyzer import AWSArchitectureMapper
+    from lod import LevelOfDetail
+    from profiling import Profiler
+
+    lod = None
+    if getattr(args, 'lod_threshold', None) is not None:
+        lod = LevelOfDetail(args.lod_threshold, args.lod_group_by, args.lod_tag, max_nodes=args.max_nodes)
+    return AWSArchitectureMapper(
+        region=args.region,
+        regions=_split(args.scan_regions),
+        accounts=_split(args.accounts),
+        processes=args.processes,
+        snapshot_dir=args.snapshot_dir,
+        from_snapshot=getattr(args, 'from_snapshot', None),
+        offline=getattr(args, 'offline', False),
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+        backend=getattr(args, 'backend', 'dot'),
+        splines=getattr(args, 'splines', 'ortho'),
+        output_format=getattr(args, 'output_format', 'png'),
+        lod=lod,
+        per_vpc=getattr(args, 'per_vpc', False),
+        profiler=Profiler() if args.profile is not None else None,
+        profile_path=args.profile or None,
+        reachability=not getattr(args, 'no_reachability', False),
+        filters=scope_filters(args) if hasattr(args, 'vpc') else None,
+        history=args.history,
+        **options,
+    )
+
+
+def report_formats(parser, args):
+    """--report-format 검증"""
+    formats = args.report_format.split(',')
+    for name in formats:
+        if name not in SINKS:
+            parser.error(f"알 수 없는 보고서 형식: {name} (선택: {', '.join(SINKS)})")
+    return formats
+
+
+def write_profile(mapper):
+    """프로파일 trace 저장 및 요약 출력"""
+    if mapper.profiler:
+        from datetime import datetime
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        trace_file = mapper.profiler.write_trace(mapper.profile_path or f"aws_profile_{timestamp}.json")
+        print(f"\n⏱️ 프로파일 요약 (trace: {trace_file}):")
+        for line in mapper.profiler.summary_lines():
+            print(line)
+
+
+def cmd_run(parser, args):
+    if args.backend != 'dot' and args.lod_threshold is not None and not args.per_vpc:
+        parser.error("--lod-threshold는 --backend dot 또는 --per-vpc에서만 사용할 수 있습니다")
+    make_mapper(args, report_formats=report_formats(parser, args)).run()
+
+
+def cmd_collect(parser, args):
+    mapper = make_mapper(args)
+    with mapper.stage('collect'):
+        data = mapper.load_infrastructure_data()
+    mapper.print_overview(data)
+    write_profile(mapper)
+
+
+def cmd_report(parser, args):
+    formats = report_formats(parser, args)
+    if args.output and len(formats) > 1:
+        parser.error("--output은 단일 보고서 형식에서만 사용할 수 있습니다")
+
+    mapper = make_mapper(args, report_formats=formats)
+    # stdout으로 보고서를 내보낼 때 진행 메시지는 stderr로
+    with redirect_stdout(sys.stderr if args.output == '-' else sys.stdout):
+        data = mapper.load_scoped_data()
+    with mapper.stage('report'):
+        mapper.generate_summary_report(data, output=args.output)
+
+    if args.output != '-':
+        for name, path in mapper.report_files.items():
+            print(f"📋 {SINKS[name].label} 보고서: {path}")
+    with redirect_stdout(sys.stderr):
+        write_profile(mapper)
+
+
+def cmd_render(parser, args):
+    mapper = make_mapper(args)
+    data = mapper.load_scoped_data()
+    with mapper.stage('render'):
+        path = mapper.generate_architecture_diagram(data)
+    if path:
+        print(f"📄 다이어그램: {path}")
+    write_profile(mapper)
+
+
+def cmd_diff(parser, args):
+    import glob
+
+    from incremental import diff_estates, diff_summary, save_diff
+    from queries import filter_estate
+    from snapshot import load_snapshot
+
+    old, new = args.old, args.new
+    if not new:
+        paths = sorted(glob.glob(os.path.join(args.snapshot_dir, 'aws_snapshot_*.json.gz')))
+        if old:
+            new = paths[-1] if paths else None
+        elif len(paths) >= 2:
+            old, new = paths[-2:]
+    if not (old and new):
+        parser.error(f"비교할 스냅샷이 부족합니다 ({args.snapshot_dir})")
+
+    filters = scope_filters(args) or {}
+    old_data = filter_estate(load_snapshot(old)[0], **filters)
+    new_data = filter_estate(load_snapshot(new)[0], **filters)
+    diff = diff_estates(old_data, new_data)
+
+    if args.output == '-':
+        json.dump({'base_snapshot': old, 'snapshot': new, 'changes': diff}, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+
+    print(f"🔄 {old} -> {new}")
+    changes = [(name, counts) for name, counts in diff_summary(diff).items() if any(counts)]
+    for name, (added, removed, changed) in changes:
+        print(f"  - {name}: +{added} / -{removed} / ~{changed}")
+    if not changes:
+        print("  - 변경 없음")
+    if args.output:
+        print(f"  - 변경 내역 저장: {save_diff(diff, args.output, old)}")
+
+
+def _print_query(kind, result):
+    if kind == 'vpcs':
+        for vpc in result:
+            _print_query('vpc', vpc)
+    elif kind == 'vpc':
+        types = ', '.join(f"{name} {count}" for name, count in sorted(result['subnet_types'].items()))
+        resources = ', '.join(f"{name} {count}" for name, count in result['resources'].items())
+        print(f"🏢 {result['vpc_id']} ({result['name']}) {result['cidr']}")
+        print(f"    서브넷 {result['subnets']}개 ({types or '-'}), IGW {result['internet_gateways']}개")
+        print(f"    리소스: {resources}")
+    elif kind == 'subnet':
+        print(f"📍 {result['subnet_id']} ({result['name']}) {result['subnet_type'].upper()}")
+        print(f"    VPC: {result['vpc_id']}, CIDR: {result['cidr']}, AZ: {result['az']}, "
+              f"Available IPs: {result['available_ips'] if result['available_ips'] is not None else 'N/A'}")
+        for name, ids in result['resources'].items():
+            if ids:
+                print(f"    {name} ({len(ids)}): {', '.join(ids)}")
+    elif kind == 'reach':
+        target = f"{result['target']}:{result['port']}/{result['protocol']}"
+        if result['reachable']:
+            print(f"✅ {result['source']} -> {target} 도달 가능 (경로: {result['via']})")
+            return
+        blocked = result['blocked_by']
+        print(f"❌ {result['source']} -> {target} 도달 불가")
+        if blocked['layer'] == 'nacl':
+            print(f"    차단: NACL {blocked['id']} ({blocked['subnet_id']}) {blocked['direction']} "
+                  f"규칙 {blocked['rule']}, 포트 {blocked['port']}")
+        elif blocked['layer'] == 'security_group':
+            print(f"    차단: 보안 그룹 {', '.join(blocked['groups']) or '-'} {blocked['direction']} - {blocked['reason']}")
+        else:
+            print(f"    차단: {blocked['layer']} - {blocked['reason']}")
+    else:
+        for location in result:
+            print(f"📍 {location['kind']}: {location['subnet_id']} ({location['subnet_type']}) in {location['vpc_id']}")
+
+
+def cmd_query(parser, args):
+    reach_target = args.target == 'reach'
+    if reach_target and not (args.reach_from and args.reach_to and args.reach_port is not None):
+        parser.error("query reach에는 --from, --to, --port가 필요합니다")
+
+    mapper = make_mapper(args)
+    with redirect_stdout(sys.stderr):
+        data = mapper.load_scoped_data()
+
+    from queries import query, reach
+
+    if reach_target:
+        reachability = mapper.get_reachability(data)
+        if not reachability.available:
+            print("❌ 보안 그룹을 수집하지 않은 스냅샷이라 도달성을 판정할 수 없습니다", file=sys.stderr)
+            sys.exit(1)
+        kind = 'reach'
+        result = reach(reachability, args.reach_from, args.reach_to, args.reach_port, args.reach_protocol)
+        args.target = f"{args.reach_from} -> {args.reach_to}"
+    else:
+        kind, result = query(mapper.get_topology(data), args.target)
+    if not result:
+        print(f"❌ 찾을 수 없습니다: {args.target or '범위에 해당하는 VPC'}", file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2, ensure_ascii=False, default=str)
+        print()
+    else:
+        _print_query(kind, result)
+
+
+def cmd_daemon(parser, args):
+    import asyncio
+
+    from daemon import EstateDaemon
+
+    daemon = EstateDaemon(make_mapper(args), host=args.host, port=args.port,
+                          interval=args.interval or None, events_path=args.events)
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        print("\n🛑 데몬 종료")
+
+
+def _ingest_snapshots(parser, store, args):
+    import glob
+
+    from aws_analyzer import AWSArchitectureMapper
+    from history_store import HistoryError
+    from snapshot import SnapshotError, load_snapshot
+
+    paths = args.paths or sorted(glob.glob(os.path.join(args.snapshot_dir, 'aws_snapshot_*.json.gz')))
+    if not paths:
+        parser.error(f"적재할 스냅샷이 없습니다 ({args.snapshot_dir})")
+
+    # 서브넷 타입 분류는 매퍼의 라우팅 인덱스를 그대로 사용 (AWS 호출 없음)
+    mapper = AWSArchitectureMapper()
+    latest = store.latest()
+    snapshots = []
+    for path in paths:
+        try:
+            data, fetched_at = load_snapshot(path)
+        except SnapshotError as e:
+            print(f"❌ {e}")
+            continue
+        snapshots.append((max(fetched_at.values()) if fetched_at else None, path, data, fetched_at))
+
+    for taken_at, path, data, fetched_at in sorted(snapshots, key=lambda s: (s[0] is None, s[0], s[1])):
+        if latest and taken_at is not None and taken_at <= latest[1]:
+            print(f"⏭️ 이미 기록된 시점 이전 스냅샷 건너뜀: {path}")
+            continue
+        try:
+            snapshot_id, added = store.record(data, mapper.get_topology(data), fetched_at)
+        except HistoryError as e:
+            print(f"❌ {e}")
+            continue
+        latest = store.latest()
+        print(f"🗄️ {path} -> 스냅샷 #{snapshot_id}, 변경 행 {added}개")
+
+
+def cmd_history(parser, args):
+    from history_store import HistoryError, HistoryStore, days_ago
+
+    try:
+        store = HistoryStore(args.db)
+    except HistoryError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with store:
+        if args.action == 'ingest':
+            _ingest_snapshots(parser, store, args)
+        elif args.action == 'snapshots':
+            for snapshot_id, taken_at in store.snapshots(days_ago(args.days) if args.days else None):
+                print(f"#{snapshot_id} {taken_at.isoformat()}")
+            print(', '.join(f"{table} {count}" for table, count in store.stats().items()))
+        elif args.action == 'subnet':
+            changes = store.subnet_type_changes(args.subnet_id)
+            if not changes:
+                print(f"❌ 이력에 없는 서브넷입니다: {args.subnet_id}", file=sys.stderr)
+                sys.exit(1)
+            if args.json:
+                json.dump(changes, sys.stdout, indent=2, ensure_ascii=False, default=str)
+                print()
+                return
+            for change in changes:
+                print(f"#{change['snapshot_id']} {change['taken_at']:%Y-%m-%d %H:%M} "
+                      f"{(change['subnet_type'] or 'deleted').upper()}")
+            became = store.became(args.subnet_id)
+            if became:
+                print(f"🌐 마지막으로 public이 된 시점: {became:%Y-%m-%d %H:%M:%S %Z}")
+        else:
+            counts = store.resource_counts(args.kind, args.subnet, since=days_ago(args.days))
+            if args.json:
+                json.dump({subnet: [[taken_at.isoformat(), count] for taken_at, count in points]
+                           for subnet, points in counts.items()}, sys.stdout, indent=2)
+                print()
+                return
+            for subnet, points in sorted(counts.items()):
+                print(f"📍 {subnet}: " + ' -> '.join(f"{count} ({taken_at:%Y-%m-%d %H:%M})"
+                                                     for taken_at, count in points))
+            if not counts:
+                print(f"  - 최근 {args.days:g}일 동안 {args.kind} 기록 없음")
+
+
+HANDLERS = {
+    'run': cmd_run,
+    'collect': cmd_collect,
+    'report': cmd_report,
+    'render': cmd_render,
+    'diff': cmd_diff,
+    'query': cmd_query,
+    'daemon': cmd_daemon,
+    'history': cmd_history,
+}
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # 서브커맨드 없이 옵션만 준 경우 기존 동작(run) 유지
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'run')
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        HANDLERS[args.command](parser, args)
+    except BrokenPipeError:
+        # 파이프 소비자가 먼저 종료된 경우 (예: report -o - | head) 남은 출력은 버림
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
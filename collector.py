@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""AWS describe 호출을 병렬 + 페이지네이션으로 수행하는 수집 엔진"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model import (Attachment, DBInstance, Instance, InternetGateway, LoadBalancer, NatGateway, NetworkAcl,
+                   NetworkAclEntry, Route, RouteTable, RouteTableAssociation, SecurityGroup, SecurityGroupRule,
+                   Subnet, TargetGroup, Vpc, convert_tags, intern)
+from placement import convert_network_interface
+from ratelimit import MAX_PAGE_RETRIES, RETRY_CONFIG, RateLimiter, backoff, is_throttle
+
+
+# 라우트에서 유지하는 필드 (routing.TARGET_FIELDS + 목적지/상태)
+ROUTE_FIELDS = (
+    'DestinationCidrBlock', 'DestinationIpv6CidrBlock', 'DestinationPrefixListId', 'GatewayId',
+    'NatGatewayId', 'TransitGatewayId', 'VpcPeeringConnectionId', 'EgressOnlyInternetGatewayId',
+    'CarrierGatewayId', 'LocalGatewayId', 'CoreNetworkArn', 'InstanceId', 'NetworkInterfaceId', 'State',
+)
+
+
+def get_tag_value(tags, key):
+    """태그에서 값 추출"""
+    for tag in tags or []:
+        if tag['Key'] == key:
+            return tag['Value']
+    return None
+
+
+def _cidrs(associations, key):
+    """CIDR 연결 목록에서 연결된 CIDR만 추출"""
+    return tuple(
+        association[key] for association in associations or []
+        if association.get(f"{key}State", {}).get('State', 'associated') == 'associated'
+    )
+
+
+def convert_vpc(vpc):
+    """VPC를 레코드로 변환"""
+    return [Vpc(
+        VpcId=intern(vpc['VpcId']),
+        CidrBlock=vpc.get('CidrBlock'),
+        State=intern(vpc.get('State')),
+        IsDefault=vpc.get('IsDefault', False),
+        OwnerId=intern(vpc.get('OwnerId')),
+        CidrBlocks=_cidrs(vpc.get('CidrBlockAssociationSet'), 'CidrBlock') or (vpc.get('CidrBlock'),),
+        Ipv6CidrBlocks=_cidrs(vpc.get('Ipv6CidrBlockAssociationSet'), 'Ipv6CidrBlock'),
+        Tags=convert_tags(vpc.get('Tags')),
+    )]
+
+
+def convert_subnet(subnet):
+    """서브넷을 레코드로 변환"""
+    return [Subnet(
+        SubnetId=intern(subnet['SubnetId']),
+        VpcId=intern(subnet.get('VpcId')),
+        AvailabilityZone=intern(subnet.get('AvailabilityZone')),
+        CidrBlock=subnet.get('CidrBlock'),
+        Ipv6CidrBlocks=_cidrs(subnet.get('Ipv6CidrBlockAssociationSet'), 'Ipv6CidrBlock'),
+        AvailableIpAddressCount=subnet.get('AvailableIpAddressCount'),
+        MapPublicIpOnLaunch=subnet.get('MapPublicIpOnLaunch'),
+        Tags=convert_tags(subnet.get('Tags')),
+    )]
+
+
+def convert_route_table(rt):
+    """라우트 테이블을 레코드로 변환 (라우팅 판단에 쓰는 필드만 유지)"""
+    return [RouteTable(
+        RouteTableId=intern(rt['RouteTableId']),
+        VpcId=intern(rt.get('VpcId')),
+        Routes=tuple(
+            Route(**{field: intern(route[field]) for field in ROUTE_FIELDS if field in route})
+            for route in rt.get('Routes', [])
+        ),
+        Associations=tuple(
+            RouteTableAssociation(
+                RouteTableId=intern(assoc.get('RouteTableId')),
+                SubnetId=intern(assoc.get('SubnetId')),
+                GatewayId=intern(assoc.get('GatewayId')),
+                Main=assoc.get('Main', False),
+            )
+            for assoc in rt.get('Associations', [])
+        ),
+        Tags=convert_tags(rt.get('Tags')),
+    )]
+
+
+def convert_internet_gateway(igw):
+    """인터넷 게이트웨이를 레코드로 변환"""
+    return [InternetGateway(
+        InternetGatewayId=intern(igw['InternetGatewayId']),
+        Attachments=tuple(
+            Attachment(VpcId=intern(a.get('VpcId')), State=intern(a.get('State')))
+            for a in igw.get('Attachments', [])
+        ),
+        Tags=convert_tags(igw.get('Tags')),
+    )]
+
+
+def convert_nat_gateway(nat):
+    """NAT 게이트웨이를 레코드로 변환"""
+    return [NatGateway(
+        NatGatewayId=intern(nat['NatGatewayId']),
+        SubnetId=intern(nat.get('SubnetId')),
+        VpcId=intern(nat.get('VpcId')),
+        State=intern(nat.get('State')),
+        ConnectivityType=intern(nat.get('ConnectivityType')),
+        Tags=convert_tags(nat.get('Tags')),
+    )]
+
+
+def convert_reservation(reservation):
+    """EC2 예약 정보를 인스턴스 레코드 목록으로 변환"""
+    instances = []
+    for instance in reservation['Instances']:
+        if instance['State']['Name'] == 'terminated':
+            continue
+
+        tags = convert_tags(instance.get('Tags'))
+        name = asg = None
+        for tag in tags:
+            if tag.Key == 'Name':
+                name = tag.Value
+            elif tag.Key == 'aws:autoscaling:groupName':
+                asg = intern(tag.Value)
+
+        instances.append(Instance(
+            InstanceId=intern(instance['InstanceId']),
+            InstanceType=intern(instance['InstanceType']),
+            State=intern(instance['State']['Name']),
+            SubnetId=intern(instance.get('SubnetId')),
+            VpcId=intern(instance.get('VpcId')),
+            PrivateIpAddress=instance.get('PrivateIpAddress'),
+            PublicIpAddress=instance.get('PublicIpAddress'),
+            AvailabilityZone=intern(instance.get('Placement', {}).get('AvailabilityZone')),
+            SecurityGroups=tuple(intern(sg['GroupId']) for sg in instance.get('SecurityGroups', [])),
+            Name=name,
+            LaunchTime=instance.get('LaunchTime'),
+            Platform=intern(instance.get('Platform', 'Linux')),
+            KeyName=intern(instance.get('KeyName')),
+            AutoScalingGroup=asg,
+            Tags=tags,
+        ))
+    return instances
+
+
+def convert_db_instance(db):
+    """RDS 인스턴스를 레코드로 변환"""
+    if db['DBInstanceStatus'] == 'deleting':
+        return []
+
+    subnet_group = db.get('DBSubnetGroup', {})
+    return [DBInstance(
+        DBInstanceIdentifier=db['DBInstanceIdentifier'],
+        DBInstanceClass=intern(db['DBInstanceClass']),
+        Engine=intern(db['Engine']),
+        EngineVersion=intern(db['EngineVersion']),
+        DBInstanceStatus=intern(db['DBInstanceStatus']),
+        AvailabilityZone=intern(db.get('AvailabilityZone')),
+        SecondaryAvailabilityZone=intern(db.get('SecondaryAvailabilityZone')),
+        MultiAZ=db.get('MultiAZ', False),
+        VpcId=intern(subnet_group.get('VpcId')),
+        SubnetIds=tuple(intern(subnet['SubnetIdentifier']) for subnet in subnet_group.get('Subnets', [])),
+        Endpoint=db.get('Endpoint', {}).get('Address'),
+        Port=db.get('Endpoint', {}).get('Port'),
+        AllocatedStorage=db.get('AllocatedStorage'),
+        DBName=db.get('DBName'),
+        SecurityGroups=tuple(intern(sg['VpcSecurityGroupId']) for sg in db.get('VpcSecurityGroups', [])
+                             if sg.get('Status', 'active') == 'active'),
+    )]
+
+
+def convert_load_balancer(lb):
+    """로드밸런서를 레코드로 변환"""
+    return [LoadBalancer(
+        LoadBalancerName=lb['LoadBalancerName'],
+        LoadBalancerArn=lb['LoadBalancerArn'],
+        Type=intern(lb['Type']),
+        Scheme=intern(lb['Scheme']),
+        State=intern(lb['State']['Code']),
+        VpcId=intern(lb.get('VpcId')),
+        SubnetIds=tuple(intern(az['SubnetId']) for az in lb.get('AvailabilityZones', [])),
+        DNSName=lb.get('DNSName'),
+        CreatedTime=lb.get('CreatedTime'),
+        SecurityGroups=tuple(intern(sg) for sg in lb.get('SecurityGroups', [])),
+    )]
+
+
+def convert_target_group(tg):
+    """대상 그룹을 레코드로 변환 (ELB -> EC2 도달성의 대상 포트)"""
+    return [TargetGroup(
+        TargetGroupArn=tg['TargetGroupArn'],
+        TargetGroupName=tg.get('TargetGroupName'),
+        Protocol=intern(tg.get('Protocol')),
+        Port=tg.get('Port'),
+        TargetType=intern(tg.get('TargetType')),
+        VpcId=intern(tg.get('VpcId')),
+        LoadBalancerArns=tuple(tg.get('LoadBalancerArns', [])),
+    )]
+
+
+def _security_group_rules(permissions):
+    """IpPermissions -> 규칙 레코드 튜플"""
+    return tuple(
+        SecurityGroupRule(
+            IpProtocol=intern(str(permission.get('IpProtocol', '-1'))),
+            FromPort=permission.get('FromPort'),
+            ToPort=permission.get('ToPort'),
+            CidrBlocks=tuple(intern(r['CidrIp']) for r in permission.get('IpRanges', [])),
+            Ipv6CidrBlocks=tuple(intern(r['CidrIpv6']) for r in permission.get('Ipv6Ranges', [])),
+            PrefixListIds=tuple(intern(r['PrefixListId']) for r in permission.get('PrefixListIds', [])),
+            GroupIds=tuple(intern(r['GroupId']) for r in permission.get('UserIdGroupPairs', []) if r.get('GroupId')),
+        )
+        for permission in permissions or []
+    )
+
+
+def convert_security_group(sg):
+    """보안 그룹을 레코드로 변환 (도달성 분석용 인바운드/아웃바운드 규칙 포함)"""
+    return [SecurityGroup(
+        GroupId=intern(sg['GroupId']),
+        GroupName=sg.get('GroupName'),
+        VpcId=intern(sg.get('VpcId')),
+        IngressRules=_security_group_rules(sg.get('IpPermissions')),
+        EgressRules=_security_group_rules(sg.get('IpPermissionsEgress')),
+        Tags=convert_tags(sg.get('Tags')),
+    )]
+
+
+def convert_network_acl(acl):
+    """네트워크 ACL을 레코드로 변환"""
+    return [NetworkAcl(
+        NetworkAclId=intern(acl['NetworkAclId']),
+        VpcId=intern(acl.get('VpcId')),
+        IsDefault=acl.get('IsDefault', False),
+        Entries=tuple(
+            NetworkAclEntry(
+                RuleNumber=entry['RuleNumber'],
+                Protocol=intern(str(entry.get('Protocol', '-1'))),
+                RuleAction=intern(entry['RuleAction']),
+                Egress=entry.get('Egress', False),
+                CidrBlock=intern(entry.get('CidrBlock')),
+                Ipv6CidrBlock=intern(entry.get('Ipv6CidrBlock')),
+                FromPort=entry.get('PortRange', {}).get('From'),
+                ToPort=entry.get('PortRange', {}).get('To'),
+            )
+            for entry in acl.get('Entries', [])
+        ),
+        SubnetIds=tuple(intern(assoc['SubnetId']) for assoc in acl.get('Associations', []) if assoc.get('SubnetId')),
+        Tags=convert_tags(acl.get('Tags')),
+    )]
+
+
+# 수집기 정의: 결과 키 -> (서비스, 페이지네이터, 응답 키, 페이지 크기, 레코드 변환 함수)
+COLLECTORS = {
+    'vpcs': {
+        'label': 'VPC', 'service': 'ec2', 'operation': 'describe_vpcs',
+        'result_key': 'Vpcs', 'page_size': 1000, 'convert': convert_vpc,
+    },
+    'subnets': {
+        'label': '서브넷', 'service': 'ec2', 'operation': 'describe_subnets',
+        'result_key': 'Subnets', 'page_size': 1000, 'convert': convert_subnet,
+    },
+    'route_tables': {
+        'label': '라우트 테이블', 'service': 'ec2', 'operation': 'describe_route_tables',
+        'result_key': 'RouteTables', 'page_size': 100, 'convert': convert_route_table,
+    },
+    'igws': {
+        'label': 'IGW', 'service': 'ec2', 'operation': 'describe_internet_gateways',
+        'result_key': 'InternetGateways', 'page_size': 1000, 'convert': convert_internet_gateway,
+    },
+    'nats': {
+        'label': 'NAT', 'service': 'ec2', 'operation': 'describe_nat_gateways',
+        'result_key': 'NatGateways', 'page_size': 1000, 'convert': convert_nat_gateway,
+    },
+    'instances': {
+        'label': 'EC2', 'service': 'ec2', 'operation': 'describe_instances',
+        'result_key': 'Reservations', 'page_size': 1000, 'convert': convert_reservation,
+    },
+    'rds_instances': {
+        'label': 'RDS', 'service': 'rds', 'operation': 'describe_db_instances',
+        'result_key': 'DBInstances', 'page_size': 100, 'convert': convert_db_instance,
+    },
+    'load_balancers': {
+        'label': 'ELB', 'service': 'elbv2', 'operation': 'describe_load_balancers',
+        'result_key': 'LoadBalancers', 'page_size': 400, 'convert': convert_load_balancer,
+    },
+    'target_groups': {
+        'label': '대상 그룹', 'service': 'elbv2', 'operation': 'describe_target_groups',
+        'result_key': 'TargetGroups', 'page_size': 400, 'convert': convert_target_group,
+    },
+    # Lambda / ECS / EKS / VPC 엔드포인트 등 서비스별 API 대신 ENI 한 종류로 배치
+    'network_interfaces': {
+        'label': 'ENI', 'service': 'ec2', 'operation': 'describe_network_interfaces',
+        'result_key': 'NetworkInterfaces', 'page_size': 1000, 'convert': convert_network_interface,
+    },
+    # 도달성 분석용 (reachability.py)
+    'security_groups': {
+        'label': '보안 그룹', 'service': 'ec2', 'operation': 'describe_security_groups',
+        'result_key': 'SecurityGroups', 'page_size': 1000, 'convert': convert_security_group,
+    },
+    'network_acls': {
+        'label': 'NACL', 'service': 'ec2', 'operation': 'describe_network_acls',
+        'result_key': 'NetworkAcls', 'page_size': 1000, 'convert': convert_network_acl,
+    },
+}
+
+# 서비스별 페이지 토큰 (요청 파라미터, 응답 키) - 스로틀 후 이어받기용
+PAGE_TOKENS = {
+    'ec2': ('NextToken', 'NextToken'),
+    'rds': ('Marker', 'Marker'),
+    'elbv2': ('Marker', 'NextMarker'),
+}
+
+_DONE = object()
+
+
+class CollectionEngine:
+    """공유 클라이언트 풀 위에서 모든 수집기를 동시에 실행하는 엔진"""
+
+    def __init__(self, region='ap-northeast-2', session=None, max_workers=8, client_hooks=None, limiter=None):
+        # boto3/botocore는 실제 수집 시에만 로드 (스냅샷 기반 보고서/조회는 변환기와 라벨만 사용)
+        import boto3
+
+        self.region = region
+        self.session = session or boto3.session.Session()
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter()
+        self.client_hooks = [self.limiter.attach] + list(client_hooks or [])
+        self.errors = {}
+        self.elapsed = 0.0
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, service):
+        """서비스별 botocore 클라이언트 (스레드 간 공유, 커넥션 풀 포함)"""
+        from botocore.config import Config
+
+        with self._lock:
+            if service not in self._clients:
+                config = Config(max_pool_connections=max(10, self.max_workers * 2), retries=RETRY_CONFIG)
+                client = self.session.client(service, region_name=self.region, config=config)
+                for hook in self.client_hooks:
+                    hook(client)
+                self._clients[service] = client
+            return self._clients[service]
+
+    def iter_pages(self, name, filters=None):
+        """하나의 수집기에 대해 페이지 단위로 변환된 결과 반환 (filters: 서버 측 Filters)"""
+        from botocore.exceptions import ClientError
+        from botocore.paginate import TokenEncoder
+
+        spec = COLLECTORS[name]
+        paginator = self.client(spec['service']).get_paginator(spec['operation'])
+        convert = spec['convert']
+
+        params = {'PaginationConfig': {'PageSize': spec['page_size']}}
+        if filters:
+            params['Filters'] = filters
+
+        # 재시도를 소진한 스로틀 실패는 백오프 후 마지막으로 받은 페이지 다음부터 이어서 수집
+        token_in, token_out = PAGE_TOKENS[spec['service']]
+        attempt = 0
+        while True:
+            try:
+                for page in paginator.paginate(**params):
+                    items = [converted for item in page.get(spec['result_key'], []) for converted in convert(item)]
+                    if page.get(token_out):
+                        params['PaginationConfig']['StartingToken'] = TokenEncoder().encode({token_in: page[token_out]})
+                    yield items
+                    attempt = 0
+                return
+            except ClientError as e:
+                if not is_throttle(e) or attempt >= MAX_PAGE_RETRIES:
+                    raise
+                time.sleep(backoff(attempt))
+                attempt += 1
+
+    def stream(self, names=None):
+        """모든 수집기를 동시에 실행하고 페이지가 도착하는 대로 (이름, 항목) 반환"""
+        names = list(names or COLLECTORS)
+        if not names:
+            return
+
+        results = queue.Queue()
+
+        def worker(name):
+            try:
+                for items in self.iter_pages(name):
+                    results.put((name, items))
+            except Exception as e:
+                results.put((name, e))
+            finally:
+                results.put((name, _DONE))
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names))) as pool:
+            for name in names:
+                pool.submit(worker, name)
+
+            remaining = len(names)
+            while remaining:
+                name, items = results.get()
+                if items is _DONE:
+                    remaining -= 1
+                elif isinstance(items, Exception):
+                    self.errors[name] = items
+                    print(f"    {COLLECTORS[name]['label']} 수집 오류: {items}")
+                else:
+                    yield name, items
+
+    def collect(self, names=None, on_page=None):
+        """모든 수집기의 결과를 끝까지 모아서 반환 (실패한 수집기는 받은 페이지까지만 포함, errors 참조)"""
+        names = list(names or COLLECTORS)
+        data = {name: [] for name in names}
+        self.errors = {}
+
+        started = time.perf_counter()
+        for name, items in self.stream(names):
+            data[name].extend(items)
+            if on_page:
+                on_page(name, items)
+        self.elapsed = time.perf_counter() - started
+
+        return data
+
+    def partial(self):
+        """직전 수집에서 끝까지 받지 못한 수집기 -> 사유"""
+        return {name: str(e) or type(e).__name__ for name, e in self.errors.items()}
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""상주 데몬: 수집된 에스테이트와 인덱스를 메모리에 유지하고 로컬 HTTP(asyncio) API로 조회에 응답
+
+갱신은 주기적(TTL이 지난 타입만 재수집, 오프라인이면 새 스냅샷 재로드)이거나 이벤트 파일
+(EventBridge 대용 JSON Lines)에 기록된 변경 이벤트의 리소스 타입만 재수집한다.
+갱신 때마다 인덱스를 미리 만든 상태(EstateState)로 교체하므로 조회는 AWS를 호출하지 않고 바로 응답한다.
+
+API (GET, JSON):
+    /health                     상태 / 세대 / 마지막 갱신
+    /vpcs, /vpcs/{id}           VPC 요약
+    /subnets/{id}               서브넷 정보 + 배치된 리소스
+    /subnets/{id}/type          서브넷 타입 (public / private / isolated)
+    /resources/{id}             리소스 ID(이름/ARN)가 배치된 서브넷
+    /reach?from=&to=&port=      A -> B 포트 도달 여부와 차단 규칙 (protocol=tcp|udp, to=internet 가능)
+    /diagram?format=&vpc=       다이어그램 (dot / svg / png, vpc 지정 시 VPC 뷰)
+    POST /refresh?collections=  즉시 갱신 (타입 지정 시 해당 타입만 재수집)
+"""
+import asyncio
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from collector import COLLECTORS
+from dot_render import DotEmitter
+from incremental import classify_event
+from queries import filter_estate, reach, resource_index, subnet_details, vpc_summary
+from render_views import split_views
+from snapshot import latest_snapshot, stale_collections
+from topology import TopologyIndex
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8787
+
+# 이벤트 파일 확인 주기와 연속 이벤트를 한 번의 재수집으로 묶는 대기 시간 (초)
+EVENT_POLL_INTERVAL = 1.0
+EVENT_DEBOUNCE = 2.0
+
+# 요청 헤더 수신 제한 시간 (초)
+REQUEST_TIMEOUT = 10.0
+
+# 세대별 응답 캐시 크기 (LRU, 넘치면 가장 오래 조회되지 않은 응답부터 제거)
+RESPONSE_CACHE_SIZE = 256
+
+DIAGRAM_TYPES = {
+    'dot': 'text/vnd.graphviz; charset=utf-8',
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+JSON_TYPE = 'application/json; charset=utf-8'
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class ApiError(Exception):
+    """HTTP 오류 응답으로 변환되는 조회 오류"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(slots=True)
+class EstateState:
+    """한 번의 갱신 결과 - 교체만 하고 수정하지 않으므로 조회 중 갱신이 일어나도 일관됨"""
+    data: dict
+    topology: TopologyIndex
+    reachability: object
+    layout: tuple
+    resources: dict
+    generation: int
+    loaded_at: datetime
+    responses: OrderedDict = field(default_factory=OrderedDict)
+
+
+def event_collections(event):
+    """이벤트 한 건 -> 재수집할 리소스 타입 집합
+
+    EventBridge의 CloudTrail API 호출 이벤트({"detail": {"eventSource", "eventName", ...}}),
+    CloudTrail 레코드({"eventSource", "eventName"}), 또는 {"collections": [...]}를 받는다.
+    """
+    if 'collections' in event:
+        return {name for name in event['collections'] if name in COLLECTORS}
+
+    detail = event.get('detail') or event
+    resource_ids = [arn.rsplit('/', 1)[-1] for arn in event.get('resources', [])]
+    items = ((detail.get('requestParameters') or {}).get('resourcesSet') or {}).get('items', [])
+    resource_ids.extend(item['resourceId'] for item in items if item.get('resourceId'))
+    return set(classify_event(detail.get('eventSource'), detail.get('eventName'), resource_ids))
+
+
+class EstateDaemon:
+    """메모리 상주 에스테이트 + 주기/이벤트 갱신 + asyncio HTTP 조회 API"""
+
+    def __init__(self, mapper, host=DEFAULT_HOST, port=DEFAULT_PORT, interval=None, events_path=None):
+        self.mapper = mapper
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.events_path = events_path
+        self.state = None
+        self.last_error = None
+        self.requests = 0
+        # 매퍼(수집 엔진/인덱스 캐시)는 한 스레드에서만 사용
+        self._worker = ThreadPoolExecutor(max_workers=1)
+        self._base = None
+        self._source = None
+        self._generation = 0
+        self._lock = None
+
+    # ---- 갱신 (워커 스레드) ----
+
+    def _load(self, names=None):
+        """새 데이터 확보 -> 변경이 없으면 None"""
+        mapper = self.mapper
+        if self._base is None:
+            return mapper.load_infrastructure_data()
+
+        # 오프라인: 다른 프로세스(collect 등)가 새 스냅샷을 남겼을 때만 재로드
+        if mapper.from_snapshot or mapper.offline:
+            if mapper.from_snapshot or latest_snapshot(mapper.snapshot_dir) == self._source:
+                return None
+            return mapper.load_infrastructure_data()
+
+        if names:
+            print(f"📨 지정 타입만 재수집 (이벤트/요청): {', '.join(sorted(names))}")
+            return mapper.recollect(self._base, sorted(names))
+        if mapper.incremental:
+            return mapper.refresh_infrastructure_data(self._source, self._base, mapper.fetched_at)
+
+        stale = stale_collections(mapper.fetched_at, COLLECTORS, partial=self._base.get('partial'))
+        if not stale:
+            return None
+        print(f"⏰ TTL 만료 항목 재수집: {', '.join(stale)}")
+        return mapper.recollect(self._base, stale)
+
+    def _refresh(self, names=None):
+        """데이터 갱신 후 조회용 인덱스를 모두 미리 만든 새 상태 반환 (변경 없으면 None)"""
+        data = self._load(names)
+        if data is None:
+            return None
+        self._base = data
+        self._source = latest_snapshot(self.mapper.snapshot_dir)
+        if self.mapper.filters:
+            data = filter_estate(data, **self.mapper.filters)
+
+        mapper = self.mapper
+        topology = mapper.get_topology(data)
+        for subnet_id in topology.subnets:
+            topology.subnet_type(subnet_id)
+        reachability = mapper.get_reachability(data)
+        if reachability is not None and reachability.available:
+            reachability.edges()
+
+        self._generation += 1
+        return EstateState(
+            data=data,
+            topology=topology,
+            reachability=reachability,
+            layout=mapper.analyze_complexity(data),
+            resources=resource_index(topology),
+            generation=self._generation,
+            loaded_at=datetime.now(timezone.utc),
+        )
+
+    async def refresh(self, names=None):
+        """갱신 실행 (동시에 하나만) -> 상태 교체 여부"""
+        async with self._lock:
+            started = time.perf_counter()
+            try:
+                state = await asyncio.get_running_loop().run_in_executor(self._worker, self._refresh, names)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ 갱신 실패 (기존 상태 유지): {self.last_error}")
+                return False
+
+            self.last_error = None
+            if state is None:
+                return False
+            self.state = state
+            print(f"🔄 에스테이트 갱신 #{state.generation} ({time.perf_counter() - started:.2f}s): "
+                  f"VPC {len(state.topology.vpcs)}개, 서브넷 {len(state.topology.subnets)}개")
+            return True
+
+    async def schedule(self):
+        """주기적 갱신"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    async def watch_events(self):
+        """이벤트 파일(JSON Lines)에 추가된 줄을 읽어 변경된 타입만 모아서 재수집"""
+        offset = os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0
+        pending, last_event = set(), 0.0
+        while True:
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            if os.path.exists(self.events_path):
+                size = os.path.getsize(self.events_path)
+                if size < offset:
+                    offset = 0
+                if size > offset:
+                    with open(self.events_path, 'rb') as f:
+                        f.seek(offset)
+                        chunk = f.read(size - offset)
+                    # 마지막 줄이 아직 다 쓰이지 않았으면 다음 확인 때 다시 읽음
+                    complete = chunk.rfind(b'\n') + 1
+                    offset += complete
+                    for line in chunk[:complete].splitlines():
+                        if not line.strip():
+                            continue
+                        try:
+                            names = event_collections(json.loads(line))
+                        except (ValueError, AttributeError, TypeError) as e:
+                            print(f"⚠️ 이벤트 무시 (형식 오류): {e}")
+                            continue
+                        if names:
+                            pending |= names
+                            last_event = time.monotonic()
+
+            if pending and time.monotonic() - last_event >= EVENT_DEBOUNCE:
+                names, pending = pending, set()
+                await self.refresh(names)
+
+    # ---- 조회 ----
+
+    def _emit_dot(self, state, vpc_id=None):
+        """전체 또는 VPC 뷰 DOT 문서 (VPC가 없으면 None)"""
+        _, spacing, direction = state.layout
+        options = dict(direction=direction, spacing=spacing, splines=self.mapper.splines, lod=self.mapper.lod,
+                       reachability=state.reachability)
+        if vpc_id is None:
+            return DotEmitter(**options).emit(state.data, state.topology)
+
+        for _, view, subnet_types in split_views(state.data, state.topology):
+            if view['vpcs'][0]['VpcId'] == vpc_id:
+                view_topology = TopologyIndex(view, classify=lambda subnet: subnet_types[subnet['SubnetId']])
+                return DotEmitter(**options).emit(view, view_topology)
+        return None
+
+    async def diagram(self, state, fmt, vpc_id=None):
+        """다이어그램 바이트 (Graphviz 레이아웃은 비동기 서브프로세스)"""
+        if fmt not in DIAGRAM_TYPES:
+            raise ApiError(400, f"지원하지 않는 형식: {fmt} ({', '.join(DIAGRAM_TYPES)})")
+
+        loop = asyncio.get_running_loop()
+        dot = await loop.run_in_executor(None, self._emit_dot, state, vpc_id)
+        if dot is None:
+            raise ApiError(404, f"VPC를 찾을 수 없습니다: {vpc_id}")
+        if fmt == 'dot':
+            return dot.encode('utf-8')
+
+        dot_binary = shutil.which('dot')
+        if dot_binary is None:
+            raise ApiError(503, "Graphviz(dot)가 설치되지 않았습니다 (format=dot 사용 가능)")
+        process = await asyncio.create_subprocess_exec(
+            dot_binary, f"-T{fmt}",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        output, error = await process.communicate(dot.encode('utf-8'))
+        if process.returncode:
+            raise ApiError(500, f"Graphviz 레이아웃 실패: {error.decode('utf-8', 'replace').strip()}")
+        return output
+
+    def health(self):
+        state = self.state
+        return {
+            'ready': state is not None,
+            'generation': state.generation if state else 0,
+            'loaded_at': state.loaded_at.isoformat() if state else None,
+            'vpcs': len(state.topology.vpcs) if state else 0,
+            'subnets': len(state.topology.subnets) if state else 0,
+            'refreshing': self._lock.locked(),
+            'last_error': self.last_error,
+            'requests': self.requests,
+        }
+
+    def query(self, state, parts):
+        """GET 경로 -> JSON 결과 (없으면 ApiError)"""
+        topology = state.topology
+        if parts == ['vpcs']:
+            return [vpc_summary(topology, vpc_id) for vpc_id in topology.vpcs]
+        if len(parts) == 2 and parts[0] == 'vpcs':
+            result = vpc_summary(topology, parts[1])
+        elif len(parts) == 2 and parts[0] == 'subnets':
+            result = subnet_details(topology, parts[1])
+        elif len(parts) == 3 and parts[0] == 'subnets' and parts[2] == 'type':
+            result = None
+            if parts[1] in topology.subnets:
+                result = {'subnet_id': parts[1], 'subnet_type': topology.subnet_type(parts[1])}
+        elif len(parts) == 2 and parts[0] == 'resources':
+            result = state.resources.get(parts[1])
+        else:
+            raise ApiError(404, "알 수 없는 경로")
+
+        if not result:
+            raise ApiError(404, f"찾을 수 없습니다: {parts[1]}")
+        return result
+
+    def reach(self, state, source_id, target_id, port, protocol):
+        """도달성 판정 결과 (리소스가 없으면 ApiError)"""
+        if state.reachability is None or not state.reachability.available:
+            raise ApiError(503, "도달성 분석을 사용할 수 없습니다 (보안 그룹 미수집 또는 --no-reachability)")
+        if not (source_id and target_id and port):
+            raise ApiError(400, "from, to, port 파라미터가 필요합니다")
+        if protocol not in ('tcp', 'udp'):
+            raise ApiError(400, f"지원하지 않는 프로토콜: {protocol}")
+        try:
+            port = int(port)
+        except ValueError:
+            raise ApiError(400, f"잘못된 포트: {port}") from None
+        result = reach(state.reachability, source_id, target_id, port, protocol)
+        if result is None:
+            raise ApiError(404, f"찾을 수 없습니다: {source_id} -> {target_id}")
+        return result
+
+    async def dispatch(self, method, target):
+        """요청 -> (상태 코드, Content-Type, 본문)"""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        params = parse_qs(url.query)
+
+        if method == 'POST' and parts == ['refresh']:
+            names = {name for value in params.get('collections', []) for name in value.split(',') if name}
+            unknown = names - set(COLLECTORS)
+            if unknown:
+                raise ApiError(400, f"알 수 없는 리소스 타입: {', '.join(sorted(unknown))}")
+            changed = await self.refresh(names or None)
+            return 200, JSON_TYPE, self._json({'changed': changed, **self.health()})
+        if method != 'GET':
+            raise ApiError(405, f"지원하지 않는 메서드: {method}")
+        if parts == ['health']:
+            return 200, JSON_TYPE, self._json(self.health())
+
+        state = self.state
+        if state is None:
+            raise ApiError(503, "초기 로드 중입니다")
+
+        # 상태는 불변이므로 같은 요청의 응답은 다음 갱신 전까지 재사용
+        # (키는 핸들러가 읽는 값만으로 정규화: 쿼리 순서/무관한 파라미터는 같은 응답)
+        if parts == ['diagram']:
+            fmt = params.get('format', ['svg'])[0]
+            vpc_id = params.get('vpc', [None])[0]
+            key = ('diagram', fmt, vpc_id)
+        elif parts == ['reach']:
+            key = ('reach',) + tuple(params.get(name, [None])[0] for name in ('from', 'to', 'port')) + (
+                params.get('protocol', ['tcp'])[0],)
+        else:
+            key = tuple(parts)
+
+        response = state.responses.get(key)
+        if response is None:
+            if parts == ['diagram']:
+                response = (DIAGRAM_TYPES.get(fmt), await self.diagram(state, fmt, vpc_id))
+            elif parts == ['reach']:
+                response = (JSON_TYPE, self._json(self.reach(state, *key[1:])))
+            else:
+                response = (JSON_TYPE, self._json(self.query(state, parts)))
+            state.responses[key] = response
+            if len(state.responses) > RESPONSE_CACHE_SIZE:
+                state.responses.popitem(last=False)
+        else:
+            state.responses.move_to_end(key)
+        content_type, body = response
+        return 200, content_type, body
+
+    @staticmethod
+    def _json(value):
+        return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+    async def handle(self, reader, writer):
+        """HTTP/1.1 요청 하나 처리 (응답 후 연결 종료)"""
+        self.requests += 1
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length') or 0)
+            if length:
+                await reader.readexactly(length)
+            status, content_type, body = await self.dispatch(method, target)
+        except ApiError as e:
+            status, content_type, body = e.status, JSON_TYPE, self._json({'error': str(e)})
+        except (ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            status, content_type, body = 400, JSON_TYPE, self._json({'error': "잘못된 요청"})
+        except Exception as e:
+            status, content_type, body = 500, JSON_TYPE, self._json({'error': f"{type(e).__name__}: {e}"})
+
+        generation = self.state.generation if self.state else 0
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Estate-Generation: {generation}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """초기 로드 후 HTTP 서버와 갱신 작업 실행"""
+        self._lock = asyncio.Lock()
+        await self.refresh()
+        if self.state is None:
+            print("❌ 초기 로드에 실패하여 데몬을 시작하지 않습니다.")
+            return
+
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        tasks = []
+        if self.interval:
+            tasks.append(asyncio.create_task(self.schedule()))
+        if self.events_path:
+            tasks.append(asyncio.create_task(self.watch_events()))
+
+        print(f"🛰️ 데몬 시작: http://{self.host}:{self.port} "
+              f"(갱신 주기: {f'{self.interval:g}s' if self.interval else '없음'}, "
+              f"이벤트 파일: {self.events_path or '없음'})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._worker.shutdown(wait=False)
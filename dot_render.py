@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""diagrams 라이브러리 없이 수집 데이터에서 DOT/SVG를 직접 생성하는 렌더링 백엔드"""
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import time
+from functools import lru_cache
+
+from collector import get_tag_value
+from lod import kind_counts, summary_label
+from placement import SERVICE_TYPES
+from reachability import resource_key
+
+SPLINE_MODES = ('ortho', 'polyline', 'spline', 'curved', 'line', 'false')
+
+# 노드 종류 -> diagrams 패키지 아이콘 경로 (resources/ 기준)
+ICONS = {
+    'internet': 'onprem/network/internet.png',
+    'igw': 'aws/network/internet-gateway.png',
+    'nat': 'aws/network/nat-gateway.png',
+    'ec2': 'aws/compute/ec2.png',
+    'rds': 'aws/database/rds.png',
+    'elb': 'aws/network/elastic-load-balancing.png',
+    'vpc': 'aws/network/vpc.png',
+    'lambda': 'aws/compute/lambda.png',
+    'ecs': 'aws/compute/elastic-container-service.png',
+    'eks': 'aws/compute/elastic-kubernetes-service.png',
+    'vpc_endpoint': 'aws/network/endpoint.png',
+}
+
+# diagrams 기본 스타일과 동일하게 유지
+GRAPH_ATTRS = {
+    'pad': '2.0', 'fontname': 'Sans-Serif', 'fontsize': '15', 'fontcolor': '#2D3436',
+    'label': 'AWS Infrastructure Architecture', 'labelloc': 't',
+}
+NODE_ATTRS = {
+    'shape': 'box', 'style': 'rounded', 'fixedsize': 'true', 'width': '1.4', 'height': '1.4',
+    'labelloc': 'b', 'imagescale': 'true', 'fontname': 'Sans-Serif', 'fontsize': '13',
+    'fontcolor': '#2D3436',
+}
+EDGE_ATTRS = {'color': '#7B8894'}
+# SG/NACL/라우트 기준 도달 가능 간선 (ortho 모드는 label을 지원하지 않아 xlabel 사용)
+REACH_EDGE_ATTRS = {'color': '#2E86C1', 'style': 'dashed', 'fontsize': '10', 'fontcolor': '#2E86C1'}
+CLUSTER_ATTRS = {
+    'shape': 'box', 'style': 'rounded', 'labeljust': 'l', 'pencolor': '#AEB6BE',
+    'fontname': 'Sans-Serif', 'fontsize': '12', 'margin': '16',
+}
+CLUSTER_COLORS = ('#E5F5FD', '#EBF3E7', '#ECE8F6', '#FDF7E3')
+
+_ID_PATTERN = re.compile(r'[^0-9A-Za-z_]')
+
+
+def safe_label(text, max_length=15):
+    """텍스트 길이를 안전하게 제한"""
+    if not text:
+        return "Unknown"
+
+    if len(text) <= max_length:
+        return text
+
+    # 긴 텍스트를 여러 줄로 분할
+    lines = []
+    for i in range(0, len(text), max_length):
+        lines.append(text[i:i+max_length])
+
+    return '\n'.join(lines[:2])  # 최대 2줄까지만
+
+
+@lru_cache(maxsize=None)
+def resources_dir():
+    """diagrams 패키지의 아이콘 디렉터리 (패키지를 import 하지 않고 위치만 조회)"""
+    try:
+        spec = importlib.util.find_spec('diagrams')
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or not spec.origin:
+        return None
+    path = os.path.join(os.path.dirname(os.path.dirname(spec.origin)), 'resources')
+    return path if os.path.isdir(path) else None
+
+
+@lru_cache(maxsize=None)
+def icon_path(kind):
+    """노드 종류별 아이콘 파일 경로 (없으면 None)"""
+    base = resources_dir()
+    if base is None or kind not in ICONS:
+        return None
+    path = os.path.join(base, ICONS[kind])
+    return path if os.path.exists(path) else None
+
+
+def node_id(kind, resource_id):
+    """리소스 ID 기반의 결정적 노드 ID"""
+    return f"{kind}_{_ID_PATTERN.sub('_', resource_id)}"
+
+
+def group_node_id(kind, subnet_id, key):
+    """LOD 그룹 노드 ID (그룹 키는 태그 값 등 임의 문자열이므로 치환 대신 해시 - 'web-1'과 'web.1' 구분)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()
+    return node_id(f"{kind}grp", f"{subnet_id}_{digest}")
+
+
+def quote(text):
+    """DOT 문자열 리터럴"""
+    escaped = str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'
+
+
+def format_attrs(attrs):
+    return ', '.join(f"{key}={quote(value)}" for key, value in attrs.items())
+
+
+class DotEmitter:
+    """VPC -> AZ -> 서브넷 클러스터 구조의 DOT 문서 생성기"""
+
+    def __init__(self, direction='TB', spacing=1.0, splines='ortho', lod=None, drilldown_dir=None,
+                 reachability=None, drilldown_format='svg'):
+        if splines not in SPLINE_MODES:
+            raise ValueError(f"지원하지 않는 spline 모드: {splines} ({', '.join(SPLINE_MODES)})")
+
+        self.graph_attrs = dict(GRAPH_ATTRS)
+        self.graph_attrs.update({
+            'rankdir': direction,
+            'splines': splines,
+            'nodesep': str(0.8 * spacing),
+            'ranksep': str(1.0 * spacing),
+            'pad': '1.0',
+        })
+        self.direction = direction
+        self.spacing = spacing
+        self.splines = splines
+        self.lod = lod
+        self.drilldown_dir = drilldown_dir
+        self.drilldown_format = drilldown_format
+        self.reachability = reachability
+        self.resource_nodes = {}
+        self.level = 'resource'
+        self.drilldowns = []
+        self.lines = []
+        self.edges = []
+        self.node_count = 0
+        self._depth = 0
+
+    def _write(self, line):
+        self.lines.append('    ' * (self._depth + 1) + line)
+
+    def node(self, nid, kind, label, url=None):
+        """아이콘 노드 추가 (라벨 줄 수만큼 높이 보정)"""
+        attrs = {'label': label}
+        if url:
+            attrs['URL'] = url
+        icon = icon_path(kind)
+        if icon:
+            attrs.update({'shape': 'none', 'image': icon,
+                          'height': str(1.4 + 0.4 * label.count('\n'))})
+        self._write(f"{nid} [{format_attrs(attrs)}]")
+        self.node_count += 1
+        return nid
+
+    def edge(self, source, target, attrs=None):
+        self.edges.append(f"{source} -> {target} [{format_attrs(attrs)}]" if attrs else f"{source} -> {target}")
+
+    def register(self, kind, resource, nid):
+        """리소스 -> 노드 매핑 (여러 서브넷에 걸친 리소스는 첫 노드, 그룹 노드는 구성원 전체)"""
+        key = resource_key(kind, resource)
+        if key is not None:
+            self.resource_nodes.setdefault(key, nid)
+
+    def register_summary(self, topology, subnets, nid):
+        """요약 노드(서브넷 / AZ / VPC)에 서브넷 목록의 EC2 / RDS / ELB 전체를 매핑"""
+        for subnet in subnets:
+            resources = topology.resources(subnet['SubnetId'])
+            for kind, key in (('ec2', 'instances'), ('rds', 'rds_instances'), ('elb', 'load_balancers')):
+                for resource in resources[key]:
+                    self.register(kind, resource, nid)
+
+    def begin_cluster(self, cid, label):
+        attrs = dict(CLUSTER_ATTRS)
+        attrs.update({'label': label, 'bgcolor': CLUSTER_COLORS[self._depth % len(CLUSTER_COLORS)]})
+        self._write(f"subgraph cluster_{cid} {{")
+        self._depth += 1
+        self._write(f"graph [{format_attrs(attrs)}]")
+
+    def end_cluster(self):
+        self._depth -= 1
+        self._write("}")
+
+    def emit(self, data, topology):
+        """수집 데이터와 토폴로지 인덱스로 DOT 문서 생성"""
+        internet = self.node('internet', 'internet', 'Internet')
+        if self.lod:
+            self.level = self.lod.choose_level(topology)
+
+        for vpc in data['vpcs']:
+            vpc_id = vpc['VpcId']
+            vpc_name = get_tag_value(vpc.get('Tags', []), 'Name') or f"VPC-{vpc_id[-8:]}"
+            total_resources = topology.vpc_count(vpc_id)
+
+            self.begin_cluster(
+                node_id('vpc', vpc_id),
+                f"{safe_label(vpc_name, 20)}\n{vpc['CidrBlock']}\n({total_resources} resources)"
+            )
+
+            # Internet Gateway
+            igw_node = None
+            for igw in topology.vpc_igws.get(vpc_id, []):
+                igw_node = self.node(node_id('igw', igw['InternetGatewayId']), 'igw', 'IGW')
+                self.edge(internet, igw_node)
+
+            # VPC 요약 수준
+            if self.level == 'vpc':
+                if total_resources:
+                    subnets = topology.vpc_subnets.get(vpc_id, [])
+                    nid = self.node(node_id('vpcsum', vpc_id), 'ec2', summary_label('', kind_counts(topology, subnets)))
+                    self.register_summary(topology, subnets, nid)
+                self.end_cluster()
+                continue
+
+            for az, subnets in topology.vpc_azs.get(vpc_id, {}).items():
+                az_resources = topology.az_count(vpc_id, az)
+                if az_resources == 0:
+                    continue  # 리소스가 없는 AZ는 건너뛰기
+
+                self.begin_cluster(node_id('az', f"{vpc_id}_{az}"), f"AZ: {az[-1]} ({az_resources} resources)")
+                if self.level == 'az':
+                    nid = self.node(node_id('azsum', f"{vpc_id}_{az}"), 'ec2',
+                                    summary_label('', kind_counts(topology, subnets)))
+                    self.register_summary(topology, subnets, nid)
+                else:
+                    for subnet in subnets:
+                        self.emit_subnet(subnet, topology, igw_node)
+
+                # NAT Gateway
+                for subnet in subnets:
+                    for nat in topology.subnet_nats.get(subnet['SubnetId'], []):
+                        if nat.get('State') == 'available':
+                            nat_node = self.node(node_id('nat', nat['NatGatewayId']), 'nat',
+                                                 f"NAT-{nat['NatGatewayId'][-8:]}")
+                            self.register('nat', nat, nat_node)
+                            if igw_node:
+                                self.edge(igw_node, nat_node)
+                self.end_cluster()
+
+            self.end_cluster()
+
+        if self.reachability is not None and self.reachability.available:
+            self.emit_reachability()
+        return self.document()
+
+    def emit_reachability(self):
+        """도달 가능 간선 (ELB -> EC2, EC2 -> RDS, EC2 -> NAT) - 양 끝 노드가 그려진 경우만, 노드 쌍당 하나
+
+        요약/그룹 노드로 축약된 리소스는 그 노드의 간선으로 합쳐지며, 같은 노드 안의 간선과
+        NAT 노드를 그리지 않는 VPC 요약 수준의 EC2 -> NAT 간선은 그리지 않는다.
+        """
+        seen = set()
+        for source, target, port in self.reachability.edges():
+            source_node = self.resource_nodes.get(source)
+            target_node = self.resource_nodes.get(target)
+            if source_node and target_node and source_node != target_node and (source_node, target_node) not in seen:
+                seen.add((source_node, target_node))
+                self.edge(source_node, target_node, dict(REACH_EDGE_ATTRS, xlabel=str(port)))
+
+    def emit_subnet(self, subnet, topology, igw_node):
+        """서브넷 클러스터와 리소스 노드"""
+        subnet_id = subnet['SubnetId']
+        if topology.subnet_count(subnet_id) == 0:
+            return  # 리소스가 없는 서브넷은 건너뛰기
+
+        subnet_name = get_tag_value(subnet.get('Tags', []), 'Name') or f"subnet-{subnet_id[-8:]}"
+        subnet_type = topology.subnet_type(subnet_id)
+        resources = topology.resources(subnet_id)
+        public = subnet_type == 'public' and igw_node
+
+        self.begin_cluster(node_id('subnet', subnet_id),
+                           f"{safe_label(subnet_name, 15)}\n({subnet_type})\n{subnet['CidrBlock']}")
+
+        # 상세 수준에 따라 요약/그룹 노드로 축약하고 상세 보기는 별도 파일로
+        if self.lod and (self.level == 'subnet' or self.lod.collapse(topology, subnet_id)):
+            url = self.drilldown_url(subnet_id)
+            self.drilldowns.append(subnet)
+            if self.level == 'subnet':
+                nid = self.node(node_id('subnetsum', subnet_id), 'ec2',
+                                summary_label('', kind_counts(topology, [subnet])), url)
+                self.register_summary(topology, [subnet], nid)
+                if public:
+                    self.edge(igw_node, nid)
+            else:
+                for kind, key, label, members in self.lod.groups(resources):
+                    nid = self.node(group_node_id(kind, subnet_id, key), kind, label, url)
+                    for member in members:
+                        self.register(kind, member, nid)
+                    if public and kind in ('ec2', 'elb'):
+                        self.edge(igw_node, nid)
+            self.end_cluster()
+            return
+
+        for instance in resources['instances']:
+            name = instance.get('Name') or f"EC2-{instance['InstanceId'][-8:]}"
+            label = f"{safe_label(name, 12)}\n{instance['InstanceType']}\n{instance['State']}"
+            nid = self.node(node_id('ec2', instance['InstanceId']), 'ec2', label)
+            self.register('ec2', instance, nid)
+            if public:
+                self.edge(igw_node, nid)
+
+        # RDS / ELB는 여러 서브넷에 걸칠 수 있으므로 서브넷별로 노드 ID 구분
+        for rds in resources['rds_instances']:
+            label = f"{safe_label(rds['DBInstanceIdentifier'], 12)}\n{rds['Engine']}\n{rds['DBInstanceStatus']}"
+            nid = self.node(node_id('rds', f"{rds['DBInstanceIdentifier']}_{subnet_id}"), 'rds', label)
+            self.register('rds', rds, nid)
+
+        for elb in resources['load_balancers']:
+            label = f"{safe_label(elb['LoadBalancerName'], 12)}\n{elb['Type']}\n{elb['Scheme']}"
+            nid = self.node(node_id('elb', f"{elb['LoadBalancerName']}_{subnet_id}"), 'elb', label)
+            self.register('elb', elb, nid)
+            if public:
+                self.edge(igw_node, nid)
+
+        # ENI로 배치된 서비스 (Lambda / ECS / EKS / VPC 엔드포인트)
+        for service in resources['services']:
+            kind = service['ServiceType']
+            label = f"{safe_label(service['ServiceId'], 12)}\n{SERVICE_TYPES[kind]}"
+            self.node(node_id(kind, f"{service['ServiceId']}_{subnet_id}"), kind, label)
+
+        self.end_cluster()
+
+    def drilldown_url(self, subnet_id):
+        """축약된 서브넷의 상세 보기 파일 경로"""
+        if not self.drilldown_dir:
+            return None
+        return os.path.join(os.path.basename(self.drilldown_dir), f"{subnet_id}.{self.drilldown_format}")
+
+    def emit_drilldown(self, subnet, topology):
+        """축약된 서브넷의 상세 보기 DOT 문서 (서브넷 요약 수준이면 그룹, 그룹 수준이면 개별 리소스)"""
+        emitter = DotEmitter(self.direction, self.spacing, self.splines,
+                             lod=self.lod if self.level == 'subnet' else None)
+        emitter.level = 'group'
+        igw_node = None
+        vpc_igws = topology.vpc_igws.get(subnet['VpcId'], [])
+        if vpc_igws:
+            igw_node = emitter.node(node_id('igw', vpc_igws[0]['InternetGatewayId']), 'igw', 'IGW')
+        emitter.emit_subnet(subnet, topology, igw_node)
+        return emitter.document()
+
+    def write_drilldowns(self, topology):
+        """축약된 서브넷들의 상세 보기 DOT 파일 생성 -> 경로 목록"""
+        if not self.drilldown_dir or not self.drilldowns:
+            return []
+        os.makedirs(self.drilldown_dir, exist_ok=True)
+        return [
+            write_dot(os.path.join(self.drilldown_dir, f"{subnet['SubnetId']}.dot"),
+                      self.emit_drilldown(subnet, topology))
+            for subnet in self.drilldowns
+        ]
+
+    def document(self):
+        """완성된 DOT 문서 텍스트"""
+        header = [
+            'digraph "AWS Infrastructure Architecture" {',
+            f"    graph [{format_attrs(self.graph_attrs)}]",
+            f"    node [{format_attrs(NODE_ATTRS)}]",
+            f"    edge [{format_attrs(EDGE_ATTRS)}]",
+        ]
+        edges = ['    ' + edge for edge in self.edges]
+        return '\n'.join(header + self.lines + edges + ['}', ''])
+
+
+def write_dot(path, dot):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dot)
+    return path
+
+
+def layout(dot_path, fmt='svg'):
+    """Graphviz로 레이아웃/래스터화 -> (출력 경로, 소요 시간). dot 명령이 없으면 (None, 0)"""
+    dot_binary = shutil.which('dot')
+    if dot_binary is None:
+        return None, 0.0
+
+    output = f"{os.path.splitext(dot_path)[0]}.{fmt}"
+    started = time.perf_counter()
+    subprocess.run([dot_binary, f"-T{fmt}", dot_path, '-o', output], check=True)
+    return output, time.perf_counter() - started
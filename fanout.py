@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""여러 계정/리전을 프로세스 풀로 병렬 스캔하여 하나의 에스테이트로 병합"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import boto3
+
+from collector import COLLECTORS, CollectionEngine
+from model import pack, unpack
+
+
+def create_session(account=None, region=None):
+    """계정 지정자(역할 ARN / 프로파일 이름 / None)로 세션 생성"""
+    if not account:
+        return boto3.session.Session(region_name=region)
+
+    if account.startswith('arn:'):
+        sts = boto3.client('sts', region_name=region)
+        credentials = sts.assume_role(
+            RoleArn=account, RoleSessionName='aws-architecture-mapper'
+        )['Credentials']
+        return boto3.session.Session(
+            aws_access_key_id=credentials['AccessKeyId'],
+            aws_secret_access_key=credentials['SecretAccessKey'],
+            aws_session_token=credentials['SessionToken'],
+            region_name=region,
+        )
+
+    return boto3.session.Session(profile_name=account, region_name=region)
+
+
+def resolve_regions(regions, account=None):
+    """'all' 지정 시 계정에서 활성화된 전체 리전 목록 조회"""
+    if regions and 'all' not in regions:
+        return list(regions)
+
+    session = create_session(account, 'us-east-1')
+    response = session.client('ec2').describe_regions(AllowAllRegions=False)
+    return sorted(r['RegionName'] for r in response['Regions'])
+
+
+def scan_target(account, region, max_workers=8):
+    """하나의 (계정, 리전) 스캔 - 워커 프로세스에서 실행"""
+    session = create_session(account, region)
+    account_id = session.client('sts').get_caller_identity()['Account']
+
+    engine = CollectionEngine(region=region, session=session, max_workers=max_workers)
+    data = engine.collect()
+
+    for items in data.values():
+        for item in items:
+            item['Region'] = region
+            item['AccountId'] = account_id
+
+    # 레코드는 값 튜플 행으로 압축해서 반환 (필드명 반복 없이 pickle, intern된 문자열은 한 번만 기록)
+    return {
+        'account': account_id,
+        'region': region,
+        'data': {name: pack(items) for name, items in data.items()},
+        'errors': engine.partial(),
+    }
+
+
+def merge_results(results):
+    """워커 결과를 하나의 에스테이트 모델로 병합"""
+    estate = {name: [] for name in COLLECTORS}
+    accounts, regions = set(), set()
+    scan_errors = []
+    partial = {}
+
+    for result in results:
+        # 리전 조회에 실패한 계정은 region이 None (계정 전체 누락)
+        target = f"{result['account'] or 'default'} / {result['region'] or '전체 리전'}"
+        if 'error' in result:
+            scan_errors.append(result)
+            for name in COLLECTORS:
+                partial.setdefault(name, []).append(target)
+            continue
+
+        accounts.add(result['account'])
+        regions.add(result['region'])
+        for name, packed in result['data'].items():
+            estate.setdefault(name, []).extend(unpack(*packed))
+        for name, error in result['errors'].items():
+            scan_errors.append({
+                'account': result['account'], 'region': result['region'],
+                'collector': name, 'error': error,
+            })
+            partial.setdefault(name, []).append(target)
+
+    estate['scope'] = {'accounts': sorted(accounts), 'regions': sorted(regions)}
+    estate['scan_errors'] = scan_errors
+    if partial:
+        estate['partial'] = {name: f"누락된 대상: {', '.join(targets)}" for name, targets in partial.items()}
+    return estate
+
+
+def scan_estate(accounts=None, regions=None, processes=None, max_workers=8):
+    """계정 x 리전 조합을 워커 프로세스로 병렬 스캔 (실패한 계정/대상은 scan_errors와 partial에 기록)"""
+    accounts = list(accounts or [None])
+    processes = processes or os.cpu_count() or 1
+
+    targets, results = [], []
+    for account in accounts:
+        try:
+            for region in resolve_regions(regions, account):
+                targets.append((account, region))
+        except Exception as e:
+            print(f"    ❌ 리전 조회 오류 ({account or 'default'}): {e}")
+            results.append({'account': account, 'region': None, 'error': str(e)})
+
+    print(f"  - {len(targets)}개 대상 (계정 {len(accounts)} x 리전) 스캔, 프로세스 {processes}개")
+
+    with ProcessPoolExecutor(max_workers=min(processes, max(len(targets), 1))) as pool:
+        futures = {
+            pool.submit(scan_target, account, region, max_workers): (account, region)
+            for account, region in targets
+        }
+        for future in as_completed(futures):
+            account, region = futures[future]
+            try:
+                result = future.result()
+                print(f"    ✅ {result['account']} / {region}")
+            except Exception as e:
+                print(f"    ❌ {account or 'default'} / {region}: {e}")
+                result = {'account': account, 'region': region, 'error': str(e)}
+            results.append(result)
+
+    return merge_results(results)
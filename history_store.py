@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""수집 이력을 SQLite에 버전 행으로 누적 저장하고 시점/구간 조회 (변경된 리소스만 새 행 추가)
+
+각 엔티티(VPC / 서브넷 / 라우팅 테이블 / 리소스)는 내용 해시가 바뀔 때만 새 버전 행을 추가하고,
+이전 버전은 valid_to에 종료 스냅샷 ID를 기록한다. 따라서 저장 공간은 스캔 횟수가 아니라 변경량에 비례하고,
+시점 조회는 valid_from <= 스냅샷 < valid_to 범위 검색, 구간 집계는 버전 경계(+1/-1)만 훑어서 계산한다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from incremental import RESOURCE_ID_KEYS
+from model import Record, from_dicts, vpc_key
+from snapshot import DEFAULT_SNAPSHOT_DIR
+
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_SNAPSHOT_DIR, 'history.sqlite3')
+SCHEMA_VERSION = 2
+
+# 컬렉션 -> 식별자 키 (diff 기준 키 + 라우팅 테이블 / IGW)
+ID_KEYS = dict(RESOURCE_ID_KEYS, route_tables='RouteTableId', igws='InternetGatewayId')
+
+# 전용 테이블에 저장하는 컬렉션 (나머지는 resources 테이블에 kind로 구분)
+DEDICATED_TABLES = ('vpcs', 'subnets', 'route_tables')
+
+# 서브넷 배치를 기록하는 리소스 종류 (토폴로지 배치 기준, NAT / ENI는 자체 SubnetId)
+PLACED_KINDS = ('instances', 'rds_instances', 'load_balancers')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    scope TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_taken_at ON snapshots (taken_at);
+
+CREATE TABLE IF NOT EXISTS vpcs (
+    row_id INTEGER PRIMARY KEY,
+    entity_key TEXT NOT NULL,
+    vpc_id TEXT NOT NULL,
+    account_id TEXT,
+    region TEXT,
+    cidr TEXT,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    valid_from INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    valid_to INTEGER REFERENCES snapshots (snapshot_id)
+);
+CREATE INDEX IF NOT EXISTS vpcs_entity ON vpcs (entity_key, valid_from);
+CREATE INDEX IF NOT EXISTS vpcs_vpc ON vpcs (vpc_id, valid_from);
+
+CREATE TABLE IF NOT EXISTS subnets (
+    row_id INTEGER PRIMARY KEY,
+    entity_key TEXT NOT NULL,
+    subnet_id TEXT NOT NULL,
+    vpc_key TEXT NOT NULL,
+    account_id TEXT,
+    region TEXT,
+    cidr TEXT,
+    az TEXT,
+    subnet_type TEXT,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    valid_from INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    valid_to INTEGER REFERENCES snapshots (snapshot_id)
+);
+CREATE INDEX IF NOT EXISTS subnets_entity ON subnets (entity_key, valid_from);
+CREATE INDEX IF NOT EXISTS subnets_subnet ON subnets (subnet_id, valid_from);
+CREATE INDEX IF NOT EXISTS subnets_vpc ON subnets (vpc_key, valid_from);
+
+CREATE TABLE IF NOT EXISTS route_tables (
+    row_id INTEGER PRIMARY KEY,
+    entity_key TEXT NOT NULL,
+    route_table_id TEXT NOT NULL,
+    vpc_key TEXT NOT NULL,
+    account_id TEXT,
+    region TEXT,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    valid_from INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    valid_to INTEGER REFERENCES snapshots (snapshot_id)
+);
+CREATE INDEX IF NOT EXISTS route_tables_entity ON route_tables (entity_key, valid_from);
+CREATE INDEX IF NOT EXISTS route_tables_vpc ON route_tables (vpc_key, valid_from);
+
+CREATE TABLE IF NOT EXISTS resources (
+    row_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    entity_key TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    vpc_key TEXT,
+    account_id TEXT,
+    region TEXT,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    valid_from INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    valid_to INTEGER REFERENCES snapshots (snapshot_id)
+);
+CREATE INDEX IF NOT EXISTS resources_entity ON resources (kind, entity_key, valid_from);
+CREATE INDEX IF NOT EXISTS resources_id ON resources (resource_id, valid_from);
+CREATE INDEX IF NOT EXISTS resources_from ON resources (kind, valid_from);
+CREATE INDEX IF NOT EXISTS resources_to ON resources (kind, valid_to);
+
+CREATE TABLE IF NOT EXISTS resource_subnets (
+    row_id INTEGER NOT NULL REFERENCES resources (row_id),
+    subnet_id TEXT NOT NULL,
+    PRIMARY KEY (row_id, subnet_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resource_subnets_subnet ON resource_subnets (subnet_id, row_id);
+"""
+
+# 스키마 1 -> 2: 서브넷/라우팅 테이블/리소스에 수집 범위(계정, 리전) 열 추가
+# (단일 리전 수집 항목은 Region이 없으므로 기록한 스냅샷의 리전으로 채움)
+MIGRATE_V2 = """
+ALTER TABLE subnets ADD COLUMN account_id TEXT;
+ALTER TABLE subnets ADD COLUMN region TEXT;
+ALTER TABLE route_tables ADD COLUMN account_id TEXT;
+ALTER TABLE route_tables ADD COLUMN region TEXT;
+ALTER TABLE resources ADD COLUMN account_id TEXT;
+ALTER TABLE resources ADD COLUMN region TEXT;
+"""
+SCOPED_TABLES = ('vpcs', 'subnets', 'route_tables', 'resources')
+
+
+class HistoryError(Exception):
+    """이력 저장소에 기록/조회할 수 없음"""
+
+
+def _entity_key(item, id_key):
+    if item.get('AccountId'):
+        return f"{item['AccountId']}/{item['Region']}/{item[id_key]}"
+    return item[id_key]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(value).__name__}")
+
+
+def _encode(item, **derived):
+    """정규화 JSON과 내용 해시 (파생 값 포함 - 서브넷 타입/배치가 바뀌어도 새 버전)"""
+    data = json.dumps(item, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+    content = json.dumps(derived, sort_keys=True) + data if derived else data
+    return data, hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _taken_at(fetched_at):
+    """스냅샷 시각 = 가장 최근 컬렉션 수집 시각"""
+    if not fetched_at:
+        return datetime.now(timezone.utc)
+    return max(fetched_at.values()).astimezone(timezone.utc)
+
+
+def _scope(data):
+    """스냅샷 수집 범위 -> (계정 목록, 리전 목록) - 기본 계정/리전 미상은 ''"""
+    scope = data.get('scope') or {}
+    return list(scope.get('accounts') or ['']), list(scope.get('regions') or [''])
+
+
+def _placements(topology):
+    """(리소스 종류, 엔티티 키) -> 배치 서브넷 ID 목록"""
+    placements = {}
+    for subnet_id, resources in topology.subnet_resources.items():
+        for kind in PLACED_KINDS:
+            for resource in resources[kind]:
+                key = (kind, _entity_key(resource, ID_KEYS[kind]))
+                placements.setdefault(key, []).append(subnet_id)
+    return placements
+
+
+class HistoryStore:
+    """스냅샷 단위 변경분을 누적하는 SQLite 이력 저장소"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise HistoryError(f"지원하지 않는 이력 스키마 버전: {version}")
+            if version == 1:
+                self._migrate_v2()
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        except sqlite3.Error as e:
+            raise HistoryError(f"이력 저장소 열기 실패 ({path}): {e}") from e
+
+    def _migrate_v2(self):
+        """기존 행의 계정/리전을 저장된 항목 또는 기록 당시 스냅샷 범위에서 채움"""
+        with self.conn:
+            self.conn.executescript(MIGRATE_V2)
+            for table in SCOPED_TABLES:
+                self.conn.execute(
+                    f"UPDATE {table} SET account_id = json_extract(data, '$.AccountId'), "
+                    f"region = COALESCE(json_extract(data, '$.Region'), (SELECT json_extract(scope, '$.regions[0]') "
+                    f"FROM snapshots WHERE snapshot_id = {table}.valid_from))")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # 기록
+
+    def latest(self):
+        """가장 최근 스냅샷 (ID, 시각) (없으면 None)"""
+        row = self.conn.execute(
+            'SELECT snapshot_id, taken_at FROM snapshots ORDER BY snapshot_id DESC LIMIT 1').fetchone()
+        return (row[0], datetime.fromisoformat(row[1])) if row else None
+
+    def record(self, data, topology, fetched_at=None):
+        """수집 데이터 한 벌을 스냅샷으로 기록하고 (스냅샷 ID, 추가된 버전 행 수) 반환
+
+        이력은 시간순으로만 쌓으므로 가장 최근 스냅샷보다 이전 시각의 데이터는 거부한다.
+        부분 수집된 컬렉션은 누락된 항목을 삭제로 보지 않도록 기존 버전을 그대로 유지한다.
+        삭제 판정은 스냅샷 범위(계정 x 리전) 안의 행으로 한정하므로, 범위가 다른 수집이 한 저장소를 써도 서로의 행을 닫지 않는다.
+        """
+        taken_at = _taken_at(fetched_at)
+        latest = self.latest()
+        if latest and taken_at <= latest[1]:
+            raise HistoryError(f"가장 최근 이력({latest[1].isoformat()})보다 이전 데이터입니다: {taken_at.isoformat()}")
+
+        placements = _placements(topology)
+        partial = data.get('partial') or {}
+        accounts, regions = _scope(data)
+        default_region = regions[0] if len(regions) == 1 else ''
+
+        try:
+            with self.conn:
+                cursor = self.conn.execute('INSERT INTO snapshots (taken_at, scope) VALUES (?, ?)',
+                                           (taken_at.isoformat(), json.dumps(data.get('scope'), sort_keys=True)))
+                snapshot_id = cursor.lastrowid
+                added = 0
+                for name, items in data.items():
+                    if name not in ID_KEYS or name in partial:
+                        continue
+                    rows = self._rows(name, items, topology, placements, default_region)
+                    added += self._apply(name, rows, snapshot_id, accounts, regions)
+        except sqlite3.Error as e:
+            raise HistoryError(f"이력 기록 실패 ({self.path}): {e}") from e
+        return snapshot_id, added
+
+    def _rows(self, name, items, topology, placements, default_region=''):
+        """컬렉션 항목 -> {엔티티 키: (열 값, 내용 해시, 배치 서브넷)}"""
+        id_key = ID_KEYS[name]
+        rows = {}
+        for item in items:
+            key = _entity_key(item, id_key)
+            target = (item.get('AccountId'), item.get('Region') or default_region or None)
+            if name == 'vpcs':
+                data, digest = _encode(item)
+                values = (key, item['VpcId']) + target + (item.get('CidrBlock'),)
+                subnets = ()
+            elif name == 'subnets':
+                subnet_type = topology.subnet_type(item['SubnetId'])
+                data, digest = _encode(item, subnet_type=subnet_type)
+                values = (key, item['SubnetId'], vpc_key(item)) + target + (
+                    item.get('CidrBlock'), item.get('AvailabilityZone'), subnet_type)
+                subnets = ()
+            elif name == 'route_tables':
+                data, digest = _encode(item)
+                values = (key, item['RouteTableId'], vpc_key(item)) + target
+                subnets = ()
+            else:
+                subnets = sorted(placements.get((name, key), ()))
+                if not subnets and item.get('SubnetId'):
+                    subnets = [item['SubnetId']]
+                data, digest = _encode(item, subnets=subnets)
+                values = (name, key, item[id_key], vpc_key(item) if item.get('VpcId') else None) + target
+            rows[key] = (values, digest, data, subnets)
+        return rows
+
+    def _apply(self, name, rows, snapshot_id, accounts=('',), regions=('',)):
+        """범위(계정 x 리전) 안의 열린 버전과 비교해 바뀐/사라진 행은 종료하고 새 버전만 추가 -> 추가 행 수"""
+        table = name if name in DEDICATED_TABLES else 'resources'
+        kind_filter = ' AND kind = ?' if table == 'resources' else ''
+        scope_filter = (f" AND IFNULL(account_id, '') IN ({', '.join('?' * len(accounts))})"
+                        f" AND IFNULL(region, '') IN ({', '.join('?' * len(regions))})")
+        params = ((name,) if table == 'resources' else ()) + tuple(accounts) + tuple(regions)
+        current = {
+            key: (row_id, digest) for row_id, key, digest in self.conn.execute(
+                f'SELECT row_id, entity_key, content_hash FROM {table} '
+                f'WHERE valid_to IS NULL{kind_filter}{scope_filter}', params)
+        }
+
+        closed = [(snapshot_id, row_id) for key, (row_id, digest) in current.items()
+                  if key not in rows or rows[key][1] != digest]
+        self.conn.executemany(f'UPDATE {table} SET valid_to = ? WHERE row_id = ?', closed)
+
+        new_rows = [(key, row) for key, row in rows.items()
+                    if key not in current or current[key][1] != row[1]]
+        columns = {
+            'vpcs': 'entity_key, vpc_id, account_id, region, cidr',
+            'subnets': 'entity_key, subnet_id, vpc_key, account_id, region, cidr, az, subnet_type',
+            'route_tables': 'entity_key, route_table_id, vpc_key, account_id, region',
+            'resources': 'kind, entity_key, resource_id, vpc_key, account_id, region',
+        }[table]
+        placeholders = ', '.join('?' * (columns.count(',') + 1 + 3))
+        sql = f'INSERT INTO {table} ({columns}, content_hash, data, valid_from) VALUES ({placeholders})'
+        for key, (values, digest, data, subnets) in new_rows:
+            row_id = self.conn.execute(sql, values + (digest, data, snapshot_id)).lastrowid
+            if subnets:
+                self.conn.executemany('INSERT INTO resource_subnets (row_id, subnet_id) VALUES (?, ?)',
+                                      [(row_id, subnet_id) for subnet_id in subnets])
+        return len(new_rows)
+
+    # 조회
+
+    def snapshots(self, since=None):
+        """기록된 스냅샷 목록 [(ID, 시각)] (since 이후만)"""
+        rows = self.conn.execute('SELECT snapshot_id, taken_at FROM snapshots WHERE taken_at >= ? ORDER BY snapshot_id',
+                                 (since.astimezone(timezone.utc).isoformat() if since else '',))
+        return [(snapshot_id, datetime.fromisoformat(taken_at)) for snapshot_id, taken_at in rows]
+
+    def snapshot_at(self, when):
+        """해당 시각에 유효했던 스냅샷 ID (그 이전 기록이 없으면 None)"""
+        row = self.conn.execute('SELECT snapshot_id FROM snapshots WHERE taken_at <= ? '
+                                'ORDER BY taken_at DESC LIMIT 1', (when.astimezone(timezone.utc).isoformat(),)).fetchone()
+        return row[0] if row else None
+
+    def load_estate(self, snapshot_id):
+        """스냅샷 시점의 에스테이트 재구성 (컬렉션별 레코드 목록 + scope)"""
+        scope = self.conn.execute('SELECT scope FROM snapshots WHERE snapshot_id = ?', (snapshot_id,)).fetchone()
+        if scope is None:
+            raise HistoryError(f"스냅샷이 없습니다: {snapshot_id}")
+
+        valid = 'valid_from <= ? AND (valid_to IS NULL OR valid_to > ?) ORDER BY row_id'
+        data = {}
+        for name in DEDICATED_TABLES:
+            rows = self.conn.execute(f'SELECT data FROM {name} WHERE {valid}', (snapshot_id, snapshot_id))
+            data[name] = from_dicts(name, [json.loads(row[0]) for row in rows])
+        for name in ID_KEYS:
+            if name not in DEDICATED_TABLES:
+                rows = self.conn.execute(f'SELECT data FROM resources WHERE kind = ? AND {valid}',
+                                         (name, snapshot_id, snapshot_id))
+                data[name] = from_dicts(name, [json.loads(row[0]) for row in rows])
+        if scope[0] and scope[0] != 'null':
+            data['scope'] = json.loads(scope[0])
+        return data
+
+    def subnet_type_changes(self, subnet_id):
+        """서브넷 타입 변경 이력 [{'taken_at', 'snapshot_id', 'subnet_type'}] (처음 관측 포함, 삭제는 None)"""
+        rows = self.conn.execute(
+            'SELECT s.valid_from, f.taken_at, s.valid_to, t.taken_at, s.subnet_type FROM subnets s '
+            'JOIN snapshots f ON f.snapshot_id = s.valid_from '
+            'LEFT JOIN snapshots t ON t.snapshot_id = s.valid_to '
+            'WHERE s.subnet_id = ? ORDER BY s.valid_from', (subnet_id,)).fetchall()
+
+        changes = []
+        previous, open_until = None, None
+        for valid_from, taken_at, valid_to, closed_at, subnet_type in rows:
+            # 버전 사이에 공백이 있으면 그 사이에는 서브넷이 없었던 것
+            if open_until is not None and open_until[0] != valid_from:
+                changes.append({'snapshot_id': open_until[0], 'taken_at': datetime.fromisoformat(open_until[1]),
+                                'subnet_type': None})
+                previous = None
+            if subnet_type != previous:
+                changes.append({'snapshot_id': valid_from, 'taken_at': datetime.fromisoformat(taken_at),
+                                'subnet_type': subnet_type})
+                previous = subnet_type
+            open_until = (valid_to, closed_at) if valid_to is not None else None
+        if open_until is not None:
+            changes.append({'snapshot_id': open_until[0], 'taken_at': datetime.fromisoformat(open_until[1]),
+                            'subnet_type': None})
+        return changes
+
+    def became(self, subnet_id, subnet_type='public'):
+        """서브넷이 마지막으로 해당 타입이 된 시각 (그런 적이 없으면 None)"""
+        times = [change['taken_at'] for change in self.subnet_type_changes(subnet_id)
+                 if change['subnet_type'] == subnet_type]
+        return times[-1] if times else None
+
+    def resource_counts(self, kind='instances', subnet_id=None, since=None):
+        """서브넷별 리소스 수 추이 {서브넷 ID: [(시각, 수)]} - 구간 시작 값 + 값이 바뀐 스냅샷만
+
+        버전 행의 시작/종료 경계(+1/-1)를 서브넷/스냅샷별로 합산한 뒤 누적하므로,
+        비용은 스냅샷 수 x 리소스 수가 아니라 기록된 버전 행 수에 비례한다.
+        """
+        subnet_filter = 'WHERE rs.subnet_id = ?' if subnet_id else ''
+        params = (kind, kind) + ((subnet_id,) if subnet_id else ())
+        deltas = self.conn.execute(
+            'SELECT rs.subnet_id, d.snapshot_id, SUM(d.delta) FROM ('
+            '  SELECT row_id, valid_from AS snapshot_id, 1 AS delta FROM resources WHERE kind = ?'
+            '  UNION ALL'
+            '  SELECT row_id, valid_to, -1 FROM resources WHERE kind = ? AND valid_to IS NOT NULL'
+            f') d JOIN resource_subnets rs ON rs.row_id = d.row_id {subnet_filter} '
+            'GROUP BY rs.subnet_id, d.snapshot_id ORDER BY rs.subnet_id, d.snapshot_id', params)
+
+        snapshots = self.snapshots()
+        if not snapshots:
+            return {}
+        times = dict(snapshots)
+        start = next((snapshot_id for snapshot_id, taken_at in snapshots
+                      if since is None or taken_at >= since), None)
+        if start is None:
+            return {}
+
+        series = {}
+        totals = {}
+        for subnet, snapshot_id, delta in deltas:
+            count = totals.get(subnet, 0) + delta
+            totals[subnet] = count
+            points = series.setdefault(subnet, [])
+            if snapshot_id <= start:
+                # 구간 시작 이전 변경은 시작 값에 반영
+                points[:] = [(times[start], count)]
+            elif not points or points[-1][1] != count:
+                if not points:
+                    points.append((times[start], 0))
+                points.append((times[snapshot_id], count))
+        return {subnet: points for subnet, points in series.items()
+                if any(count for _, count in points)}
+
+    def stats(self):
+        """테이블별 행 수 (버전 행 포함)"""
+        tables = ('snapshots',) + DEDICATED_TABLES + ('resources', 'resource_subnets')
+        return {table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in tables}
+
+
+def days_ago(days):
+    """현재 기준 N일 전 시각 (UTC)"""
+    return datetime.now(timezone.utc) - timedelta(days=days)
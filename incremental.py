@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""마지막 스냅샷 기준 증분 갱신과 스냅샷 간 변경 사항(diff) 계산"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from model import Record
+
+# diff 대상 리소스 타입 -> 식별자 키
+RESOURCE_ID_KEYS = {
+    'vpcs': 'VpcId',
+    'subnets': 'SubnetId',
+    'instances': 'InstanceId',
+    'rds_instances': 'DBInstanceIdentifier',
+    'load_balancers': 'LoadBalancerArn',
+    'target_groups': 'TargetGroupArn',
+    'nats': 'NatGatewayId',
+    'network_interfaces': 'NetworkInterfaceId',
+    'security_groups': 'GroupId',
+    'network_acls': 'NetworkAclId',
+}
+
+# 변경 마커: CloudTrail 이벤트 소스 -> {이벤트 이름: 리소스 타입}
+CHANGE_EVENTS = {
+    'ec2.amazonaws.com': {
+        'CreateVpc': 'vpcs', 'DeleteVpc': 'vpcs', 'ModifyVpcAttribute': 'vpcs',
+        'AssociateVpcCidrBlock': 'vpcs', 'DisassociateVpcCidrBlock': 'vpcs',
+        'CreateSubnet': 'subnets', 'DeleteSubnet': 'subnets', 'ModifySubnetAttribute': 'subnets',
+        'AssociateSubnetCidrBlock': 'subnets', 'DisassociateSubnetCidrBlock': 'subnets',
+        'CreateRouteTable': 'route_tables', 'DeleteRouteTable': 'route_tables',
+        'CreateRoute': 'route_tables', 'DeleteRoute': 'route_tables', 'ReplaceRoute': 'route_tables',
+        'AssociateRouteTable': 'route_tables', 'DisassociateRouteTable': 'route_tables',
+        'ReplaceRouteTableAssociation': 'route_tables',
+        'CreateInternetGateway': 'igws', 'DeleteInternetGateway': 'igws',
+        'AttachInternetGateway': 'igws', 'DetachInternetGateway': 'igws',
+        'CreateNatGateway': 'nats', 'DeleteNatGateway': 'nats',
+        'RunInstances': 'instances', 'TerminateInstances': 'instances',
+        'StartInstances': 'instances', 'StopInstances': 'instances',
+        'ModifyInstanceAttribute': 'instances', 'ModifyInstancePlacement': 'instances',
+        'CreateNetworkInterface': 'network_interfaces', 'DeleteNetworkInterface': 'network_interfaces',
+        'AttachNetworkInterface': 'network_interfaces', 'DetachNetworkInterface': 'network_interfaces',
+        'ModifyNetworkInterfaceAttribute': 'network_interfaces',
+        'CreateVpcEndpoint': 'network_interfaces', 'DeleteVpcEndpoints': 'network_interfaces',
+        'CreateSecurityGroup': 'security_groups', 'DeleteSecurityGroup': 'security_groups',
+        'AuthorizeSecurityGroupIngress': 'security_groups', 'AuthorizeSecurityGroupEgress': 'security_groups',
+        'RevokeSecurityGroupIngress': 'security_groups', 'RevokeSecurityGroupEgress': 'security_groups',
+        'ModifySecurityGroupRules': 'security_groups',
+        'CreateNetworkAcl': 'network_acls', 'DeleteNetworkAcl': 'network_acls',
+        'CreateNetworkAclEntry': 'network_acls', 'DeleteNetworkAclEntry': 'network_acls',
+        'ReplaceNetworkAclEntry': 'network_acls', 'ReplaceNetworkAclAssociation': 'network_acls',
+    },
+    'rds.amazonaws.com': {
+        'CreateDBInstance': 'rds_instances', 'DeleteDBInstance': 'rds_instances',
+        'ModifyDBInstance': 'rds_instances', 'StartDBInstance': 'rds_instances',
+        'StopDBInstance': 'rds_instances', 'CreateDBInstanceReadReplica': 'rds_instances',
+        'RestoreDBInstanceFromDBSnapshot': 'rds_instances',
+        'RestoreDBInstanceToPointInTime': 'rds_instances',
+        'PromoteReadReplica': 'rds_instances',
+    },
+    'elasticloadbalancing.amazonaws.com': {
+        'CreateLoadBalancer': 'load_balancers', 'DeleteLoadBalancer': 'load_balancers',
+        'SetSubnets': 'load_balancers', 'SetSecurityGroups': 'load_balancers',
+        'ModifyLoadBalancerAttributes': 'load_balancers',
+        'CreateTargetGroup': 'target_groups', 'DeleteTargetGroup': 'target_groups',
+        'ModifyTargetGroup': 'target_groups',
+        # 리스너/규칙 변경은 대상 그룹의 LoadBalancerArns를 바꿈
+        'CreateListener': 'target_groups', 'DeleteListener': 'target_groups', 'ModifyListener': 'target_groups',
+        'CreateRule': 'target_groups', 'DeleteRule': 'target_groups', 'ModifyRule': 'target_groups',
+    },
+}
+
+# 태그 변경은 리소스 ID 접두사로 타입 판별
+TAG_EVENTS = {'CreateTags', 'DeleteTags'}
+ID_PREFIXES = (
+    ('vpc-', 'vpcs'), ('subnet-', 'subnets'), ('rtb-', 'route_tables'),
+    ('igw-', 'igws'), ('nat-', 'nats'), ('i-', 'instances'), ('eni-', 'network_interfaces'),
+    ('sg-', 'security_groups'), ('acl-', 'network_acls'),
+)
+
+# 이벤트 없이 상태가 바뀌는 전이 상태 (해당 타입은 항상 재수집)
+TRANSITIONAL_STATES = {
+    'pending', 'stopping', 'shutting-down', 'creating', 'deleting', 'modifying',
+    'starting', 'backing-up', 'rebooting', 'provisioning', 'associating',
+}
+
+# CloudTrail 이벤트 전달 지연 여유
+CLOUDTRAIL_DELAY = timedelta(minutes=15)
+
+# 이보다 오래전에 수집한 타입은 CloudTrail을 길게 훑는 대신 전체 재수집
+MAX_LOOKBACK = timedelta(days=1)
+
+# 서버 측 instance-id 필터로 부분 재수집할 최대 인스턴스 수
+MAX_TARGETED_IDS = 1000
+
+# DescribeInstances 필터 하나의 Values 최대 개수 (초과분은 나눠서 조회)
+MAX_FILTER_VALUES = 200
+
+
+def find_changes(engine, since):
+    """타입별 수집 시각({리소스 타입: datetime}) 이후의 CloudTrail 변경 이벤트 -> {리소스 타입: 변경된 ID 집합}
+
+    LookupEvents는 조회 속성을 하나만 받고 초당 2회 정도로 제한되므로, 쓰기 이벤트(ReadOnly=false)만
+    가장 오래된 수집 시각부터 한 번에 조회해 이벤트 소스/이름으로 분류한다 (Describe* 등 읽기 호출은 서버에서 제외).
+    각 타입의 수집 시각 이전 이벤트는 무시한다.
+    """
+    if not since:
+        return {}
+    cloudtrail = engine.client('cloudtrail')
+    paginator = cloudtrail.get_paginator('lookup_events')
+    changes = {}
+
+    pages = paginator.paginate(
+        LookupAttributes=[{'AttributeKey': 'ReadOnly', 'AttributeValue': 'false'}],
+        StartTime=min(since.values()) - CLOUDTRAIL_DELAY,
+        EndTime=datetime.now(timezone.utc),
+    )
+    for page in pages:
+        for event in page.get('Events', []):
+            source = event.get('EventSource')
+            if source not in CHANGE_EVENTS:
+                continue
+            resource_ids = [r.get('ResourceName') for r in event.get('Resources', []) if r.get('ResourceName')]
+            for collector, ids in classify_event(source, event['EventName'], resource_ids).items():
+                if collector not in since:
+                    continue
+                event_time = event.get('EventTime')
+                if event_time is None or event_time >= since[collector] - CLOUDTRAIL_DELAY:
+                    changes.setdefault(collector, set()).update(ids)
+
+    return changes
+
+
+def classify_event(source, name, resource_ids=()):
+    """CloudTrail 이벤트 (소스, 이름, 리소스 ID) -> {리소스 타입: 변경된 ID 집합}"""
+    changes = {}
+    if name in TAG_EVENTS:
+        for resource_id in resource_ids:
+            for prefix, collector in ID_PREFIXES:
+                if resource_id.startswith(prefix):
+                    changes.setdefault(collector, set()).add(resource_id)
+                    break
+    elif name in CHANGE_EVENTS.get(source, {}):
+        collector = CHANGE_EVENTS[source][name]
+        ids = set(resource_ids)
+        if collector == 'instances':
+            # RunInstances 등의 Resources에는 서브넷/SG/AMI ID도 포함되므로 인스턴스 ID만 남김
+            ids = {resource_id for resource_id in ids if resource_id.startswith('i-')}
+        changes[collector] = ids
+    return changes
+
+
+def has_transitional_items(items):
+    """전이 상태 리소스 포함 여부"""
+    for item in items:
+        state = item.get('State')
+        if isinstance(state, dict):
+            state = state.get('Name') or state.get('Code')
+        if (state or item.get('DBInstanceStatus')) in TRANSITIONAL_STATES:
+            return True
+    return False
+
+
+def refresh(engine, data, fetched_at, names=None, now=None):
+    """변경 마커가 움직인 타입만 재수집하여 모델 갱신 -> (새 데이터, 재수집 타입)
+
+    names는 유지할 전체 리소스 타입으로, 기준 스냅샷(fetched_at)에 없는 타입은 전체 수집한다.
+    """
+    now = now or datetime.now(timezone.utc)
+    since = {name: at for name, at in fetched_at.items() if now - at <= MAX_LOOKBACK}
+    try:
+        changes = find_changes(engine, since)
+    except Exception as e:
+        print(f"    CloudTrail 변경 조회 오류 (전체 재수집): {e}")
+        changes = {name: set() for name in fetched_at}
+
+    # 조회 한도보다 오래된 타입과 기준 스냅샷에 없는 타입(이후 추가된 수집기 등)은 전체 수집
+    for name in list(fetched_at) + list(names or ()):
+        if name not in since:
+            changes[name] = set()
+
+    for name in fetched_at:
+        if name not in changes and has_transitional_items(data.get(name, [])):
+            changes[name] = set()
+
+    # 이전 수집에서 부분 수집된 타입은 전체 재수집
+    for name in data.get('partial', {}):
+        changes[name] = set()
+
+    new_data = dict(data)
+    refreshed = []
+    full = [name for name, ids in changes.items()
+            if name != 'instances' or not ids or len(ids) > MAX_TARGETED_IDS]
+
+    partial = {name: reason for name, reason in data.get('partial', {}).items() if name not in full}
+    if full:
+        new_data.update(engine.collect(full))
+        partial.update(engine.partial())
+        refreshed.extend(full)
+
+    # 인스턴스는 변경된 ID만 서버 측 필터로 재조회하여 패치
+    instance_ids = changes.get('instances')
+    if 'instances' not in full and instance_ids:
+        ids = sorted(instance_ids)
+        try:
+            updated = [
+                item
+                for start in range(0, len(ids), MAX_FILTER_VALUES)
+                for items in engine.iter_pages(
+                    'instances', [{'Name': 'instance-id', 'Values': ids[start:start + MAX_FILTER_VALUES]}])
+                for item in items
+            ]
+        except Exception as e:
+            # 전체 수집과 같이 부분 수집으로 표시하고 기존 목록 유지 (다음 갱신에서 전체 재수집)
+            print(f"    인스턴스 부분 재수집 오류 (기존 목록 유지): {e}")
+            partial['instances'] = str(e) or type(e).__name__
+        else:
+            kept = [i for i in data.get('instances', []) if i['InstanceId'] not in instance_ids]
+            new_data['instances'] = kept + updated
+            refreshed.append('instances')
+
+    new_data.pop('partial', None)
+    if partial:
+        new_data['partial'] = partial
+    return new_data, refreshed
+
+
+def _normalize(value):
+    if isinstance(value, Record):
+        return _normalize(value.to_dict())
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+
+def _resource_key(item, id_key):
+    if item.get('AccountId'):
+        return f"{item['AccountId']}/{item['Region']}/{item[id_key]}"
+    return item[id_key]
+
+
+def diff_estates(old, new):
+    """두 에스테이트 간 추가/삭제/변경된 리소스"""
+    diff = {}
+    for name, id_key in RESOURCE_ID_KEYS.items():
+        old_items = {_resource_key(i, id_key): i for i in old.get(name, [])}
+        new_items = {_resource_key(i, id_key): i for i in new.get(name, [])}
+
+        changed = []
+        for key in old_items.keys() & new_items.keys():
+            before, after = _normalize(old_items[key]), _normalize(new_items[key])
+            fields = {
+                field: [before.get(field), after.get(field)]
+                for field in sorted(before.keys() | after.keys())
+                if before.get(field) != after.get(field)
+            }
+            if fields:
+                changed.append({'id': key, 'fields': fields})
+
+        diff[name] = {
+            'added': sorted(new_items.keys() - old_items.keys()),
+            'removed': sorted(old_items.keys() - new_items.keys()),
+            'changed': sorted(changed, key=lambda c: c['id']),
+        }
+    return diff
+
+
+def diff_summary(diff):
+    """타입별 (추가, 삭제, 변경) 건수"""
+    return {
+        name: (len(d['added']), len(d['removed']), len(d['changed']))
+        for name, d in diff.items()
+    }
+
+
+def save_diff(diff, path, base=None):
+    """diff를 JSON 파일로 저장 (변경 알림 연동용)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'base_snapshot': base,
+            'changes': diff,
+        }, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""대규모 다이어그램용 상세 수준(LOD) 집계: 서브넷 리소스를 그룹 노드로 축약"""
+from collections import Counter
+
+from collector import get_tag_value
+from placement import SERVICE_TYPES
+
+GROUP_BY_CHOICES = ('asg', 'type', 'tag')
+
+# 상세 수준: 개별 리소스 -> 그룹 -> 서브넷 요약 -> AZ 요약 -> VPC 요약
+LEVELS = ('resource', 'group', 'subnet', 'az', 'vpc')
+
+
+def kind_counts(topology, subnets):
+    """서브넷 목록의 리소스 종류별 수 (EC2는 실행 중 수 포함)"""
+    counts = Counter()
+    for subnet in subnets:
+        resources = topology.resources(subnet['SubnetId'])
+        counts['ec2'] += len(resources['instances'])
+        counts['running'] += sum(1 for i in resources['instances'] if i['State'] == 'running')
+        counts['rds'] += len(resources['rds_instances'])
+        counts['elb'] += len(resources['load_balancers'])
+        counts.update(service['ServiceType'] for service in resources['services'])
+    return counts
+
+
+def summary_label(title, counts):
+    """요약 노드 라벨"""
+    lines = [title] if title else []
+    if counts['ec2']:
+        lines.append(f"{counts['ec2']} × EC2 ({counts['running']} running)")
+    if counts['rds']:
+        lines.append(f"{counts['rds']} × RDS")
+    if counts['elb']:
+        lines.append(f"{counts['elb']} × ELB")
+    for service_type, label in SERVICE_TYPES.items():
+        if counts[service_type]:
+            lines.append(f"{counts[service_type]} × {label}")
+    return '\n'.join(lines)
+
+
+class LevelOfDetail:
+    """임계값 기반으로 서브넷 리소스를 그룹 노드로 축약하여 전체 노드 수를 제한"""
+
+    def __init__(self, threshold=12, group_by='asg', tag_key='Name', max_groups=8, max_nodes=400):
+        if group_by not in GROUP_BY_CHOICES:
+            raise ValueError(f"지원하지 않는 그룹 기준: {group_by} ({', '.join(GROUP_BY_CHOICES)})")
+        self.threshold = threshold
+        self.group_by = group_by
+        self.tag_key = tag_key
+        self.max_groups = max_groups
+        self.max_nodes = max_nodes
+
+    def choose_level(self, topology):
+        """노드 예산(max_nodes)을 넘지 않는 가장 상세한 수준 (그룹 수는 groups()로 계산, 게이트웨이 노드 포함)"""
+        subnets = [sid for sid, count in topology.subnet_counts.items() if count]
+        azs = [key for key, count in topology.az_counts.items() if count]
+        gateways = self.gateway_nodes(topology, azs)
+
+        grouped = sum(
+            len(self.groups(topology.resources(sid))) if self.collapse(topology, sid) else topology.subnet_count(sid)
+            for sid in subnets
+        )
+        if grouped + gateways <= self.max_nodes:
+            return 'group'
+        if len(subnets) + gateways <= self.max_nodes:
+            return 'subnet'
+        if len(azs) + gateways <= self.max_nodes:
+            return 'az'
+        return 'vpc'
+
+    def gateway_nodes(self, topology, azs):
+        """상세 수준과 무관하게 그려지는 노드 수 (Internet, IGW, 리소스가 있는 AZ의 NAT)"""
+        igws = sum(len(topology.vpc_igws.get(vpc_id, [])) for vpc_id in topology.vpcs)
+        nats = sum(
+            1
+            for vpc_id, az in azs
+            for subnet in topology.vpc_azs.get(vpc_id, {}).get(az, [])
+            for nat in topology.subnet_nats.get(subnet['SubnetId'], [])
+            if nat.get('State') == 'available'
+        )
+        return 1 + igws + nats
+
+    def collapse(self, topology, subnet_id):
+        """서브넷 리소스를 그룹으로 축약할지 여부"""
+        return topology.subnet_count(subnet_id) > self.threshold
+
+    def instance_key(self, instance):
+        """EC2 그룹 키 (ASG / 인스턴스 타입 / 태그 값)"""
+        if self.group_by == 'asg' and instance.get('AutoScalingGroup'):
+            return f"ASG {instance['AutoScalingGroup']}"
+        if self.group_by == 'tag':
+            value = get_tag_value(instance.get('Tags', []), self.tag_key)
+            if value:
+                return f"{self.tag_key}={value}"
+        return instance['InstanceType']
+
+    def groups(self, resources):
+        """리소스를 (종류, 그룹 키, 라벨, 구성원) 목록으로 집계
+
+        'other' 그룹을 포함해 max_groups개 이하 (종류가 max_groups보다 많으면 종류별 'other' 하나씩)
+        """
+        buckets = {}
+        for instance in resources['instances']:
+            buckets.setdefault(('ec2', self.instance_key(instance)), []).append(instance)
+        for rds in resources['rds_instances']:
+            buckets.setdefault(('rds', rds['Engine']), []).append(rds)
+        for elb in resources['load_balancers']:
+            buckets.setdefault(('elb', elb['Type']), []).append(elb)
+        for service in resources['services']:
+            buckets.setdefault((service['ServiceType'], service['ServiceType']), []).append(service)
+
+        # 큰 그룹부터, 한도를 넘는 그룹은 종류별 'other'로 병합 ('other' 그룹도 한도에 포함)
+        ordered = sorted(buckets.items(), key=lambda item: (-len(item[1]), item[0]))
+        limit = min(self.max_groups, len(ordered))
+        while limit > 0 and limit + len({kind for (kind, _), _ in ordered[limit:]}) > self.max_groups:
+            limit -= 1
+        kept, overflow = ordered[:limit], ordered[limit:]
+        merged = {}
+        for (kind, _), members in overflow:
+            merged.setdefault((kind, 'other'), []).extend(members)
+
+        return [
+            (kind, key, self.group_label(kind, key, members), members)
+            for (kind, key), members in kept + sorted(merged.items())
+        ]
+
+    def group_label(self, kind, key, members):
+        """그룹 노드 라벨 (예: ASG web: 48 × m5.large (46 running))"""
+        if kind == 'ec2':
+            types = Counter(i['InstanceType'] for i in members)
+            instance_type = types.most_common(1)[0][0] if len(types) == 1 else 'mixed'
+            running = sum(1 for i in members if i['State'] == 'running')
+            if key == instance_type:
+                return f"{len(members)} × {instance_type}\n({running} running)"
+            return f"{key}:\n{len(members)} × {instance_type}\n({running} running)"
+        if kind == 'rds':
+            return f"RDS {key}:\n{len(members)} × DB"
+        if kind == 'elb':
+            return f"ELB {key}:\n{len(members)} × LB"
+        return f"{len(members)} × {SERVICE_TYPES[kind]}"
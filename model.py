@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""__slots__ 데이터클래스 기반의 압축 리소스 모델 (boto3 원본 응답은 변환 후 버림)
+
+필드 이름은 기존 dict 키와 같고 record['Key'] / record.get('Key') 접근을 지원하므로
+다이어그램/보고서 코드는 dict와 레코드를 구분하지 않는다. ID, AZ, 타입, 상태처럼
+반복되는 문자열은 sys.intern으로 공유한다.
+"""
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+
+
+def intern(value):
+    """반복 문자열 공유 (None은 그대로)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=None)
+def field_names(cls):
+    return tuple(field.name for field in fields(cls))
+
+
+@lru_cache(maxsize=None)
+def _values_getter(cls):
+    getter = attrgetter(*field_names(cls))
+    return getter if len(field_names(cls)) > 1 else lambda record: (getter(record),)
+
+
+@dataclass(slots=True)
+class Record:
+    """dict 호환 접근을 제공하는 레코드 기반 클래스 (None 필드는 없는 키로 취급)"""
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __reduce__(self):
+        # 프로세스 간 전달 시 필드명 없이 값 튜플만 직렬화 (intern된 문자열은 pickle memo로 한 번만 기록)
+        return type(self), _values_getter(type(self))(self)
+
+    def keys(self):
+        return [name for name in field_names(type(self)) if getattr(self, name) is not None]
+
+    def to_dict(self):
+        """직렬화/비교용 dict (None 필드 제외, 중첩 레코드 포함)"""
+        return {name: _plain(getattr(self, name)) for name in self.keys()}
+
+    @classmethod
+    def from_dict(cls, item):
+        """스냅샷 등에서 읽은 dict로 레코드 생성 (모르는 키는 버림)"""
+        values = {}
+        for name in field_names(cls):
+            if name in item:
+                nested = NESTED.get((cls, name))
+                value = item[name]
+                if nested is not None and value is not None:
+                    value = tuple(nested.from_dict(v) for v in value)
+                elif isinstance(value, list):
+                    value = tuple(intern(v) for v in value)
+                else:
+                    value = intern(value)
+                values[name] = value
+        return cls(**values)
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+@dataclass(slots=True)
+class Tag(Record):
+    Key: str
+    Value: str
+
+
+def convert_tags(tags):
+    """태그 목록 -> Tag 튜플"""
+    return tuple(Tag(intern(tag['Key']), tag['Value']) for tag in tags or [])
+
+
+@dataclass(slots=True)
+class Vpc(Record):
+    VpcId: str
+    CidrBlock: str = None
+    State: str = None
+    IsDefault: bool = False
+    OwnerId: str = None
+    CidrBlocks: tuple = ()
+    Ipv6CidrBlocks: tuple = ()
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class Subnet(Record):
+    SubnetId: str
+    VpcId: str = None
+    AvailabilityZone: str = None
+    CidrBlock: str = None
+    Ipv6CidrBlocks: tuple = ()
+    AvailableIpAddressCount: int = None
+    MapPublicIpOnLaunch: bool = None
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class Route(Record):
+    DestinationCidrBlock: str = None
+    DestinationIpv6CidrBlock: str = None
+    DestinationPrefixListId: str = None
+    GatewayId: str = None
+    NatGatewayId: str = None
+    TransitGatewayId: str = None
+    VpcPeeringConnectionId: str = None
+    EgressOnlyInternetGatewayId: str = None
+    CarrierGatewayId: str = None
+    LocalGatewayId: str = None
+    CoreNetworkArn: str = None
+    InstanceId: str = None
+    NetworkInterfaceId: str = None
+    State: str = None
+
+
+@dataclass(slots=True)
+class RouteTableAssociation(Record):
+    RouteTableId: str = None
+    SubnetId: str = None
+    GatewayId: str = None
+    Main: bool = None
+
+
+@dataclass(slots=True)
+class RouteTable(Record):
+    RouteTableId: str
+    VpcId: str = None
+    Routes: tuple = ()
+    Associations: tuple = ()
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class Attachment(Record):
+    VpcId: str = None
+    State: str = None
+
+
+@dataclass(slots=True)
+class InternetGateway(Record):
+    InternetGatewayId: str
+    Attachments: tuple = ()
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class NatGateway(Record):
+    NatGatewayId: str
+    SubnetId: str = None
+    VpcId: str = None
+    State: str = None
+    ConnectivityType: str = None
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class Instance(Record):
+    InstanceId: str
+    InstanceType: str = None
+    State: str = None
+    SubnetId: str = None
+    VpcId: str = None
+    PrivateIpAddress: str = None
+    PublicIpAddress: str = None
+    AvailabilityZone: str = None
+    SecurityGroups: tuple = ()
+    Name: str = None
+    LaunchTime: datetime = None
+    Platform: str = None
+    KeyName: str = None
+    AutoScalingGroup: str = None
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class DBInstance(Record):
+    DBInstanceIdentifier: str
+    DBInstanceClass: str = None
+    Engine: str = None
+    EngineVersion: str = None
+    DBInstanceStatus: str = None
+    AvailabilityZone: str = None
+    SecondaryAvailabilityZone: str = None
+    MultiAZ: bool = False
+    VpcId: str = None
+    SubnetIds: tuple = ()
+    Endpoint: str = None
+    Port: int = None
+    AllocatedStorage: int = None
+    DBName: str = None
+    SecurityGroups: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class LoadBalancer(Record):
+    LoadBalancerName: str
+    LoadBalancerArn: str = None
+    Type: str = None
+    Scheme: str = None
+    State: str = None
+    VpcId: str = None
+    SubnetIds: tuple = ()
+    DNSName: str = None
+    CreatedTime: datetime = None
+    SecurityGroups: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class TargetGroup(Record):
+    TargetGroupArn: str
+    TargetGroupName: str = None
+    Protocol: str = None
+    Port: int = None
+    TargetType: str = None
+    VpcId: str = None
+    LoadBalancerArns: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class NetworkInterface(Record):
+    NetworkInterfaceId: str
+    InterfaceType: str = None
+    Status: str = None
+    SubnetId: str = None
+    VpcId: str = None
+    AvailabilityZone: str = None
+    PrivateIpAddress: str = None
+    PublicIp: str = None
+    SecurityGroups: tuple = ()
+    Description: str = None
+    ResourceType: str = None
+    ResourceId: str = None
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class SecurityGroupRule(Record):
+    IpProtocol: str = None
+    FromPort: int = None
+    ToPort: int = None
+    CidrBlocks: tuple = ()
+    Ipv6CidrBlocks: tuple = ()
+    PrefixListIds: tuple = ()
+    GroupIds: tuple = ()
+
+
+@dataclass(slots=True)
+class SecurityGroup(Record):
+    GroupId: str
+    GroupName: str = None
+    VpcId: str = None
+    IngressRules: tuple = ()
+    EgressRules: tuple = ()
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+@dataclass(slots=True)
+class NetworkAclEntry(Record):
+    RuleNumber: int = None
+    Protocol: str = None
+    RuleAction: str = None
+    Egress: bool = False
+    CidrBlock: str = None
+    Ipv6CidrBlock: str = None
+    FromPort: int = None
+    ToPort: int = None
+
+
+@dataclass(slots=True)
+class NetworkAcl(Record):
+    NetworkAclId: str
+    VpcId: str = None
+    IsDefault: bool = False
+    Entries: tuple = ()
+    SubnetIds: tuple = ()
+    Tags: tuple = ()
+    Region: str = None
+    AccountId: str = None
+
+
+# 중첩 레코드 필드 -> 원소 타입
+NESTED = {
+    (Vpc, 'Tags'): Tag, (Subnet, 'Tags'): Tag, (RouteTable, 'Tags'): Tag,
+    (InternetGateway, 'Tags'): Tag, (NatGateway, 'Tags'): Tag, (Instance, 'Tags'): Tag,
+    (RouteTable, 'Routes'): Route, (RouteTable, 'Associations'): RouteTableAssociation,
+    (InternetGateway, 'Attachments'): Attachment,
+    (SecurityGroup, 'IngressRules'): SecurityGroupRule, (SecurityGroup, 'EgressRules'): SecurityGroupRule,
+    (SecurityGroup, 'Tags'): Tag, (NetworkAcl, 'Entries'): NetworkAclEntry, (NetworkAcl, 'Tags'): Tag,
+}
+
+# 수집기 이름 -> 레코드 타입
+RECORD_TYPES = {
+    'vpcs': Vpc,
+    'subnets': Subnet,
+    'route_tables': RouteTable,
+    'igws': InternetGateway,
+    'nats': NatGateway,
+    'instances': Instance,
+    'rds_instances': DBInstance,
+    'load_balancers': LoadBalancer,
+    'target_groups': TargetGroup,
+    'network_interfaces': NetworkInterface,
+    'security_groups': SecurityGroup,
+    'network_acls': NetworkAcl,
+}
+
+
+def vpc_key(item):
+    """계정/리전을 포함한 VPC 식별자 (단일 계정 스캔이면 VPC ID)"""
+    if item.get('AccountId'):
+        return f"{item['AccountId']}/{item['Region']}/{item['VpcId']}"
+    return item['VpcId']
+
+
+def from_dicts(name, items):
+    """dict 목록을 수집기 레코드 목록으로 변환 (모델이 없는 타입은 그대로)"""
+    cls = RECORD_TYPES.get(name)
+    if cls is None:
+        return items
+    return [item if isinstance(item, Record) else cls.from_dict(item) for item in items]
+
+
+def pack(items):
+    """레코드 목록 -> (레코드 타입, 값 튜플 행 목록) - 프로세스 간 전달용 압축 형태"""
+    if not items or not isinstance(items[0], Record):
+        return None, items
+
+    cls = type(items[0])
+    getter = _values_getter(cls)
+    nested = [(index, _values_getter(NESTED[cls, name]))
+              for index, name in enumerate(field_names(cls)) if (cls, name) in NESTED]
+
+    rows = []
+    for item in items:
+        row = getter(item)
+        if nested:
+            row = list(row)
+            for index, nested_getter in nested:
+                row[index] = tuple(map(nested_getter, row[index]))
+            row = tuple(row)
+        rows.append(row)
+    return cls, rows
+
+
+def unpack(cls, rows):
+    """pack() 결과를 레코드 목록으로 복원"""
+    if cls is None:
+        return rows
+
+    nested = [(index, NESTED[cls, name])
+              for index, name in enumerate(field_names(cls)) if (cls, name) in NESTED]
+    if not nested:
+        return [cls(*row) for row in rows]
+
+    items = []
+    for row in rows:
+        row = list(row)
+        for index, nested_cls in nested:
+            row[index] = tuple(nested_cls(*values) for values in row[index])
+        items.append(cls(*row))
+    return items
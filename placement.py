@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""describe_network_interfaces 결과로 VPC 연결 리소스를 실제 ENI 서브넷/IP 기준으로 배치"""
+import re
+
+from model import NetworkInterface, intern
+
+# ENI 소유 서비스 (서브넷에 별도 노드로 배치하는 종류)
+SERVICE_TYPES = {
+    'lambda': 'Lambda',
+    'ecs': 'ECS Task',
+    'eks': 'EKS',
+    'vpc_endpoint': 'VPC Endpoint',
+}
+
+_LAMBDA_PATTERN = re.compile(r'^AWS Lambda VPC ENI-(.+?)(-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})?$')
+_ECS_PATTERN = re.compile(r'^arn:aws[\w-]*:ecs:[^:]*:[^:]*:attachment/(.+)$')
+_ENDPOINT_PATTERN = re.compile(r'(vpce-[0-9a-f]+)')
+_NAT_PATTERN = re.compile(r'(nat-[0-9a-f]+)')
+
+
+def classify_interface(eni):
+    """ENI 소유 리소스 판별 -> (리소스 종류, 리소스 ID) / 알 수 없으면 (None, None)"""
+    interface_type = eni.get('InterfaceType', 'interface')
+    description = eni.get('Description') or ''
+
+    if interface_type == 'nat_gateway':
+        match = _NAT_PATTERN.search(description)
+        return 'nat', match.group(1) if match else eni['NetworkInterfaceId']
+    if interface_type in ('vpc_endpoint', 'gateway_load_balancer_endpoint'):
+        match = _ENDPOINT_PATTERN.search(description)
+        return 'vpc_endpoint', match.group(1) if match else eni['NetworkInterfaceId']
+    if interface_type == 'lambda' or description.startswith('AWS Lambda VPC ENI'):
+        match = _LAMBDA_PATTERN.match(description)
+        return 'lambda', match.group(1) if match else eni['NetworkInterfaceId']
+    if description.startswith('ELB '):
+        # 'ELB app/name/id', 'ELB net/name/id' (Classic은 'ELB name')
+        return 'elb', description[4:]
+    if eni.get('RequesterId') == 'amazon-rds' or description == 'RDSNetworkInterface':
+        return 'rds', None
+    if description.startswith('Amazon EKS '):
+        return 'eks', description[len('Amazon EKS '):]
+
+    match = _ECS_PATTERN.match(description)
+    if match:
+        return 'ecs', match.group(1)
+    if eni.get('Attachment', {}).get('InstanceId'):
+        return 'instance', eni['Attachment']['InstanceId']
+    return None, None
+
+
+def convert_network_interface(eni):
+    """ENI를 배치용 레코드로 변환"""
+    resource_type, resource_id = classify_interface(eni)
+    return [NetworkInterface(
+        NetworkInterfaceId=intern(eni['NetworkInterfaceId']),
+        InterfaceType=intern(eni.get('InterfaceType', 'interface')),
+        Status=intern(eni.get('Status')),
+        SubnetId=intern(eni.get('SubnetId')),
+        VpcId=intern(eni.get('VpcId')),
+        AvailabilityZone=intern(eni.get('AvailabilityZone')),
+        PrivateIpAddress=eni.get('PrivateIpAddress'),
+        PublicIp=eni.get('Association', {}).get('PublicIp'),
+        SecurityGroups=tuple(intern(group['GroupId']) for group in eni.get('Groups', [])),
+        Description=eni.get('Description'),
+        ResourceType=resource_type,
+        ResourceId=intern(resource_id),
+    )]
+
+
+def load_balancer_key(lb):
+    """ELB ENI 설명과 같은 형식의 로드밸런서 키 ('app/name/id', Classic은 이름)"""
+    arn = lb.get('LoadBalancerArn') or ''
+    return arn.split(':loadbalancer/', 1)[1] if ':loadbalancer/' in arn else lb['LoadBalancerName']
+
+
+def _scope(item):
+    """계정/리전/VPC 범위 키 (팬아웃 에스테이트에서 같은 이름의 리소스를 구분)"""
+    return item.get('AccountId'), item.get('Region'), item.get('VpcId')
+
+
+class InterfacePlacement:
+    """ENI 목록에서 서비스 리소스와 RDS/ELB의 실제 배치 서브넷을 계산"""
+
+    def __init__(self, interfaces):
+        self.services = {}
+        self.elb_subnets = {}
+        self.rds_subnets = {}
+
+        for eni in interfaces:
+            subnet_id = eni.get('SubnetId')
+            resource_type = eni.get('ResourceType')
+            if not subnet_id or not resource_type:
+                continue
+
+            if resource_type in SERVICE_TYPES:
+                key = (*_scope(eni), resource_type, eni['ResourceId'])
+                service = self.services.get(key)
+                if service is None:
+                    service = self.services[key] = {
+                        'ServiceType': resource_type,
+                        'ServiceId': eni['ResourceId'],
+                        'VpcId': eni.get('VpcId'),
+                        'SubnetIds': [],
+                        'PrivateIps': [],
+                        'NetworkInterfaceIds': [],
+                    }
+                    for scope in ('AccountId', 'Region'):
+                        if eni.get(scope):
+                            service[scope] = eni[scope]
+                if subnet_id not in service['SubnetIds']:
+                    service['SubnetIds'].append(subnet_id)
+                service['PrivateIps'].append(eni.get('PrivateIpAddress'))
+                service['NetworkInterfaceIds'].append(eni['NetworkInterfaceId'])
+            elif resource_type == 'elb':
+                subnets = self.elb_subnets.setdefault((*_scope(eni), eni['ResourceId']), [])
+                if subnet_id not in subnets:
+                    subnets.append(subnet_id)
+            elif resource_type == 'rds':
+                self.rds_subnets.setdefault(_scope(eni), set()).add(subnet_id)
+
+    def load_balancer_subnets(self, lb):
+        """ELB 노드 ENI가 있는 서브넷 (ENI 정보가 없으면 설정된 서브넷)"""
+        return self.elb_subnets.get((*_scope(lb), load_balancer_key(lb))) or lb.get('SubnetIds', [])
+
+    def db_subnets(self, db, subnet_azs):
+        """RDS ENI가 있는 서브넷 중 서브넷 그룹 + 인스턴스 AZ에 해당하는 서브넷
+
+        서브넷 그룹 전체에 배치하면 단일 AZ DB가 모든 서브넷에 나타나므로,
+        DB가 실제로 떠 있는 AZ(Multi-AZ면 보조 AZ 포함)로 좁힌다.
+        """
+        group = db.get('SubnetIds', [])
+        azs = {db.get('AvailabilityZone'), db.get('SecondaryAvailabilityZone')} - {None}
+        if not azs:
+            return group
+
+        in_az = [subnet_id for subnet_id in group if subnet_azs.get(subnet_id) in azs]
+        with_eni = self.rds_subnets.get(_scope(db), set())
+        return [subnet_id for subnet_id in in_az if subnet_id in with_eni] or in_az or group
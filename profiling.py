@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""단계별 타이머와 botocore 이벤트 훅 기반 API 호출 계측 (Chrome trace 출력)"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from ratelimit import THROTTLE_CODES
+
+
+def _error_code(response):
+    if response and isinstance(response[1], dict):
+        return response[1].get('Error', {}).get('Code')
+    return None
+
+
+class Profiler:
+    """API 호출/페이지/재시도/스로틀 횟수와 단계별 소요 시간 수집"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []
+        self.stages = {}
+        self.api = defaultdict(lambda: {'calls': 0, 'errors': 0, 'retries': 0, 'throttles': 0, 'seconds': 0.0})
+        self._lock = threading.Lock()
+
+    def _us(self, t):
+        return int((t - self.started) * 1_000_000)
+
+    def instrument(self, client):
+        """botocore 클라이언트에 계측 훅 등록"""
+        events = client.meta.events
+        events.register('before-call.*.*', self._before_call, unique_id='profiler-before-call')
+        events.register('after-call.*.*', self._after_call, unique_id='profiler-after-call')
+        events.register('after-call-error.*.*', self._after_call_error, unique_id='profiler-after-call-error')
+        events.register('needs-retry.*.*', self._needs_retry, unique_id='profiler-needs-retry')
+
+    def _before_call(self, model, context, **kwargs):
+        # after-call-error에는 model이 전달되지 않으므로 호출 이름을 context에 남김
+        context['profile_operation'] = (model.service_model.service_name, model.name)
+        context['profile_started'] = time.perf_counter()
+
+    def _record_call(self, context, retries=0, error=None):
+        started = context.get('profile_started')
+        operation = context.get('profile_operation')
+        if started is None or operation is None:
+            return
+        ended = time.perf_counter()
+        service, name = operation
+        key = f"{service}.{name}"
+
+        with self._lock:
+            stats = self.api[key]
+            stats['calls'] += 1
+            stats['retries'] += retries
+            stats['seconds'] += ended - started
+            if error:
+                stats['errors'] += 1
+            self.events.append({
+                'name': name, 'cat': 'api', 'ph': 'X', 'pid': os.getpid(),
+                'tid': threading.get_ident(), 'ts': self._us(started), 'dur': self._us(ended) - self._us(started),
+                'args': {'service': service, 'retries': retries, 'error': error},
+            })
+
+    def _after_call(self, parsed, context, **kwargs):
+        # HTTP 오류 응답(ClientError)도 파싱된 뒤 after-call로 전달됨
+        retries, error = 0, None
+        if isinstance(parsed, dict):
+            retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            error = parsed.get('Error', {}).get('Code')
+        self._record_call(context, retries, error)
+
+    def _after_call_error(self, exception, context, **kwargs):
+        # 전송 단계 실패 (연결 거부, 타임아웃 등)
+        self._record_call(context, error=type(exception).__name__)
+
+    def _needs_retry(self, operation, response=None, **kwargs):
+        # 재시도 여부는 결정하지 않고 스로틀 응답만 집계
+        if _error_code(response) in THROTTLE_CODES:
+            with self._lock:
+                self.api[f"{operation.service_model.service_name}.{operation.name}"]['throttles'] += 1
+
+    @contextmanager
+    def stage(self, name):
+        """단계 타이머"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + ended - started
+                self.events.append({
+                    'name': name, 'cat': 'stage', 'ph': 'X', 'pid': os.getpid(),
+                    'tid': threading.get_ident(), 'ts': self._us(started), 'dur': self._us(ended) - self._us(started),
+                })
+
+    def write_trace(self, path):
+        """Chrome trace 형식(chrome://tracing, Perfetto)으로 저장"""
+        with self._lock:
+            trace = {
+                'traceEvents': list(self.events),
+                'displayTimeUnit': 'ms',
+                'otherData': {'stages': dict(self.stages), 'api': {k: dict(v) for k, v in self.api.items()}},
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+        return path
+
+    def summary_lines(self):
+        """단계/API 호출 요약 표"""
+        lines = [f"  {'Stage':<20}{'Time(s)':>10}"]
+        for name, seconds in self.stages.items():
+            lines.append(f"  {name:<20}{seconds:>10.2f}")
+
+        if self.api:
+            lines.append("")
+            lines.append(f"  {'API Call':<40}{'Pages':>7}{'Retry':>7}{'Thrtl':>7}{'Err':>6}{'Total(s)':>9}")
+            for key, stats in sorted(self.api.items(), key=lambda item: -item[1]['seconds']):
+                lines.append(
+                    f"  {key:<40}{stats['calls']:>7}{stats['retries']:>7}{stats['throttles']:>7}"
+                    f"{stats['errors']:>6}{stats['seconds']:>9.2f}"
+                )
+        return lines
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""에스테이트 범위 필터(VPC / 태그 / 리전)와 토폴로지/도달성 조회 (CLI query 등에서 공용)"""
+from collections import Counter
+
+from collector import get_tag_value
+from model import RECORD_TYPES, vpc_key
+
+# 서브넷 리소스 종류 -> 식별자 키 (조회 결과/위치 검색용)
+RESOURCE_IDS = {
+    'instances': ('InstanceId',),
+    'rds_instances': ('DBInstanceIdentifier',),
+    'load_balancers': ('LoadBalancerName', 'LoadBalancerArn'),
+    'services': ('ServiceId',),
+}
+
+
+def parse_tags(values):
+    """KEY=VALUE 목록 -> {KEY: VALUE} (값이 없으면 태그 존재 여부만 확인)"""
+    tags = {}
+    for value in values or []:
+        key, sep, tag_value = value.partition('=')
+        tags[key] = tag_value if sep else None
+    return tags
+
+
+def _vpc_matches(vpc, vpc_ids, tags, regions, default_region):
+    if vpc_ids and vpc['VpcId'] not in vpc_ids:
+        return False
+    if regions and (vpc.get('Region') or default_region) not in regions:
+        return False
+    for key, value in (tags or {}).items():
+        tag_value = get_tag_value(vpc.get('Tags', []), key)
+        if tag_value is None or (value is not None and tag_value != value):
+            return False
+    return True
+
+
+def _item_vpc_keys(name, item):
+    """리소스가 속한 VPC 키 (IGW는 연결된 VPC 전체)"""
+    if name == 'igws':
+        return [vpc_key({'AccountId': item.get('AccountId'), 'Region': item.get('Region'),
+                         'VpcId': attachment.get('VpcId')})
+                for attachment in item.get('Attachments', [])]
+    if not item.get('VpcId'):
+        return []
+    return [vpc_key(item)]
+
+
+def filter_estate(data, vpc_ids=None, tags=None, regions=None):
+    """선택한 VPC(ID / VPC 태그 / 리전)와 그 안의 리소스만 남긴 에스테이트 (조건이 없으면 그대로)"""
+    if not (vpc_ids or tags or regions):
+        return data
+
+    scope = data.get('scope', {})
+    default_region = (scope.get('regions') or [None])[0]
+    keep = {
+        vpc_key(vpc) for vpc in data['vpcs']
+        if _vpc_matches(vpc, set(vpc_ids or ()), tags, set(regions or ()), default_region)
+    }
+
+    filtered = dict(data)
+    for name in RECORD_TYPES:
+        if name in data:
+            filtered[name] = [item for item in data[name]
+                              if any(key in keep for key in _item_vpc_keys(name, item))]
+    if regions and scope.get('regions'):
+        filtered['scope'] = dict(scope, regions=[region for region in scope['regions'] if region in regions])
+    return filtered
+
+
+def _resource_id(key, resource):
+    return next((resource[id_key] for id_key in RESOURCE_IDS[key] if resource.get(id_key)), None)
+
+
+def subnet_details(topology, subnet_id):
+    """서브넷 정보와 배치된 리소스 ID 목록 (없으면 None)"""
+    subnet = topology.subnets.get(subnet_id)
+    if subnet is None:
+        return None
+    resources = topology.resources(subnet_id)
+    return {
+        'subnet_id': subnet_id,
+        'vpc_id': subnet['VpcId'],
+        'name': get_tag_value(subnet.get('Tags', []), 'Name') or subnet_id,
+        'subnet_type': topology.subnet_type(subnet_id),
+        'cidr': subnet['CidrBlock'],
+        'az': subnet['AvailabilityZone'],
+        'available_ips': subnet.get('AvailableIpAddressCount'),
+        'resources': {key: [_resource_id(key, resource) for resource in items] for key, items in resources.items()},
+    }
+
+
+def vpc_summary(topology, vpc_id):
+    """VPC 정보, 서브넷 타입별 수, 리소스 종류별 수 (여러 서브넷에 걸친 리소스는 한 번만, 없으면 None)"""
+    vpc = topology.vpcs.get(vpc_id)
+    if vpc is None:
+        return None
+    subnets = topology.vpc_subnets.get(vpc_id, [])
+    resources = {key: set() for key in RESOURCE_IDS}
+    for subnet in subnets:
+        for key, items in topology.resources(subnet['SubnetId']).items():
+            resources[key].update(_resource_id(key, resource) for resource in items)
+
+    return {
+        'vpc_id': vpc_id,
+        'name': get_tag_value(vpc.get('Tags', []), 'Name') or vpc_id,
+        'account': vpc.get('AccountId'),
+        'region': vpc.get('Region'),
+        'cidr': vpc['CidrBlock'],
+        'state': vpc['State'],
+        'subnets': len(subnets),
+        'subnet_types': dict(Counter(topology.subnet_type(subnet['SubnetId']) for subnet in subnets)),
+        'internet_gateways': len(topology.vpc_igws.get(vpc_id, [])),
+        'resources': {key: len(ids) for key, ids in resources.items()},
+    }
+
+
+def resource_index(topology):
+    """리소스 ID(이름/ARN) -> 배치된 서브넷 목록 (전체 리소스 한 번 순회)"""
+    index = {}
+    for subnet_id, resources in topology.subnet_resources.items():
+        for key, items in resources.items():
+            for resource in items:
+                location = {'kind': key, 'subnet_id': subnet_id, 'vpc_id': topology.subnets[subnet_id]['VpcId'],
+                            'subnet_type': topology.subnet_type(subnet_id)}
+                for id_key in RESOURCE_IDS[key]:
+                    if resource.get(id_key):
+                        index.setdefault(resource[id_key], []).append(location)
+    return index
+
+
+def locate(topology, resource_id):
+    """리소스 ID(이름/ARN)가 배치된 서브넷 목록"""
+    return resource_index(topology).get(resource_id, [])
+
+
+def reach(reachability, source_id, target_id, port, protocol='tcp'):
+    """source_id에서 target_id의 port로 도달 가능한지와 근거 (target_id 'internet' = 인터넷, 리소스가 없으면 None)"""
+    source = reachability.lookup(source_id)
+    target = reachability.lookup(target_id)
+    if source is None or target is None or source.kind == 'internet':
+        return None
+    return reachability.explain(source, target, port, protocol)
+
+
+def query(topology, target=None):
+    """대상 ID 종류에 따른 조회 -> (결과 종류, 결과) - 대상이 없으면 전체 VPC 요약"""
+    if not target:
+        return 'vpcs', [vpc_summary(topology, vpc_id) for vpc_id in topology.vpcs]
+    if target.startswith('vpc-'):
+        return 'vpc', vpc_summary(topology, target)
+    if target.startswith('subnet-'):
+        return 'subnet', subnet_details(topology, target)
+    return 'locations', locate(topology, target)
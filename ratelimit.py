@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""서비스별 공유 토큰 버킷과 스로틀 응답 기반 적응형(AIMD) 속도 조절"""
+import random
+import threading
+import time
+
+# AWS 공개 API 요청 쿼터 기준 (초당 보충 속도, 버킷 크기) - 계정/리전 단위 공유
+#  - EC2 Describe*(non-mutating): 버킷 100, 초당 20 보충
+#  - ELBv2 Describe*: 초당 10
+#  - RDS Describe*: 초당 약 10 (문서화된 기본값 없음, 보수적으로 설정)
+#  - CloudTrail LookupEvents: 초당 2
+SERVICE_QUOTAS = {
+    'ec2': (20.0, 100),
+    'elbv2': (10.0, 40),
+    'rds': (10.0, 20),
+    'cloudtrail': (2.0, 2),
+    'sts': (20.0, 20),
+}
+DEFAULT_QUOTA = (5.0, 10)
+
+THROTTLE_CODES = {
+    'Throttling', 'ThrottlingException', 'ThrottledException', 'RequestLimitExceeded',
+    'TooManyRequestsException', 'RequestThrottled', 'RequestThrottledException',
+    'SlowDown', 'ProvisionedThroughputExceededException',
+}
+
+# 요청 단위 재시도는 botocore standard 모드(지수 백오프 + 지터)에 맡기고 시도 횟수만 늘림
+RETRY_CONFIG = {'mode': 'standard', 'max_attempts': 12}
+
+# botocore 재시도까지 소진된 페이지는 마지막 페이지 토큰부터 다시 시도
+MAX_PAGE_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+
+def is_throttle(error):
+    """스로틀 응답으로 실패한 예외인지 여부"""
+    response = getattr(error, 'response', None)
+    return isinstance(response, dict) and response.get('Error', {}).get('Code') in THROTTLE_CODES
+
+
+def backoff(attempt):
+    """페이지 재시도 대기 시간 (지수 백오프 + full jitter)"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class AdaptiveTokenBucket:
+    """스로틀 시 속도를 절반으로 줄이고 성공 시 쿼터까지 선형으로 회복하는 토큰 버킷"""
+
+    def __init__(self, rate, capacity, min_rate=0.5, recovery=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.tokens = float(capacity)
+        self.throttles = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_throttle(self):
+        """스로틀 응답: 속도 절반 감소, 남은 버스트 제거"""
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def on_success(self):
+        """성공 응답: 쿼터 상한까지 선형 회복"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+
+class RateLimiter:
+    """수집기 전체가 공유하는 서비스별 속도 제한기 (botocore 이벤트 훅으로 연결)"""
+
+    def __init__(self, quotas=None):
+        self.quotas = dict(SERVICE_QUOTAS)
+        self.quotas.update(quotas or {})
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service):
+        with self._lock:
+            if service not in self.buckets:
+                rate, capacity = self.quotas.get(service, DEFAULT_QUOTA)
+                self.buckets[service] = AdaptiveTokenBucket(rate, capacity)
+            return self.buckets[service]
+
+    def attach(self, client):
+        """클라이언트의 모든 HTTP 시도(재시도 포함) 전에 토큰을 얻고 응답으로 속도 조절"""
+        bucket = self.bucket(client.meta.service_model.service_name)
+
+        def before_send(**kwargs):
+            bucket.acquire()
+
+        def needs_retry(response=None, **kwargs):
+            if response and isinstance(response[1], dict):
+                if response[1].get('Error', {}).get('Code') in THROTTLE_CODES:
+                    bucket.on_throttle()
+
+        def after_call(parsed=None, **kwargs):
+            # 오류 응답(재시도를 소진한 스로틀 포함)도 after-call로 전달되므로 성공 응답만 회복에 반영
+            if isinstance(parsed, dict) and parsed.get('Error'):
+                return
+            bucket.on_success()
+
+        events = client.meta.events
+        events.register('before-send.*.*', before_send, unique_id='rate-limiter-before-send')
+        events.register('needs-retry.*.*', needs_retry, unique_id='rate-limiter-needs-retry')
+        events.register('after-call.*.*', after_call, unique_id='rate-limiter-after-call')
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""보안 그룹/NACL/라우트 테이블을 인덱싱된 규칙 집합으로 컴파일하여 리소스 간 도달 가능성 판정
+
+CIDR 규칙은 접두사 길이별 해시 테이블(routing.RouteTable과 같은 구조의 접두사 트라이)에,
+SG 참조 규칙은 참조 SG ID -> 포트 범위 맵에 넣으므로 한 번의 판정 비용은 규칙 수가 아니라
+접두사 길이 수에 비례한다. 서브넷 안을 더 잘게 나누는 CIDR 규칙이 없으면 같은 서브넷/SG 조합의
+리소스는 판정 결과가 같으므로 (서브넷, SG) 프로파일 단위로 판정을 공유한다.
+"""
+import ipaddress
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from routing import RouteIndex, route_target
+
+BITS = {4: 32, 6: 128}
+
+# 프로토콜 번호 -> 이름 (SG/NACL 응답은 둘 다 사용)
+PROTOCOL_NAMES = {'6': 'tcp', '17': 'udp', '1': 'icmp', '58': 'icmpv6'}
+ALL_PROTOCOLS = '-1'
+
+# NACL은 상태가 없으므로 응답 트래픽(임시 포트)도 허용되어야 함
+EPHEMERAL_PORT = 32768
+
+# 교차 VPC / 인터넷 경로로 인정하는 라우트 대상
+PEERING_TARGETS = {'pcx', 'tgw', 'core', 'vgw'}
+INTERNET_TARGETS = {'igw', 'nat', 'eigw', 'instance', 'eni'}
+
+# 인터넷 목적지 (0.0.0.0/0 전체를 허용해야 인터넷 도달로 판정)
+INTERNET_PREFIX = (4, 0, 0)
+INTERNET_PORT = 443
+
+# 대상 그룹 정보가 없고 ELB SG를 참조하는 단일 TCP 포트 규칙도 없을 때 ELB -> EC2 판정에 쓰는 포트
+DEFAULT_SERVICE_PORTS = (443, 80)
+
+# EC2로 트래픽을 보내는 대상 그룹 (TCP 기반 프로토콜, 인스턴스/IP 대상)
+TARGET_PROTOCOLS = {'HTTP', 'HTTPS', 'TCP', 'TLS', 'TCP_UDP'}
+TARGET_TYPES = {'instance', 'ip'}
+
+# 조회용 리소스 식별자 (엔드포인트 종류, 수집 키, 식별자 키)
+LOOKUP_KEYS = (
+    ('ec2', 'instances', ('InstanceId',)),
+    ('rds', 'rds_instances', ('DBInstanceIdentifier',)),
+    ('elb', 'load_balancers', ('LoadBalancerArn', 'LoadBalancerName')),
+)
+
+# 엔드포인트 포트가 없는 RDS의 엔진별 기본 포트 (접두사 일치)
+ENGINE_PORTS = (
+    ('aurora-postgresql', 5432), ('postgres', 5432), ('aurora', 3306), ('mysql', 3306),
+    ('mariadb', 3306), ('oracle', 1521), ('sqlserver', 1433),
+)
+
+
+@lru_cache(maxsize=None)
+def parse_prefix(cidr):
+    """CIDR/주소 -> (IP 버전, 네트워크 정수 값, 접두사 길이)"""
+    network = ipaddress.ip_network(cidr, strict=False)
+    return network.version, int(network.network_address), network.prefixlen
+
+
+def contains(outer, inner):
+    """outer 접두사가 inner 접두사 전체를 포함하는지"""
+    version, network, length = outer
+    if version != inner[0] or length > inner[2]:
+        return False
+    shift = BITS[version] - length
+    return network >> shift == inner[1] >> shift
+
+
+def protocol_name(protocol):
+    protocol = str(protocol).lower()
+    return PROTOCOL_NAMES.get(protocol, protocol)
+
+
+def port_match(ports, protocol, port):
+    """(프로토콜, 시작 포트, 끝 포트) 규칙이 프로토콜/포트를 허용하는지"""
+    rule_protocol, low, high = ports
+    if rule_protocol != ALL_PROTOCOLS and rule_protocol != protocol:
+        return False
+    return low is None or low == -1 or low <= port <= (high if high is not None else low)
+
+
+def resource_key(kind, resource):
+    """다이어그램 노드와 도달성 간선을 잇는 리소스 키"""
+    if kind == 'ec2':
+        return kind, resource['InstanceId']
+    if kind == 'rds':
+        return kind, resource['DBInstanceIdentifier']
+    if kind == 'elb':
+        return kind, resource.get('LoadBalancerArn') or resource['LoadBalancerName']
+    if kind == 'nat':
+        return kind, resource['NatGatewayId']
+    return None
+
+
+def db_port(db):
+    """RDS 접속 포트 (엔드포인트 포트, 없으면 엔진 기본 포트)"""
+    if db.get('Port'):
+        return db['Port']
+    engine = db.get('Engine') or ''
+    for prefix, port in ENGINE_PORTS:
+        if engine.startswith(prefix):
+            return port
+    return 3306
+
+
+class PrefixTable:
+    """CIDR -> 값 목록 (접두사 길이별 해시 테이블, 포함하는 모든 접두사 조회)"""
+
+    def __init__(self):
+        self._tables = {4: {}, 6: {}}
+        self._lengths = {4: (), 6: ()}
+
+    def add(self, prefix, value):
+        version, network, length = prefix
+        tables = self._tables[version]
+        if length not in tables:
+            tables[length] = {}
+            self._lengths[version] = tuple(sorted(tables))
+        tables[length].setdefault(network >> (BITS[version] - length), []).append(value)
+
+    def covering(self, prefix):
+        """prefix 전체를 포함하는 항목들의 값 (짧은 접두사부터)"""
+        version, network, length = prefix
+        bits = BITS[version]
+        tables = self._tables[version]
+        for table_length in self._lengths[version]:
+            if table_length > length:
+                break
+            values = tables[table_length].get(network >> (bits - table_length))
+            if values:
+                yield from values
+
+
+class RuleSet:
+    """SG 한 방향(인바운드/아웃바운드)의 규칙: CIDR 접두사 테이블 + 참조 SG 맵
+
+    관리형 프리픽스 리스트 규칙은 목록 내용을 수집하지 않으므로 판정에서 제외한다.
+    """
+
+    def __init__(self, rules):
+        self.cidrs = PrefixTable()
+        self.groups = {}
+        self.prefixes = set()
+
+        for rule in rules:
+            ports = (protocol_name(rule.get('IpProtocol', ALL_PROTOCOLS)), rule.get('FromPort'), rule.get('ToPort'))
+            for cidr in tuple(rule.get('CidrBlocks', ())) + tuple(rule.get('Ipv6CidrBlocks', ())):
+                prefix = parse_prefix(cidr)
+                self.cidrs.add(prefix, ports)
+                self.prefixes.add(prefix)
+            for group_id in rule.get('GroupIds', ()):
+                self.groups.setdefault(group_id, []).append(ports)
+
+    def allows(self, prefix, peer_groups, protocol, port):
+        """상대 주소(prefix) 또는 상대 SG 소속으로 프로토콜/포트가 허용되는지"""
+        for group_id in peer_groups:
+            for ports in self.groups.get(group_id, ()):
+                if port_match(ports, protocol, port):
+                    return True
+        return any(port_match(ports, protocol, port) for ports in self.cidrs.covering(prefix))
+
+
+class NetworkAclRules:
+    """NACL 항목을 규칙 번호 순으로 컴파일 (첫 일치 규칙의 허용/거부, 일치 없으면 거부)"""
+
+    def __init__(self, acl):
+        self.acl_id = acl.get('NetworkAclId')
+        self.ingress, self.egress = [], []
+        self.prefixes = set()
+
+        for entry in sorted(acl.get('Entries', ()), key=lambda entry: entry['RuleNumber']):
+            cidr = entry.get('CidrBlock') or entry.get('Ipv6CidrBlock')
+            if not cidr:
+                continue
+            prefix = parse_prefix(cidr)
+            self.prefixes.add(prefix)
+            ports = (protocol_name(entry.get('Protocol', ALL_PROTOCOLS)), entry.get('FromPort'), entry.get('ToPort'))
+            rules = self.egress if entry.get('Egress') else self.ingress
+            rules.append((prefix, ports, entry.get('RuleAction') == 'allow', entry['RuleNumber']))
+
+    def match(self, egress, prefix, protocol, port):
+        """첫 일치 규칙 -> (규칙 번호, 허용 여부) / 일치 없으면 (None, False) (기본 거부 규칙 '*')"""
+        for rule_prefix, ports, allow, number in (self.egress if egress else self.ingress):
+            if contains(rule_prefix, prefix) and port_match(ports, protocol, port):
+                return number, allow
+        return None, False
+
+    def allows(self, egress, prefix, protocol, port):
+        return self.match(egress, prefix, protocol, port)[1]
+
+    def blocking(self, subnet_id, checks, protocol):
+        """(egress, 상대 접두사, 포트) 검사 중 처음 거부되는 방향 -> 차단 규칙 (모두 허용이면 None)"""
+        for egress, prefix, port in checks:
+            number, allow = self.match(egress, prefix, protocol, port)
+            if not allow:
+                return {'layer': 'nacl', 'id': self.acl_id, 'subnet_id': subnet_id,
+                        'direction': 'egress' if egress else 'ingress', 'protocol': protocol, 'port': port,
+                        'rule': number if number is not None else '*'}
+        return None
+
+
+@dataclass(slots=True)
+class Endpoint:
+    """도달성 판정 단위: 배치 서브넷별 주소 접두사와 소속 SG (profile은 판정 공유 키, port는 RDS 접속 포트)"""
+    kind: str
+    resource_id: str
+    vpc_id: str = None
+    addresses: tuple = ()
+    groups: tuple = ()
+    public: bool = False
+    port: int = None
+    profile: tuple = None
+
+
+INTERNET = Endpoint('internet', 'internet', addresses=((None, INTERNET_PREFIX),))
+INTERNET.profile = (True, INTERNET.addresses, (), False)
+
+
+class ReachabilityIndex:
+    """수집 데이터의 SG/NACL/라우트로 'A -> B 포트 P 도달 가능' 판정과 다이어그램 간선 계산"""
+
+    def __init__(self, data, topology, route_index=None):
+        self.data = data
+        self.topology = topology
+        self.route_index = route_index or RouteIndex(data['route_tables'])
+        self.available = 'security_groups' in data
+
+        # ELB ARN -> 대상 그룹 포트 (대상 그룹을 수집하지 않은 스냅샷이면 None)
+        self.target_ports = None
+        if 'target_groups' in data:
+            self.target_ports = {}
+            for tg in data['target_groups']:
+                if tg.get('Protocol') in TARGET_PROTOCOLS and tg.get('TargetType', 'instance') in TARGET_TYPES:
+                    for lb_arn in tg.get('LoadBalancerArns', ()):
+                        ports = self.target_ports.setdefault(lb_arn, [])
+                        if tg.get('Port') and tg['Port'] not in ports:
+                            ports.append(tg['Port'])
+
+        self.ingress, self.egress = {}, {}
+        rule_prefixes = set()
+        for sg in data.get('security_groups', []):
+            self.ingress[sg['GroupId']] = RuleSet(sg.get('IngressRules', ()))
+            self.egress[sg['GroupId']] = RuleSet(sg.get('EgressRules', ()))
+            rule_prefixes |= self.ingress[sg['GroupId']].prefixes | self.egress[sg['GroupId']].prefixes
+
+        self.subnet_acls, self.default_acls = {}, {}
+        for acl in data.get('network_acls', []):
+            rules = NetworkAclRules(acl)
+            rule_prefixes |= rules.prefixes
+            for subnet_id in acl.get('SubnetIds', ()):
+                self.subnet_acls[subnet_id] = rules
+            if acl.get('IsDefault'):
+                self.default_acls[acl.get('VpcId')] = rules
+
+        # 서브넷보다 긴 CIDR 규칙이 안에 있으면 그 서브넷은 리소스 IP별로 판정
+        subnet_prefixes = PrefixTable()
+        for subnet_id, subnet in topology.subnets.items():
+            if subnet.get('CidrBlock'):
+                subnet_prefixes.add(parse_prefix(subnet['CidrBlock']), subnet_id)
+        self.ip_sensitive = {
+            subnet_id
+            for prefix in rule_prefixes
+            for subnet_id in subnet_prefixes.covering(prefix)
+            if parse_prefix(topology.subnets[subnet_id]['CidrBlock'])[2] < prefix[2]
+        }
+
+        # RDS / ELB 배치 서브넷 (토폴로지 인덱스와 같은 배치)
+        self.placements = {}
+        for subnet_id, resources in topology.subnet_resources.items():
+            for kind, key in (('rds', 'rds_instances'), ('elb', 'load_balancers')):
+                for resource in resources[key]:
+                    self.placements.setdefault(resource_key(kind, resource), []).append(subnet_id)
+
+        self._endpoints = {}
+        self._routes = {}
+        self._decisions = {}
+        self._edges = None
+        self._lookup = None
+
+    def lookup(self, resource_id):
+        """리소스 ID(인스턴스 ID / DB 식별자 / ELB 이름 또는 ARN) -> 엔드포인트 ('internet'은 인터넷, 없으면 None)"""
+        if resource_id == INTERNET.resource_id:
+            return INTERNET
+        if self._lookup is None:
+            self._lookup = {}
+            for kind, key, id_keys in LOOKUP_KEYS:
+                for resource in self.data[key]:
+                    for id_key in id_keys:
+                        if resource.get(id_key):
+                            self._lookup.setdefault(resource[id_key], (kind, resource))
+        found = self._lookup.get(resource_id)
+        return self.endpoint(*found) if found else None
+
+    def endpoint(self, kind, resource):
+        """리소스의 도달성 엔드포인트 (리소스당 한 번만 생성)"""
+        key = resource_key(kind, resource)
+        endpoint = self._endpoints.get(key)
+        if endpoint is not None:
+            return endpoint
+
+        if kind == 'ec2':
+            addresses = ()
+            if resource.get('SubnetId') in self.topology.subnets and resource.get('PrivateIpAddress'):
+                addresses = ((resource['SubnetId'], parse_prefix(resource['PrivateIpAddress'])),)
+            public = bool(resource.get('PublicIpAddress'))
+        else:
+            addresses = tuple(
+                (subnet_id, parse_prefix(self.topology.subnets[subnet_id]['CidrBlock']))
+                for subnet_id in self.placements.get(key, ())
+                if self.topology.subnets[subnet_id].get('CidrBlock')
+            )
+            public = kind == 'elb' and resource.get('Scheme') == 'internet-facing'
+
+        endpoint = self._endpoints[key] = Endpoint(
+            kind, key[1], resource.get('VpcId'), addresses, tuple(resource.get('SecurityGroups', ())), public,
+            db_port(resource) if kind == 'rds' else None,
+        )
+        endpoint.profile = self.profile(endpoint)
+        return endpoint
+
+    def profile(self, endpoint):
+        """판정 결과가 같은 엔드포인트끼리 공유하는 키 (IP를 구분할 필요가 없으면 서브넷 단위)"""
+        addresses = tuple(
+            (subnet_id, prefix if subnet_id is None or subnet_id in self.ip_sensitive else None)
+            for subnet_id, prefix in endpoint.addresses
+        )
+        return endpoint.kind == 'internet', addresses, endpoint.groups, endpoint.public
+
+    def route(self, source_subnet, target_subnet, target_prefix, source_prefix):
+        """서브넷 간 경로 -> (경로 종류, 라우트) / 경로가 없으면 (None, None)"""
+        key = (source_subnet, target_subnet)
+        if key in self._routes:
+            return self._routes[key]
+
+        source = self.topology.subnets[source_subnet]
+        if target_subnet is None:
+            route = self.route_index.lookup(source, str(ipaddress.ip_address(target_prefix[1])))
+            kind = route_target(route) if route else None
+            result = (kind, route) if kind in INTERNET_TARGETS else (None, None)
+        elif self.topology.subnets[target_subnet]['VpcId'] == source['VpcId']:
+            result = ('local', None)
+        else:
+            # 교차 VPC: 양방향 라우트가 피어링/TGW를 가리켜야 함
+            target = self.topology.subnets[target_subnet]
+            route = self.route_index.lookup(source, str(ipaddress.ip_address(target_prefix[1])))
+            back = self.route_index.lookup(target, str(ipaddress.ip_address(source_prefix[1])))
+            kind = route_target(route) if route else None
+            if kind in PEERING_TARGETS and back and route_target(back) in PEERING_TARGETS:
+                result = (kind, route)
+            else:
+                result = (None, None)
+
+        self._routes[key] = result
+        return result
+
+    def acl(self, subnet_id):
+        rules = self.subnet_acls.get(subnet_id)
+        if rules is None:
+            rules = self.default_acls.get(self.topology.subnets[subnet_id]['VpcId'])
+        return rules
+
+    def security_groups_allow(self, rulesets, groups, prefix, peer_groups, protocol, port):
+        """SG가 없는 엔드포인트(NLB 등)는 필터링 없음, 여러 SG는 하나라도 허용하면 허용"""
+        if not groups:
+            return True
+        return any(
+            group_id in rulesets and rulesets[group_id].allows(prefix, peer_groups, protocol, port)
+            for group_id in groups
+        )
+
+    def can_reach(self, source, target, port, protocol='tcp'):
+        """source에서 target의 port로 도달 가능하면 경로 종류(local / nat / igw / pcx / tgw ...), 아니면 None"""
+        return self._decide(source, target, port, protocol)[0]
+
+    def explain(self, source, target, port, protocol='tcp'):
+        """도달 판정과 근거: 도달하면 경로 종류와 라우트, 아니면 처음 차단한 계층/규칙"""
+        via, route, blocked = self._decide(source, target, port, protocol)
+        return {
+            'source': source.resource_id, 'target': target.resource_id, 'protocol': protocol, 'port': port,
+            'reachable': via is not None, 'via': via,
+            'route': route.to_dict() if route is not None else None,
+            'blocked_by': blocked,
+        }
+
+    def _decide(self, source, target, port, protocol):
+        key = (source.profile or self.profile(source), target.profile or self.profile(target), protocol, port)
+        if key not in self._decisions:
+            self._decisions[key] = self._evaluate(source, target, port, protocol)
+        return self._decisions[key]
+
+    def _evaluate(self, source, target, port, protocol):
+        """-> (경로 종류, 라우트, None) / 도달 불가면 (None, None, 첫 주소 쌍을 막은 규칙)"""
+        blocked = None
+        if not (source.addresses and target.addresses):
+            blocked = {'layer': 'placement', 'reason': "배치된 서브넷/주소가 없음"}
+        for source_subnet, source_prefix in source.addresses:
+            for target_subnet, target_prefix in target.addresses:
+                reason = self._block(source, target, source_subnet, source_prefix, target_subnet, target_prefix,
+                                     port, protocol)
+                if reason is None:
+                    return (*self.route(source_subnet, target_subnet, target_prefix, source_prefix), None)
+                blocked = blocked or reason
+        return None, None, blocked
+
+    def _block(self, source, target, source_subnet, source_prefix, target_subnet, target_prefix, port, protocol):
+        """주소 쌍 하나의 차단 규칙 (허용이면 None)"""
+        via, _ = self.route(source_subnet, target_subnet, target_prefix, source_prefix)
+        if via is None:
+            return {'layer': 'route', 'subnet_id': source_subnet, 'destination': target_subnet or 'internet',
+                    'reason': "대상으로 가는 라우트 없음"}
+        if via == 'igw' and not source.public:
+            return {'layer': 'route', 'subnet_id': source_subnet, 'destination': 'internet',
+                    'reason': "IGW 경로지만 출발지에 퍼블릭 IP 없음"}
+
+        # NACL: 요청 방향 + 응답(임시 포트) 방향, 같은 서브넷 안에서는 적용되지 않음
+        if source_subnet != target_subnet:
+            checks = [(source_subnet, ((True, target_prefix, port), (False, target_prefix, EPHEMERAL_PORT)))]
+            if target_subnet:
+                checks.append((target_subnet, ((False, source_prefix, port), (True, source_prefix, EPHEMERAL_PORT))))
+            for subnet_id, directions in checks:
+                rules = self.acl(subnet_id)
+                blocked = rules.blocking(subnet_id, directions, protocol) if rules else None
+                if blocked:
+                    return blocked
+
+        # SG: 출발지 아웃바운드 + 목적지 인바운드 (SG는 상태 저장이므로 응답은 자동 허용)
+        if not self.security_groups_allow(self.egress, source.groups, target_prefix, target.groups,
+                                          protocol, port):
+            return {'layer': 'security_group', 'direction': 'egress', 'groups': list(source.groups),
+                    'protocol': protocol, 'port': port, 'reason': "허용하는 아웃바운드 규칙 없음"}
+        if target is not INTERNET and not self.security_groups_allow(
+                self.ingress, target.groups, source_prefix, source.groups, protocol, port):
+            return {'layer': 'security_group', 'direction': 'ingress', 'groups': list(target.groups),
+                    'protocol': protocol, 'port': port, 'reason': "허용하는 인바운드 규칙 없음"}
+        return None
+
+    def elb_ports(self, elb):
+        """ELB에 연결된 대상 그룹 포트 (대상 그룹 정보가 없으면 None)"""
+        if self.target_ports is None:
+            return None
+        return tuple(self.target_ports.get(elb.resource_id, ()))
+
+    def service_ports(self, source, target):
+        """대상 그룹 정보가 없을 때: 대상 SG에서 출발지 SG를 참조하는 단일 TCP 포트 (없으면 기본 웹 포트)
+
+        CIDR 규칙(예: 사내망 SSH)의 포트는 ELB가 쓰는 포트가 아니므로 후보로 삼지 않는다.
+        """
+        ports = set()
+        for group_id in target.groups:
+            rules = self.ingress.get(group_id)
+            if rules is None:
+                continue
+            for source_group in source.groups:
+                for protocol, low, high in rules.groups.get(source_group, ()):
+                    if protocol == 'tcp' and low is not None and low == high:
+                        ports.add(low)
+        return tuple(sorted(ports)) or DEFAULT_SERVICE_PORTS
+
+    def reachable(self, sources, targets, ports, protocol='tcp'):
+        """엔드포인트 쌍 중 도달 가능한 (출발지, 목적지, 포트) - 프로파일이 같은 엔드포인트는 한 번만 판정
+
+        ports가 함수이면 (출발지, 목적지) 대표 엔드포인트로 후보 포트를 정한다.
+        """
+        source_groups, target_groups = {}, {}
+        for source in sources:
+            source_groups.setdefault(source.profile, []).append(source)
+        for target in targets:
+            target_groups.setdefault(target.profile, []).append(target)
+
+        for source_members in source_groups.values():
+            for target_members in target_groups.values():
+                candidates = ports(source_members[0], target_members[0]) if callable(ports) else ports
+                port = next((p for p in candidates
+                             if self.can_reach(source_members[0], target_members[0], p, protocol)), None)
+                if port is None:
+                    continue
+                for source in source_members:
+                    for target in target_members:
+                        if source is not target:
+                            yield source, target, port
+
+    def connected_vpcs(self):
+        """피어링/TGW 라우트가 서로의 CIDR을 가리키는 (출발 VPC, 도착 VPC) 쌍 - 실제 경로는 서브넷별로 route()가 판정"""
+        cidrs = {vpc['VpcId']: ipaddress.ip_network(vpc['CidrBlock'], strict=False)
+                 for vpc in self.data['vpcs'] if vpc.get('CidrBlock')}
+        destinations = {}
+        for table in self.data['route_tables']:
+            for route in table.get('Routes', ()):
+                if route.get('DestinationCidrBlock') and route_target(route) in PEERING_TARGETS:
+                    destinations.setdefault(table['VpcId'], []).append(
+                        ipaddress.ip_network(route['DestinationCidrBlock'], strict=False))
+
+        def points_to(source, target):
+            return any(network.overlaps(cidrs[target]) for network in destinations.get(source, ())
+                       if network.version == cidrs[target].version)
+
+        return [(source, target) for source in destinations for target in cidrs
+                if source != target and source in cidrs and points_to(source, target) and points_to(target, source)]
+
+    def database_edges(self, instances, databases):
+        """EC2 -> RDS 간선 (접속 포트가 같은 DB끼리 판정)"""
+        by_port = {}
+        for db in databases:
+            by_port.setdefault(db.port, []).append(db)
+        for port, members in by_port.items():
+            for source, target, _ in self.reachable(instances, members, (port,)):
+                yield ('ec2', source.resource_id), ('rds', target.resource_id), port
+
+    def edges(self):
+        """다이어그램 간선 (출발 리소스 키, 도착 리소스 키, 포트): ELB -> EC2, EC2 -> RDS, EC2 -> NAT(인터넷)
+
+        EC2 -> RDS는 피어링/TGW로 연결된 VPC 사이도 판정한다. ELB -> EC2는 대상 그룹이 있는 VPC 안에서만,
+        EC2 -> 인터넷은 자기 VPC의 NAT 경유만 그린다.
+        """
+        if self._edges is not None:
+            return self._edges
+
+        by_vpc = {}
+        for kind, key in (('ec2', 'instances'), ('elb', 'load_balancers')):
+            for resource in self.data[key]:
+                if kind == 'ec2' and resource.get('State') != 'running':
+                    continue
+                endpoint = self.endpoint(kind, resource)
+                by_vpc.setdefault(endpoint.vpc_id, {}).setdefault(kind, []).append(endpoint)
+        for db in self.data['rds_instances']:
+            endpoint = self.endpoint('rds', db)
+            by_vpc.setdefault(endpoint.vpc_id, {}).setdefault('rds', []).append(endpoint)
+
+        edges = []
+        for resources in by_vpc.values():
+            instances = resources.get('ec2', [])
+            # 대상 그룹 포트가 같은 ELB끼리 판정 (대상 그룹이 없는 ELB는 EC2로 보내는 트래픽 없음)
+            elbs = {}
+            for elb in resources.get('elb', []):
+                elbs.setdefault(self.elb_ports(elb), []).append(elb)
+            for ports, members in elbs.items():
+                if ports == ():
+                    continue
+                for source, target, port in self.reachable(members, instances,
+                                                           ports if ports is not None else self.service_ports):
+                    edges.append((('elb', source.resource_id), ('ec2', target.resource_id), port))
+            edges.extend(self.database_edges(instances, resources.get('rds', [])))
+
+            # NAT를 거쳐 인터넷으로 나가는 인스턴스
+            for instance in instances:
+                if self.can_reach(instance, INTERNET, INTERNET_PORT) == 'nat':
+                    _, route, _ = self._decisions[(instance.profile, INTERNET.profile, 'tcp', INTERNET_PORT)]
+                    edges.append((('ec2', instance.resource_id), ('nat', route['NatGatewayId']), INTERNET_PORT))
+
+        # 피어링/TGW로 연결된 VPC의 DB
+        for source_vpc, target_vpc in self.connected_vpcs():
+            instances = by_vpc.get(source_vpc, {}).get('ec2', [])
+            databases = by_vpc.get(target_vpc, {}).get('rds', [])
+            if instances and databases:
+                edges.extend(self.database_edges(instances, databases))
+
+        self._edges = edges
+        return edges
+
+    def summary(self):
+        """간선 종류별 수 (예: ('elb', 'ec2') -> 12)"""
+        return Counter((source[0], target[0]) for source, target, _ in self.edges())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""VPC별 독립 뷰를 병렬 렌더링하고 정규화된 토폴로지 해시로 렌더 결과를 캐시"""
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from collector import get_tag_value
+from dot_render import DotEmitter, layout, node_id, safe_label
+from lod import kind_counts, summary_label
+from topology import TopologyIndex
+
+DEFAULT_VIEWS_DIR = 'aws_architecture_views'
+DEFAULT_CACHE_DIR = '.render_cache'
+CACHE_VERSION = 1
+
+# 이번 실행에서 쓰지 않은 캐시 항목 정리 기준 (적중 시 mtime 갱신 - 오래 쓰이지 않은 항목부터 삭제)
+CACHE_MAX_AGE = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 2000
+
+# 이전 실행 결과 정리 대상 확장자 (뷰 디렉터리 안의 다른 파일은 건드리지 않음)
+OUTPUT_EXTENSIONS = ('.dot', '.svg', '.png')
+
+
+def view_name(vpc):
+    """뷰 파일 이름 (다중 계정이면 계정/리전 포함)"""
+    if vpc.get('AccountId'):
+        return f"{vpc['AccountId']}_{vpc['Region']}_{vpc['VpcId']}"
+    return vpc['VpcId']
+
+
+def _unique(items, key):
+    return sorted({item[key]: item for item in items}.values(), key=lambda item: item[key])
+
+
+def split_views(data, topology):
+    """에스테이트를 VPC별 독립 뷰 데이터로 분할 (정렬하여 입력 순서와 무관하게 정규화)"""
+    interfaces = {}
+    for eni in data.get('network_interfaces', []):
+        interfaces.setdefault(eni.get('VpcId'), []).append(eni)
+
+    views = []
+    for vpc in sorted(data['vpcs'], key=view_name):
+        vpc_id = vpc['VpcId']
+        subnets = sorted(topology.vpc_subnets.get(vpc_id, []), key=lambda s: s['SubnetId'])
+
+        instances, rds_instances, load_balancers, nats = [], [], [], []
+        for subnet in subnets:
+            resources = topology.resources(subnet['SubnetId'])
+            instances.extend(resources['instances'])
+            rds_instances.extend(resources['rds_instances'])
+            load_balancers.extend(resources['load_balancers'])
+            nats.extend(topology.subnet_nats.get(subnet['SubnetId'], []))
+
+        view = {
+            'vpcs': [vpc],
+            'subnets': subnets,
+            'route_tables': [],
+            'igws': _unique(topology.vpc_igws.get(vpc_id, []), 'InternetGatewayId'),
+            'nats': _unique(nats, 'NatGatewayId'),
+            'instances': _unique(instances, 'InstanceId'),
+            'rds_instances': _unique(rds_instances, 'DBInstanceIdentifier'),
+            'load_balancers': _unique(load_balancers, 'LoadBalancerArn'),
+            'network_interfaces': sorted(interfaces.get(vpc_id, []), key=lambda eni: eni['NetworkInterfaceId']),
+        }
+        subnet_types = {s['SubnetId']: topology.subnet_type(s['SubnetId']) for s in subnets}
+        views.append((view_name(vpc), view, subnet_types))
+    return views
+
+
+def cache_name(dot_text, fmt):
+    """렌더 캐시 파일 이름 (형식 + DOT 내용 해시)"""
+    key = hashlib.sha256(f"{CACHE_VERSION}\0{fmt}\0{dot_text}".encode('utf-8')).hexdigest()
+    return f"{key}.{fmt}"
+
+
+def render_cached(dot_text, output_path, fmt, cache_dir=DEFAULT_CACHE_DIR):
+    """DOT 내용 해시로 캐시된 렌더 결과 사용 -> (출력 경로, 캐시 적중 여부)
+
+    .dot 파일은 캐시 적중과 무관하게 항상 다시 써서 렌더 결과와 짝을 맞춘다.
+    """
+    cached = os.path.join(cache_dir, cache_name(dot_text, fmt))
+    dot_path = f"{os.path.splitext(output_path)[0]}.dot"
+    with open(dot_path, 'w', encoding='utf-8') as f:
+        f.write(dot_text)
+
+    if os.path.exists(cached):
+        shutil.copyfile(cached, output_path)
+        os.utime(cached)
+        return output_path, True
+
+    rendered, _ = layout(dot_path, fmt)
+    if rendered is None:
+        return dot_path, False
+
+    os.makedirs(cache_dir, exist_ok=True)
+    shutil.copyfile(rendered, cached)
+    return rendered, False
+
+
+def prune_outputs(output_dir, expected, fmt):
+    """이번 실행에서 만들지 않은 뷰/상세 보기 결과 삭제 (expected: 디렉터리 -> 남길 파일 이름 (확장자 제외))
+
+    사라진 VPC의 뷰와 상세 보기 디렉터리, 더 이상 축약되지 않는 서브넷의 상세 보기, 다른 형식의 이전 결과를 지운다.
+    """
+    removed = 0
+    for directory in [output_dir] + [os.path.join(output_dir, name) for name in os.listdir(output_dir)
+                                     if name.endswith('_drilldown')]:
+        if not os.path.isdir(directory):
+            continue
+        keep = expected.get(directory, set())
+        for name in os.listdir(directory):
+            stem, extension = os.path.splitext(name)
+            if extension in OUTPUT_EXTENSIONS and (stem not in keep or extension not in ('.dot', f".{fmt}")):
+                os.remove(os.path.join(directory, name))
+                removed += 1
+        if directory != output_dir and not os.listdir(directory):
+            os.rmdir(directory)
+    return removed
+
+
+def prune_cache(cache_dir, keep, max_age=CACHE_MAX_AGE, max_entries=CACHE_MAX_ENTRIES, now=None):
+    """이번 실행에서 쓰지 않은 렌더 캐시 중 max_age보다 오래됐거나 max_entries를 넘는 항목 삭제
+
+    다른 범위/형식으로 실행할 때의 렌더 결과는 바로 지우지 않고, 에스테이트 변경으로 더 이상
+    만들어지지 않는 결과는 시간이 지나거나 항목 수가 넘치면 오래된 것부터 지운다.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    now = now or time.time()
+
+    unused = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name not in keep and os.path.isfile(path):
+            unused.append((os.path.getmtime(path), path))
+    unused.sort(reverse=True)
+
+    removed = 0
+    room = max(0, max_entries - len(keep))
+    for index, (mtime, path) in enumerate(unused):
+        if index >= room or now - mtime > max_age:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def overview_dot(data, topology, views, fmt, direction='TB', splines='ortho'):
+    """계정/리전별로 묶인 VPC 요약 노드와 각 VPC 뷰 링크로 구성된 개요 DOT"""
+    emitter = DotEmitter(direction=direction, splines=splines)
+    internet = emitter.node('internet', 'internet', 'Internet')
+
+    by_scope = {}
+    for name, view, _ in views:
+        vpc = view['vpcs'][0]
+        by_scope.setdefault((vpc.get('AccountId'), vpc.get('Region')), []).append((name, vpc))
+
+    for (account, region), vpcs in sorted(by_scope.items(), key=lambda item: (item[0][0] or '', item[0][1] or '')):
+        if account:
+            emitter.begin_cluster(node_id('account', f"{account}_{region}"), f"{account}\n{region}")
+        for name, vpc in vpcs:
+            vpc_id = vpc['VpcId']
+            vpc_name = get_tag_value(vpc.get('Tags', []), 'Name') or f"VPC-{vpc_id[-8:]}"
+            counts = kind_counts(topology, topology.vpc_subnets.get(vpc_id, []))
+            label = summary_label(f"{safe_label(vpc_name, 20)}\n{vpc['CidrBlock']}", counts)
+            nid = emitter.node(node_id('vpc', name), 'vpc', label, url=f"{name}.{fmt}")
+            if topology.vpc_igws.get(vpc_id):
+                emitter.edge(internet, nid)
+        if account:
+            emitter.end_cluster()
+
+    return emitter.document()
+
+
+def render_views(data, topology, fmt='svg', direction='TB', spacing=1.0, splines='ortho', lod=None,
+                 output_dir=DEFAULT_VIEWS_DIR, cache_dir=DEFAULT_CACHE_DIR, workers=None, reachability=None):
+    """VPC별 뷰와 개요 다이어그램을 병렬 렌더링 -> (개요 경로, 뷰 수, 캐시 적중 수)"""
+    os.makedirs(output_dir, exist_ok=True)
+    views = split_views(data, topology)
+
+    # DOT 생성은 저렴하므로 먼저 모두 만들고, Graphviz 레이아웃만 병렬화
+    jobs = []
+    expected = {output_dir: {'overview'}}
+    for name, view, subnet_types in views:
+        view_topology = TopologyIndex(view, classify=lambda subnet, types=subnet_types: types[subnet['SubnetId']])
+        emitter = DotEmitter(direction=direction, spacing=spacing, splines=splines, lod=lod,
+                             drilldown_dir=os.path.join(output_dir, f"{name}_drilldown"), reachability=reachability,
+                             drilldown_format=fmt)
+        jobs.append((emitter.emit(view, view_topology), os.path.join(output_dir, f"{name}.{fmt}")))
+        expected[output_dir].add(name)
+        for subnet in emitter.drilldowns:
+            os.makedirs(emitter.drilldown_dir, exist_ok=True)
+            jobs.append((emitter.emit_drilldown(subnet, view_topology),
+                         os.path.join(emitter.drilldown_dir, f"{subnet['SubnetId']}.{fmt}")))
+            expected.setdefault(emitter.drilldown_dir, set()).add(subnet['SubnetId'])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        results = list(pool.map(lambda job: render_cached(job[0], job[1], fmt, cache_dir), jobs))
+    hits = sum(1 for _, hit in results if hit)
+
+    overview_text = overview_dot(data, topology, views, fmt, direction, splines)
+    overview, _ = render_cached(overview_text, os.path.join(output_dir, f"overview.{fmt}"), fmt, cache_dir)
+    print(f"   뷰 {len(jobs)}개 중 캐시 적중 {hits}개, 렌더링 {time.perf_counter() - started:.2f}s")
+
+    removed = prune_outputs(output_dir, expected, fmt)
+    if removed:
+        print(f"   이전 실행의 뷰/상세 보기 파일 {removed}개 정리")
+    keep = {cache_name(dot_text, fmt) for dot_text, _ in jobs} | {cache_name(overview_text, fmt)}
+    removed = prune_cache(cache_dir, keep)
+    if removed:
+        print(f"   사용되지 않는 렌더 캐시 {removed}개 정리")
+
+    return overview, len(jobs), hits
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""스트리밍 보고서 파이프라인: 에스테이트 모델 -> (종류, 레코드) 제너레이터 -> 출력 싱크
+
+보고서 전체를 메모리에 만들지 않고 레코드가 생성되는 대로 각 싱크(Text / JSON Lines / CSV / Markdown)에
+바로 쓰므로, 대규모 다중 계정 에스테이트도 일정한 메모리로 파일이나 파이프(stdout)에 출력할 수 있다.
+"""
+import csv
+import json
+from datetime import datetime
+
+from collector import COLLECTORS, get_tag_value
+from model import vpc_key
+from placement import SERVICE_TYPES
+
+# 개요 항목 (수집기 이름, 라벨) - 앞의 7개는 항상, 나머지는 수집된 경우만
+OVERVIEW = (
+    ('vpcs', 'VPCs'), ('subnets', 'Subnets'), ('instances', 'EC2 Instances'),
+    ('rds_instances', 'RDS Instances'), ('load_balancers', 'Load Balancers'),
+    ('igws', 'Internet Gateways'), ('nats', 'NAT Gateways'),
+    ('network_interfaces', 'Network Interfaces'), ('security_groups', 'Security Groups'),
+    ('network_acls', 'Network ACLs'),
+)
+ALWAYS = 7
+
+# 도달성 간선 종류 -> 라벨
+REACHABILITY_LABELS = (
+    (('elb', 'ec2'), 'ELB -> EC2'),
+    (('ec2', 'rds'), 'EC2 -> RDS'),
+    (('ec2', 'nat'), 'EC2 -> Internet (via NAT)'),
+)
+
+# 레코드 종류 -> 보고서 섹션 (섹션이 바뀔 때 싱크에 begin/end 전달)
+SECTIONS = {
+    'count': 'overview', 'service_count': 'overview',
+    'reachability': 'reachability',
+    'partial': 'partial',
+    'scan_error': 'scan_errors',
+    'cidr_overlap': 'overlaps',
+    'vpc': 'vpcs', 'subnet': 'vpcs',
+}
+
+
+def report_records(data, topology, layout, address_space=None, reachability=None, default_region=None):
+    """보고서 레코드를 순서대로 생성 (header -> 개요 -> 도달성 -> 부분 수집 -> 스캔 오류 -> CIDR 중복 -> VPC/서브넷)"""
+    complexity, spacing, direction = layout
+    scope = data.get('scope', {})
+    partial = data.get('partial', {})
+
+    yield 'header', {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'regions': list(scope.get('regions', [default_region])),
+        'accounts': list(scope.get('accounts', [])),
+        'complexity': complexity,
+        'spacing': spacing,
+        'direction': direction,
+    }
+
+    for index, (name, label) in enumerate(OVERVIEW):
+        if index >= ALWAYS and name not in data:
+            continue
+        yield 'count', {'collector': name, 'label': label, 'count': len(data[name]), 'partial': name in partial}
+        if name == 'network_interfaces':
+            for service_type, service_label in SERVICE_TYPES.items():
+                count = sum(1 for service in topology.services if service['ServiceType'] == service_type)
+                if count:
+                    yield 'service_count', {'service_type': service_type, 'label': service_label, 'count': count}
+
+    # SG/NACL/라우트 기준 실제 도달 가능한 연결
+    if reachability is not None and reachability.available:
+        counts = reachability.summary()
+        for (source, target), label in REACHABILITY_LABELS:
+            yield 'reachability', {'source': source, 'target': target, 'label': label, 'count': counts[(source, target)]}
+
+    # 끝까지 수집하지 못한 리소스 타입 (0개와 구분)
+    for name, reason in partial.items():
+        yield 'partial', {'collector': name, 'label': COLLECTORS[name]['label'] if name in COLLECTORS else name,
+                          'reason': reason}
+
+    for error in data.get('scan_errors', []):
+        yield 'scan_error', {'account': error.get('account'), 'region': error.get('region'),
+                             'collector': error.get('collector'), 'error': error['error']}
+
+    # VPC/계정/리전 간 CIDR 중복 (피어링/TGW 연결 불가 대역)
+    for overlap in (address_space or {}).get('overlaps', []):
+        yield 'cidr_overlap', overlap
+
+    for i, vpc in enumerate(data['vpcs'], 1):
+        vpc_id = vpc['VpcId']
+        vpc_subnets = topology.vpc_subnets.get(vpc_id, [])
+        yield 'vpc', {
+            'index': i,
+            'vpc_id': vpc_id,
+            'name': get_tag_value(vpc.get('Tags', []), 'Name') or f"VPC-{i}",
+            'account': vpc.get('AccountId'),
+            'region': vpc.get('Region'),
+            'cidr': vpc['CidrBlock'],
+            'state': vpc['State'],
+            'default': vpc.get('IsDefault', False),
+            'address_space': address_space['vpcs'].get(vpc_key(vpc)) if address_space else None,
+            'subnet_count': len(vpc_subnets),
+        }
+
+        for subnet in vpc_subnets:
+            subnet_id = subnet['SubnetId']
+            resources = topology.resources(subnet_id)
+            yield 'subnet', {
+                'vpc_id': vpc_id,
+                'subnet_id': subnet_id,
+                'name': get_tag_value(subnet.get('Tags', []), 'Name') or subnet_id,
+                'subnet_type': topology.subnet_type(subnet_id),
+                'cidr': subnet['CidrBlock'],
+                'az': subnet['AvailabilityZone'],
+                'available_ips': subnet.get('AvailableIpAddressCount'),
+                'ec2': len(resources['instances']),
+                'rds': len(resources['rds_instances']),
+                'elb': len(resources['load_balancers']),
+                'services': [
+                    {'id': service['ServiceId'], 'type': service['ServiceType'],
+                     'label': SERVICE_TYPES[service['ServiceType']]}
+                    for service in resources['services']
+                ],
+            }
+
+
+def write_report(records, sinks):
+    """레코드를 모든 싱크에 스트리밍 (섹션 경계에서 begin_section / end_section 호출)"""
+    section = None
+    for kind, record in records:
+        current = SECTIONS.get(kind)
+        if current != section:
+            for sink in sinks:
+                if section:
+                    sink.end_section(section)
+                if current:
+                    sink.begin_section(current)
+            section = current
+        for sink in sinks:
+            sink.write(kind, record)
+
+    for sink in sinks:
+        if section:
+            sink.end_section(section)
+        sink.close()
+
+
+class ReportSink:
+    """레코드 종류별 on_<kind> 메서드로 출력하는 싱크 (처리하지 않는 종류는 무시)"""
+
+    label = None
+    extension = None
+    newline = None
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, kind, record):
+        handler = getattr(self, f"on_{kind}", None)
+        if handler is not None:
+            handler(record)
+
+    def begin_section(self, section):
+        pass
+
+    def end_section(self, section):
+        pass
+
+    def close(self):
+        self.stream.flush()
+
+
+class TextSink(ReportSink):
+    """기존 텍스트 보고서 형식"""
+
+    label = '텍스트'
+    extension = 'txt'
+
+    HEADINGS = {
+        'overview': "📊 INFRASTRUCTURE OVERVIEW",
+        'reachability': "🔐 REACHABILITY",
+        'partial': "⚠️ PARTIAL DATA",
+        'scan_errors': "⚠️ SCAN ERRORS",
+        'overlaps': "🧮 CIDR OVERLAPS",
+    }
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self._in_vpc = False
+
+    def begin_section(self, section):
+        if section in self.HEADINGS:
+            self.stream.write(f"{self.HEADINGS[section]}\n")
+            self.stream.write("-" * 30 + "\n")
+
+    def end_section(self, section):
+        self.stream.write("\n")
+
+    def on_header(self, header):
+        f = self.stream
+        f.write("=" * 70 + "\n")
+        f.write("AWS INFRASTRUCTURE ANALYSIS REPORT\n")
+        f.write("=" * 70 + "\n")
+        f.write(f"Generated: {header['generated']}\n")
+        f.write(f"Region: {', '.join(header['regions'])}\n")
+        if header['accounts']:
+            f.write(f"Accounts: {', '.join(header['accounts'])}\n")
+        f.write(f"Layout Complexity: {header['complexity']}\n")
+        f.write(f"Spacing Multiplier: {header['spacing']:.1f}\n")
+        f.write(f"Diagram Direction: {header['direction']}\n\n")
+
+    def on_count(self, count):
+        self.stream.write(f"{count['label']}: {count['count']}{' (PARTIAL)' if count['partial'] else ''}\n")
+
+    def on_service_count(self, count):
+        self.stream.write(f"  {count['label']}: {count['count']}\n")
+
+    def on_reachability(self, edge):
+        self.stream.write(f"{edge['label']}: {edge['count']}\n")
+
+    def on_partial(self, partial):
+        self.stream.write(f"{partial['label']}: {partial['reason']}\n")
+
+    def on_scan_error(self, error):
+        target = f"{error['account'] or 'default'} / {error['region'] or 'all regions'}"
+        if error['collector']:
+            target += f" ({error['collector']})"
+        self.stream.write(f"{target}: {error['error']}\n")
+
+    def on_cidr_overlap(self, overlap):
+        if 'contains' in overlap:
+            self.stream.write(f"{overlap['cidr']} ({', '.join(overlap['vpcs'])}) ⊃ "
+                              f"{overlap['contains']} ({', '.join(overlap['other_vpcs'])})\n")
+        else:
+            self.stream.write(f"{overlap['cidr']}: {', '.join(overlap['vpcs'])}\n")
+
+    def on_vpc(self, vpc):
+        f = self.stream
+        if self._in_vpc:
+            f.write("\n")
+        self._in_vpc = True
+
+        f.write(f"🏢 VPC #{vpc['index']}: {vpc['name']}\n")
+        f.write("-" * 40 + "\n")
+        f.write(f"VPC ID: {vpc['vpc_id']}\n")
+        if vpc['account']:
+            f.write(f"Account / Region: {vpc['account']} / {vpc['region']}\n")
+        f.write(f"CIDR Block: {vpc['cidr']}\n")
+        f.write(f"State: {vpc['state']}\n")
+        f.write(f"Default VPC: {'Yes' if vpc['default'] else 'No'}\n")
+        usage = vpc['address_space']
+        if usage:
+            f.write(f"Address Space: {usage['allocated']}/{usage['total']} allocated to subnets, "
+                    f"{usage['used']} in use\n")
+            largest = f"/{usage['largest_free_prefix']}" if usage['largest_free_prefix'] is not None else "-"
+            f.write(f"Free Space: {usage['free']} in {usage['free_blocks']} blocks "
+                    f"(largest {largest}, fragmentation {usage['fragmentation']:.0%})\n")
+        f.write("\n")
+        f.write(f"  📍 Subnets ({vpc['subnet_count']}):\n")
+
+    def on_subnet(self, subnet):
+        f = self.stream
+        f.write(f"    - {subnet['name']} ({subnet['subnet_type'].upper()})\n")
+        f.write(f"      CIDR: {subnet['cidr']}\n")
+        f.write(f"      AZ: {subnet['az']}\n")
+        f.write(f"      Available IPs: {subnet['available_ips'] if subnet['available_ips'] is not None else 'N/A'}\n")
+        f.write(f"      EC2 Instances: {subnet['ec2']}\n")
+        f.write(f"      RDS Instances: {subnet['rds']}\n")
+        f.write(f"      Load Balancers: {subnet['elb']}\n")
+        if subnet['services']:
+            services = ', '.join(f"{service['id']} ({service['label']})" for service in subnet['services'])
+            f.write(f"      VPC Services: {services}\n")
+        f.write("\n")
+
+
+class JsonLinesSink(ReportSink):
+    """레코드당 한 줄의 JSON ({"type": 종류, ...}) - jq 등으로 바로 처리 가능"""
+
+    label = 'JSON Lines'
+    extension = 'jsonl'
+
+    def write(self, kind, record):
+        self.stream.write(json.dumps({'type': kind, **record}, ensure_ascii=False, default=str))
+        self.stream.write("\n")
+
+
+class CsvSink(ReportSink):
+    """서브넷당 한 행 (VPC 정보 포함) - 스프레드시트/집계용, 다른 레코드는 출력하지 않음"""
+
+    label = 'CSV'
+    extension = 'csv'
+    newline = ''
+    COLUMNS = ('account', 'region', 'vpc_id', 'vpc_name', 'subnet_id', 'name', 'subnet_type', 'cidr', 'az',
+               'available_ips', 'ec2', 'rds', 'elb', 'services')
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.writer = csv.writer(stream)
+        self.writer.writerow(self.COLUMNS)
+        self._vpc = {}
+
+    def on_vpc(self, vpc):
+        self._vpc = vpc
+
+    def on_subnet(self, subnet):
+        self.writer.writerow((
+            self._vpc.get('account') or '', self._vpc.get('region') or '', subnet['vpc_id'],
+            self._vpc.get('name'), subnet['subnet_id'], subnet['name'], subnet['subnet_type'], subnet['cidr'],
+            subnet['az'], '' if subnet['available_ips'] is None else subnet['available_ips'],
+            subnet['ec2'], subnet['rds'], subnet['elb'],
+            ';'.join(f"{service['type']}:{service['id']}" for service in subnet['services']),
+        ))
+
+
+def _cell(value):
+    """Markdown 표 셀 (파이프/줄바꿈 이스케이프)"""
+    return str(value).replace('|', '\\|').replace('\n', ' ')
+
+
+class MarkdownSink(ReportSink):
+    """Markdown 문서 (개요/도달성은 표, VPC별 서브넷 표)"""
+
+    label = 'Markdown'
+    extension = 'md'
+
+    HEADINGS = {
+        'overview': ("## Infrastructure Overview", "| Resource | Count |", "|---|---:|"),
+        'reachability': ("## Reachability", "| Path | Edges |", "|---|---:|"),
+        'partial': ("## ⚠️ Partial Data",),
+        'scan_errors': ("## ⚠️ Scan Errors",),
+        'overlaps': ("## CIDR Overlaps",),
+    }
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self._in_vpc = False
+
+    def begin_section(self, section):
+        if section in self.HEADINGS:
+            heading, *table = self.HEADINGS[section]
+            self.stream.write(f"{heading}\n\n")
+            for line in table:
+                self.stream.write(f"{line}\n")
+
+    def end_section(self, section):
+        self.stream.write("\n")
+
+    def on_header(self, header):
+        f = self.stream
+        f.write("# AWS Infrastructure Analysis Report\n\n")
+        f.write(f"- **Generated**: {header['generated']}\n")
+        f.write(f"- **Region**: {', '.join(header['regions'])}\n")
+        if header['accounts']:
+            f.write(f"- **Accounts**: {', '.join(header['accounts'])}\n")
+        f.write(f"- **Layout**: {header['complexity']} complexity, {header['spacing']:.1f}x spacing, "
+                f"{header['direction']}\n\n")
+
+    def on_count(self, count):
+        self.stream.write(f"| {count['label']}{' (partial)' if count['partial'] else ''} | {count['count']} |\n")
+
+    def on_service_count(self, count):
+        self.stream.write(f"| &nbsp;&nbsp;{count['label']} | {count['count']} |\n")
+
+    def on_reachability(self, edge):
+        self.stream.write(f"| {edge['label']} | {edge['count']} |\n")
+
+    def on_partial(self, partial):
+        self.stream.write(f"- **{partial['label']}**: {partial['reason']}\n")
+
+    def on_scan_error(self, error):
+        target = f"{error['account'] or 'default'} / {error['region'] or 'all regions'}"
+        if error['collector']:
+            target += f" ({error['collector']})"
+        self.stream.write(f"- `{target}`: {error['error']}\n")
+
+    def on_cidr_overlap(self, overlap):
+        line = f"- `{overlap['cidr']}` ({', '.join(overlap['vpcs'])})"
+        if 'contains' in overlap:
+            line += f" contains `{overlap['contains']}` ({', '.join(overlap['other_vpcs'])})"
+        self.stream.write(f"{line}\n")
+
+    def on_vpc(self, vpc):
+        f = self.stream
+        if self._in_vpc:
+            f.write("\n")
+        self._in_vpc = True
+
+        f.write(f"## VPC {vpc['index']}: {_cell(vpc['name'])}\n\n")
+        f.write(f"- **VPC ID**: `{vpc['vpc_id']}`\n")
+        if vpc['account']:
+            f.write(f"- **Account / Region**: {vpc['account']} / {vpc['region']}\n")
+        f.write(f"- **CIDR**: `{vpc['cidr']}` ({vpc['state']}{', default' if vpc['default'] else ''})\n")
+        usage = vpc['address_space']
+        if usage:
+            f.write(f"- **Address Space**: {usage['allocated']}/{usage['total']} allocated, {usage['used']} in use, "
+                    f"{usage['free']} free in {usage['free_blocks']} blocks "
+                    f"(fragmentation {usage['fragmentation']:.0%})\n")
+        f.write("\n")
+        f.write("| Subnet | Type | CIDR | AZ | Available IPs | EC2 | RDS | ELB | VPC Services |\n")
+        f.write("|---|---|---|---|---:|---:|---:|---:|---|\n")
+
+    def on_subnet(self, subnet):
+        services = ', '.join(f"{service['id']} ({service['label']})" for service in subnet['services'])
+        available = subnet['available_ips'] if subnet['available_ips'] is not None else 'N/A'
+        self.stream.write(
+            f"| {_cell(subnet['name'])} | {subnet['subnet_type']} | {subnet['cidr']} | {subnet['az']} | {available} | "
+            f"{subnet['ec2']} | {subnet['rds']} | {subnet['elb']} | {_cell(services)} |\n"
+        )
+
+
+# 형식 이름 -> 싱크
+SINKS = {
+    'text': TextSink,
+    'jsonl': JsonLinesSink,
+    'csv': CsvSink,
+    'md': MarkdownSink,
+}
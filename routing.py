@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""서브넷 -> 유효 라우트 테이블 매핑과 최장 접두사 일치(LPM) 기반 서브넷 분류"""
+import ipaddress
+
+# 인터넷으로 나가지 않는 목적지 대역 (RFC1918, CGNAT, 루프백, 링크 로컬, IPv6 ULA/링크 로컬)
+NON_INTERNET_NETWORKS = tuple(map(ipaddress.ip_network, (
+    '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', '100.64.0.0/10', '127.0.0.0/8', '169.254.0.0/16',
+    'fc00::/7', 'fe80::/10', '::1/128',
+)))
+
+# 라우트 대상 필드 -> 대상 종류
+TARGET_FIELDS = (
+    ('NatGatewayId', 'nat'),
+    ('TransitGatewayId', 'tgw'),
+    ('VpcPeeringConnectionId', 'pcx'),
+    ('EgressOnlyInternetGatewayId', 'eigw'),
+    ('CarrierGatewayId', 'cagw'),
+    ('LocalGatewayId', 'lgw'),
+    ('CoreNetworkArn', 'core'),
+    ('InstanceId', 'instance'),
+    ('NetworkInterfaceId', 'eni'),
+)
+
+GATEWAY_PREFIXES = (
+    ('igw-', 'igw'),
+    ('vgw-', 'vgw'),
+    ('vpce-', 'vpce'),
+)
+
+EGRESS_TARGETS = {'nat', 'eigw', 'instance', 'eni'}
+TRANSIT_TARGETS = {'tgw', 'pcx', 'vgw', 'core', 'lgw'}
+
+
+def covers_internet(destination):
+    """목적지 CIDR에 사설/특수 대역이 아닌 주소가 포함되는지 (0.0.0.0/0, 분할 라우트, 공인 대역)"""
+    network = ipaddress.ip_network(destination, strict=False)
+    return not any(network.version == private.version and network.subnet_of(private)
+                   for private in NON_INTERNET_NETWORKS)
+
+
+def route_target(route):
+    """라우트의 대상 종류 (igw / nat / tgw / pcx / local ...)"""
+    gateway = route.get('GatewayId') or ''
+    if gateway == 'local':
+        return 'local'
+    for prefix, kind in GATEWAY_PREFIXES:
+        if gateway.startswith(prefix):
+            return kind
+    for field, kind in TARGET_FIELDS:
+        if route.get(field):
+            return kind
+    return 'unknown'
+
+
+class RouteTable:
+    """하나의 라우트 테이블에 대한 LPM 구조 (접두사 길이별 해시 테이블)
+
+    관리형 프리픽스 리스트 목적지는 목록 내용을 수집하지 않으므로 주소 조회(LPM)에는 넣지 않고,
+    분류에서는 인터넷 대역을 포함하는 목적지로 본다.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._routes = {4: {}, 6: {}}
+        self._internet_targets = set()
+
+        for route in table.get('Routes', []):
+            if route.get('State') == 'blackhole':
+                continue
+
+            destinations = []
+            if route.get('DestinationCidrBlock'):
+                destinations.append(route['DestinationCidrBlock'])
+            if route.get('DestinationIpv6CidrBlock'):
+                destinations.append(route['DestinationIpv6CidrBlock'])
+
+            if route.get('DestinationPrefixListId') or any(map(covers_internet, destinations)):
+                self._internet_targets.add(route_target(route))
+
+            for destination in destinations:
+                network = ipaddress.ip_network(destination, strict=False)
+                key = int(network.network_address) >> (network.max_prefixlen - network.prefixlen)
+                self._routes[network.version].setdefault(network.prefixlen, {})[key] = route
+
+        # 긴 접두사부터 검사
+        self._lengths = {
+            version: sorted(routes, reverse=True) for version, routes in self._routes.items()
+        }
+
+    def lookup(self, address):
+        """목적지 주소에 대한 최장 접두사 일치 라우트"""
+        ip = ipaddress.ip_address(address)
+        return self._lookup(ip.version, int(ip))
+
+    def _lookup(self, version, value):
+        bits = 32 if version == 4 else 128
+        routes = self._routes[version]
+        for length in self._lengths[version]:
+            route = routes[length].get(value >> (bits - length))
+            if route is not None:
+                return route
+        return None
+
+    def classify(self):
+        """인터넷 대역을 포함하는 목적지의 라우트 대상 종류 기준 서브넷 타입"""
+        internet_targets = self._internet_targets
+        if internet_targets & {'igw', 'cagw'}:
+            return 'public'
+        if internet_targets & EGRESS_TARGETS:
+            return 'private'
+
+        targets = {route_target(route) for route in self.table.get('Routes', [])
+                   if route.get('State') != 'blackhole'}
+        if (internet_targets | targets) & TRANSIT_TARGETS:
+            return 'transit'
+        return 'isolated'
+
+
+class RouteIndex:
+    """서브넷 -> 유효 라우트 테이블 매핑 및 라우트 테이블별 분류 캐시"""
+
+    def __init__(self, route_tables):
+        self.route_tables = route_tables
+        self.subnet_tables = {}
+        self.main_tables = {}
+        self._tables = {}
+        self._types = {}
+
+        for rt in route_tables:
+            for assoc in rt.get('Associations', []):
+                if assoc.get('SubnetId'):
+                    self.subnet_tables.setdefault(assoc['SubnetId'], rt)
+                elif assoc.get('Main', False):
+                    self.main_tables.setdefault(rt['VpcId'], rt)
+
+    def effective_table(self, subnet):
+        """명시적 연결 테이블, 없으면 VPC 메인 라우트 테이블"""
+        return self.subnet_tables.get(subnet['SubnetId']) or self.main_tables.get(subnet['VpcId'])
+
+    def table(self, rt):
+        """라우트 테이블의 LPM 구조 (테이블당 한 번만 생성)"""
+        rt_id = rt['RouteTableId']
+        if rt_id not in self._tables:
+            self._tables[rt_id] = RouteTable(rt)
+        return self._tables[rt_id]
+
+    def lookup(self, subnet, address):
+        """서브넷에서 목적지 주소로 향하는 유효 라우트"""
+        rt = self.effective_table(subnet)
+        return self.table(rt).lookup(address) if rt else None
+
+    def classify(self, subnet):
+        """서브넷 타입 (public / private / transit / isolated / unknown)"""
+        rt = self.effective_table(subnet)
+        if not rt:
+            return 'unknown'
+
+        rt_id = rt['RouteTableId']
+        if rt_id not in self._types:
+            self._types[rt_id] = self.table(rt).classify()
+        return self._types[rt_id]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""수집 결과를 버전이 있는 압축 JSON 스냅샷으로 저장/로드 (리소스 타입별 TTL)"""
+import glob
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from model import Record, from_dicts
+
+SNAPSHOT_FORMAT = 'aws-architecture-snapshot'
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+
+# 리소스 타입별 캐시 유효 시간
+DEFAULT_TTLS = {
+    'vpcs': timedelta(hours=24),
+    'subnets': timedelta(hours=6),
+    'route_tables': timedelta(hours=1),
+    'igws': timedelta(hours=24),
+    'nats': timedelta(hours=6),
+    'instances': timedelta(minutes=15),
+    'rds_instances': timedelta(hours=1),
+    'load_balancers': timedelta(hours=1),
+    'target_groups': timedelta(hours=1),
+    'network_interfaces': timedelta(minutes=15),
+    'security_groups': timedelta(hours=1),
+    'network_acls': timedelta(hours=6),
+}
+
+# 스냅샷 메타데이터 키 (리소스 목록이 아닌 항목)
+META_KEYS = ('scope', 'scan_errors', 'partial')
+
+
+class SnapshotError(Exception):
+    """스냅샷을 읽을 수 없거나 형식이 맞지 않음"""
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(value).__name__}")
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def save_snapshot(data, directory=DEFAULT_SNAPSHOT_DIR, fetched_at=None, path=None):
+    """수집 데이터를 스냅샷 파일로 저장하고 경로 반환"""
+    now = _now()
+    fetched_at = fetched_at or {}
+
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': now.isoformat(),
+        'collections': {
+            name: {
+                'fetched_at': fetched_at.get(name, now).isoformat(),
+                'items': items,
+            }
+            for name, items in data.items() if name not in META_KEYS
+        },
+    }
+    for key in META_KEYS:
+        if key in data:
+            snapshot[key] = data[key]
+
+    if path is None:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"aws_snapshot_{now.strftime('%Y%m%d_%H%M%S_%f')}.json.gz")
+
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump(snapshot, f, default=_json_default, separators=(',', ':'), ensure_ascii=False)
+
+    return path
+
+
+def load_snapshot(path):
+    """스냅샷 파일 로드 -> (수집 데이터, 컬렉션별 수집 시각)"""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"스냅샷 읽기 실패 ({path}): {e}") from e
+
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"스냅샷 형식이 아닙니다: {path}")
+    if snapshot.get('version', 0) > SNAPSHOT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 버전: {snapshot['version']}")
+
+    data = {}
+    fetched_at = {}
+    for name, collection in snapshot['collections'].items():
+        data[name] = from_dicts(name, collection['items'])
+        fetched_at[name] = datetime.fromisoformat(collection['fetched_at'])
+    for key in META_KEYS:
+        if key in snapshot:
+            data[key] = snapshot[key]
+
+    return data, fetched_at
+
+
+def latest_snapshot(directory=DEFAULT_SNAPSHOT_DIR):
+    """디렉터리에서 가장 최근 스냅샷 경로 (없으면 None)"""
+    paths = sorted(glob.glob(os.path.join(directory, 'aws_snapshot_*.json.gz')))
+    return paths[-1] if paths else None
+
+
+def stale_collections(fetched_at, names, ttls=None, now=None, partial=None):
+    """TTL이 지났거나 스냅샷에 없거나 부분 수집된 리소스 타입 목록"""
+    ttls = ttls or DEFAULT_TTLS
+    now = now or _now()
+    partial = partial or {}
+    return [
+        name for name in names
+        if name not in fetched_at or name in partial or now - fetched_at[name] > ttls.get(name, timedelta(0))
+    ]
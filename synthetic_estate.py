@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""벤치마크용 합성 AWS 에스테이트 생성기와 botocore 응답 주입기"""
+import ipaddress
+import random
+import time
+from datetime import datetime, timezone
+
+from botocore.awsrequest import AWSResponse
+
+# 오퍼레이션 -> (응답 키, 요청 토큰, 응답 토큰, 페이지 크기 파라미터)
+OPERATIONS = {
+    'DescribeVpcs': ('Vpcs', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeSubnets': ('Subnets', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeRouteTables': ('RouteTables', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeInternetGateways': ('InternetGateways', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeNatGateways': ('NatGateways', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeInstances': ('Reservations', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeDBInstances': ('DBInstances', 'Marker', 'Marker', 'MaxRecords'),
+    'DescribeLoadBalancers': ('LoadBalancers', 'Marker', 'NextMarker', 'PageSize'),
+    'DescribeTargetGroups': ('TargetGroups', 'Marker', 'NextMarker', 'PageSize'),
+    'DescribeNetworkInterfaces': ('NetworkInterfaces', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeSecurityGroups': ('SecurityGroups', 'NextToken', 'NextToken', 'MaxResults'),
+    'DescribeNetworkAcls': ('NetworkAcls', 'NextToken', 'NextToken', 'MaxResults'),
+}
+
+# 규모별 프리셋 (리소스 수 = EC2 + RDS + ELB)
+SCALES = {
+    '10': {'vpcs': 1, 'subnets_per_vpc': 3, 'instances': 6, 'rds': 2, 'elbs': 2},
+    '1k': {'vpcs': 10, 'subnets_per_vpc': 6, 'instances': 900, 'rds': 60, 'elbs': 40},
+    '100k': {'vpcs': 200, 'subnets_per_vpc': 30, 'instances': 95000, 'rds': 3000, 'elbs': 2000},
+}
+
+INSTANCE_TYPES = ('t3.micro', 't3.large', 'm5.large', 'm5.xlarge', 'c5.2xlarge', 'r5.large')
+ENGINES = ('mysql', 'postgres', 'aurora-mysql', 'aurora-postgresql')
+AZ_SUFFIXES = ('a', 'b', 'c')
+
+# 보안 그룹 (VPC마다): 앱 SG 50개(인스턴스 i는 i % 50), ELB SG, DB SG
+APP_GROUPS = 50
+ALL_TRAFFIC = {'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}
+
+# 서브넷마다 AWS가 예약하는 주소 (앞 4개 + 브로드캐스트)
+RESERVED_HEAD = 4
+RESERVED_ADDRESSES = 5
+
+
+def app_group(v, k):
+    return f"sg-{v:08x}{k:09x}"
+
+
+def elb_group(v):
+    return f"sg-e1b{v:014x}"
+
+
+def db_group(v):
+    return f"sg-db{v:015x}"
+
+
+class AddressPool:
+    """서브넷 CIDR에서 예약 주소를 건너뛰고 순서대로 사설 IP 할당 (가득 차면 처음부터 재사용)"""
+
+    def __init__(self):
+        self.networks = {}
+        self.allocated = {}
+
+    def allocate(self, subnet):
+        subnet_id = subnet['SubnetId']
+        network = self.networks.get(subnet_id)
+        if network is None:
+            network = self.networks[subnet_id] = ipaddress.ip_network(subnet['CidrBlock'])
+        used = self.allocated.get(subnet_id, 0)
+        self.allocated[subnet_id] = used + 1
+        return str(network.network_address + RESERVED_HEAD + used % (network.num_addresses - RESERVED_ADDRESSES))
+
+    def available(self, subnet):
+        """AvailableIpAddressCount (전체 - 예약 - 할당)"""
+        network = ipaddress.ip_network(subnet['CidrBlock'])
+        return max(0, network.num_addresses - RESERVED_ADDRESSES - self.allocated.get(subnet['SubnetId'], 0))
+
+
+def _interface(index, subnet, address, interface_type='interface', description='', requester=None):
+    eni = {
+        'NetworkInterfaceId': f"eni-{index:017x}", 'InterfaceType': interface_type, 'Status': 'in-use',
+        'SubnetId': subnet['SubnetId'], 'VpcId': subnet['VpcId'], 'AvailabilityZone': subnet['AvailabilityZone'],
+        'PrivateIpAddress': address, 'Description': description, 'Groups': [],
+    }
+    if requester:
+        eni['RequesterId'] = requester
+    return eni
+
+
+def _security_groups(v, vpc_id):
+    """ELB(443 공개) -> 앱 SG(8080, 5개 중 4개) -> DB SG(3306, 짝수 앱 SG) 구성"""
+    def tcp(port, groups=(), cidrs=()):
+        return {'IpProtocol': 'tcp', 'FromPort': port, 'ToPort': port,
+                'UserIdGroupPairs': [{'GroupId': group} for group in groups],
+                'IpRanges': [{'CidrIp': cidr} for cidr in cidrs]}
+
+    groups = [{'GroupId': elb_group(v), 'GroupName': 'bench-elb', 'VpcId': vpc_id,
+               'IpPermissions': [tcp(443, cidrs=['0.0.0.0/0'])], 'IpPermissionsEgress': [ALL_TRAFFIC]}]
+    for k in range(APP_GROUPS):
+        ingress = [tcp(22, cidrs=['10.0.0.0/8'])]
+        if k % 5 != 4:
+            ingress.append(tcp(8080, groups=[elb_group(v)]))
+        groups.append({'GroupId': app_group(v, k), 'GroupName': f"bench-app-{k}", 'VpcId': vpc_id,
+                       'IpPermissions': ingress, 'IpPermissionsEgress': [ALL_TRAFFIC]})
+    groups.append({'GroupId': db_group(v), 'GroupName': 'bench-db', 'VpcId': vpc_id,
+                   'IpPermissions': [tcp(3306, groups=[app_group(v, k) for k in range(0, APP_GROUPS, 2)])],
+                   'IpPermissionsEgress': []})
+    return groups
+
+
+def generate_estate(vpcs=1, subnets_per_vpc=3, instances=6, rds=2, elbs=2, nats_per_vpc=1, lambdas=None,
+                    region='ap-northeast-2', seed=0):
+    """describe API 응답 형태의 합성 에스테이트 (오퍼레이션 -> 항목 목록)"""
+    rng = random.Random(seed)
+    launch_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    estate = {operation: [] for operation in OPERATIONS}
+    subnets = []
+    vpc_numbers = {}
+    addresses = AddressPool()
+
+    for v in range(vpcs):
+        vpc_id = f"vpc-{v:017x}"
+        igw_id = f"igw-{v:017x}"
+        nat_ids = [f"nat-{v:09x}{n:08x}" for n in range(nats_per_vpc)]
+        vpc_numbers[vpc_id] = v
+
+        estate['DescribeVpcs'].append({
+            'VpcId': vpc_id, 'CidrBlock': f"10.{v % 256}.0.0/16", 'State': 'available',
+            'IsDefault': False, 'OwnerId': '123456789012',
+            'CidrBlockAssociationSet': [{'CidrBlock': f"10.{v % 256}.0.0/16"}],
+            'Tags': [{'Key': 'Name', 'Value': f"bench-vpc-{v}"}],
+        })
+        estate['DescribeInternetGateways'].append({
+            'InternetGatewayId': igw_id,
+            'Attachments': [{'VpcId': vpc_id, 'State': 'available'}],
+        })
+
+        local = {'DestinationCidrBlock': f"10.{v % 256}.0.0/16", 'GatewayId': 'local', 'State': 'active'}
+        tables = {
+            'main': {'RouteTableId': f"rtb-{v:09x}00000000", 'VpcId': vpc_id,
+                     'Associations': [{'Main': True}], 'Routes': [local]},
+            'public': {'RouteTableId': f"rtb-{v:09x}00000001", 'VpcId': vpc_id, 'Associations': [],
+                       'Routes': [local, {'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': igw_id,
+                                          'State': 'active'}]},
+            'private': {'RouteTableId': f"rtb-{v:09x}00000002", 'VpcId': vpc_id, 'Associations': [],
+                        'Routes': [local, {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': nat_ids[0],
+                                           'State': 'active'}] if nat_ids else [local]},
+        }
+
+        for s in range(subnets_per_vpc):
+            subnet_id = f"subnet-{v:09x}{s:08x}"
+            az = f"{region}{AZ_SUFFIXES[s % len(AZ_SUFFIXES)]}"
+            subnet = {
+                'SubnetId': subnet_id, 'VpcId': vpc_id, 'AvailabilityZone': az,
+                'CidrBlock': f"10.{v % 256}.{s % 256}.0/24",
+                'Tags': [{'Key': 'Name', 'Value': f"bench-{v}-{s}"}],
+            }
+            subnets.append(subnet)
+            estate['DescribeSubnets'].append(subnet)
+
+            kind = ('public', 'private', 'main')[s % 3]
+            if kind != 'main':
+                tables[kind]['Associations'].append({'SubnetId': subnet_id, 'RouteTableId': tables[kind]['RouteTableId']})
+            if kind == 'public' and s // 3 < len(nat_ids):
+                estate['DescribeNatGateways'].append({
+                    'NatGatewayId': nat_ids[s // 3], 'SubnetId': subnet_id, 'VpcId': vpc_id, 'State': 'available',
+                })
+                estate['DescribeNetworkInterfaces'].append(_interface(
+                    len(estate['DescribeNetworkInterfaces']), subnet, addresses.allocate(subnet), 'nat_gateway',
+                    f"Interface for NAT Gateway {nat_ids[s // 3]}"))
+
+        estate['DescribeRouteTables'].extend(tables.values())
+        estate['DescribeNetworkAcls'].append({
+            'NetworkAclId': f"acl-{v:017x}", 'VpcId': vpc_id, 'IsDefault': True,
+            'Entries': [
+                {'RuleNumber': 100, 'Protocol': '-1', 'RuleAction': 'allow', 'Egress': egress,
+                 'CidrBlock': '0.0.0.0/0'}
+                for egress in (False, True)
+            ],
+            'Associations': [{'SubnetId': subnet['SubnetId']} for subnet in subnets if subnet['VpcId'] == vpc_id],
+        })
+        estate['DescribeSecurityGroups'].extend(_security_groups(v, vpc_id))
+
+    for i in range(instances):
+        subnet = rng.choice(subnets)
+        estate['DescribeInstances'].append({'Instances': [{
+            'InstanceId': f"i-{i:017x}",
+            'InstanceType': rng.choice(INSTANCE_TYPES),
+            'State': {'Name': 'running' if rng.random() < 0.95 else 'stopped'},
+            'SubnetId': subnet['SubnetId'], 'VpcId': subnet['VpcId'],
+            'PrivateIpAddress': addresses.allocate(subnet),
+            'Placement': {'AvailabilityZone': subnet['AvailabilityZone']},
+            'SecurityGroups': [{'GroupId': app_group(vpc_numbers[subnet['VpcId']], i % APP_GROUPS)}],
+            'LaunchTime': launch_time,
+            'Tags': [{'Key': 'Name', 'Value': f"bench-{i}"},
+                     {'Key': 'aws:autoscaling:groupName', 'Value': f"asg-{i % 20}"}],
+        }]})
+
+    by_vpc = {}
+    for subnet in subnets:
+        by_vpc.setdefault(subnet['VpcId'], []).append(subnet)
+
+    enis = estate['DescribeNetworkInterfaces']
+    for r in range(rds):
+        group = by_vpc[rng.choice(list(by_vpc))]
+        enis.append(_interface(len(enis), group[0], addresses.allocate(group[0]), description='RDSNetworkInterface',
+                               requester='amazon-rds'))
+        estate['DescribeDBInstances'].append({
+            'DBInstanceIdentifier': f"bench-db-{r}", 'DBInstanceClass': 'db.r5.large',
+            'Engine': rng.choice(ENGINES), 'EngineVersion': '8.0', 'DBInstanceStatus': 'available',
+            'AvailabilityZone': group[0]['AvailabilityZone'], 'MultiAZ': False,
+            'DBSubnetGroup': {'VpcId': group[0]['VpcId'],
+                              'Subnets': [{'SubnetIdentifier': s['SubnetId']} for s in group[:2]]},
+            'Endpoint': {'Address': f"bench-db-{r}.example.internal", 'Port': 3306},
+            'AllocatedStorage': 100,
+            'VpcSecurityGroups': [{'VpcSecurityGroupId': db_group(vpc_numbers[group[0]['VpcId']]), 'Status': 'active'}],
+        })
+
+    for e in range(elbs):
+        group = by_vpc[rng.choice(list(by_vpc))]
+        estate['DescribeLoadBalancers'].append({
+            'LoadBalancerName': f"bench-lb-{e}",
+            'LoadBalancerArn': f"arn:aws:elasticloadbalancing:{region}:123456789012:loadbalancer/app/bench-lb-{e}/{e:016x}",
+            'Type': 'application', 'Scheme': 'internet-facing', 'State': {'Code': 'active'},
+            'VpcId': group[0]['VpcId'],
+            'AvailabilityZones': [{'SubnetId': s['SubnetId'], 'ZoneName': s['AvailabilityZone']} for s in group[:2]],
+            'DNSName': f"bench-lb-{e}.example.com", 'CreatedTime': launch_time,
+            'SecurityGroups': [elb_group(vpc_numbers[group[0]['VpcId']])],
+        })
+        estate['DescribeTargetGroups'].append({
+            'TargetGroupArn': f"arn:aws:elasticloadbalancing:{region}:123456789012:targetgroup/bench-tg-{e}/{e:016x}",
+            'TargetGroupName': f"bench-tg-{e}", 'Protocol': 'HTTP', 'Port': 8080, 'TargetType': 'instance',
+            'VpcId': group[0]['VpcId'], 'LoadBalancerArns': [estate['DescribeLoadBalancers'][-1]['LoadBalancerArn']],
+        })
+        for subnet in group[:2]:
+            enis.append(_interface(len(enis), subnet, addresses.allocate(subnet),
+                                   description=f"ELB app/bench-lb-{e}/{e:016x}"))
+
+    # Lambda 함수당 서브넷 2개에 Hyperplane ENI
+    for f in range(elbs if lambdas is None else lambdas):
+        group = by_vpc[rng.choice(list(by_vpc))]
+        for subnet in group[:2]:
+            enis.append(_interface(len(enis), subnet, addresses.allocate(subnet), 'lambda',
+                                   f"AWS Lambda VPC ENI-bench-fn-{f}-{f:08x}-0000-0000-0000-000000000000"))
+
+    for subnet in subnets:
+        subnet['AvailableIpAddressCount'] = addresses.available(subnet)
+
+    return estate
+
+
+class SyntheticResponder:
+    """botocore before-call 훅으로 합성 에스테이트를 페이지 단위로 응답
+
+    Stubber는 응답 큐가 호출 순서에 묶여 있어 병렬 수집과 맞지 않으므로,
+    오퍼레이션과 페이지 토큰으로 응답을 결정하는 상태 없는 훅을 사용한다.
+    """
+
+    def __init__(self, estate, latency=0.0):
+        self.estate = estate
+        self.latency = latency
+        self.calls = 0
+
+    def attach(self, client):
+        client.meta.events.register('before-call.*.*', self, unique_id='synthetic-estate')
+
+    def __call__(self, model, params, **kwargs):
+        result_key, token_in, token_out, size_param = OPERATIONS[model.name]
+        body = params.get('body') or {}
+        start = int(body.get(token_in) or 0)
+        size = int(body.get(size_param) or 1000)
+        items = self.estate[model.name]
+
+        response = {result_key: items[start:start + size], 'ResponseMetadata': {'HTTPStatusCode': 200}}
+        if start + size < len(items):
+            response[token_out] = str(start + size)
+
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return AWSResponse(None, 200, {}, None), response
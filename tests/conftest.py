@@ -0,0 +1,77 @@
+"""테스트에서 저장소 최상위 모듈을 import할 수 있도록 경로 추가 + 공용 소규모 에스테이트"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import from_dicts  # noqa: E402
+
+
+@pytest.fixture
+def small_estate():
+    """VPC 1개, AZ 2개 x (퍼블릭 + 프라이빗) 서브넷, EC2 3대, RDS 2개(단일 AZ / Multi-AZ), ALB, NAT"""
+    def subnet(subnet_id, az, cidr, name):
+        return {'SubnetId': subnet_id, 'VpcId': 'vpc-1', 'AvailabilityZone': f"ap-northeast-2{az}",
+                'CidrBlock': cidr, 'Tags': [{'Key': 'Name', 'Value': name}]}
+
+    def instance(instance_id, subnet_id, ip, groups=('sg-app',)):
+        return {'InstanceId': instance_id, 'InstanceType': 't3.micro', 'State': 'running', 'SubnetId': subnet_id,
+                'VpcId': 'vpc-1', 'PrivateIpAddress': ip, 'SecurityGroups': groups}
+
+    def db(identifier, az, secondary=None):
+        return {'DBInstanceIdentifier': identifier, 'Engine': 'postgres', 'DBInstanceStatus': 'available',
+                'VpcId': 'vpc-1', 'AvailabilityZone': f"ap-northeast-2{az}", 'Port': 5432,
+                'SecondaryAvailabilityZone': secondary and f"ap-northeast-2{secondary}",
+                'SubnetIds': ('subnet-app-a', 'subnet-app-b'), 'SecurityGroups': ('sg-db',)}
+
+    local = {'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local'}
+    all_out = [{'IpProtocol': '-1', 'CidrBlocks': ('0.0.0.0/0',)}]
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available',
+                  'Tags': [{'Key': 'Name', 'Value': 'main'}]}],
+        'subnets': [
+            subnet('subnet-pub-a', 'a', '10.0.0.0/24', 'public-a'),
+            subnet('subnet-pub-b', 'b', '10.0.1.0/24', 'public-b'),
+            subnet('subnet-app-a', 'a', '10.0.10.0/24', 'app-a'),
+            subnet('subnet-app-b', 'b', '10.0.11.0/24', 'app-b'),
+        ],
+        'route_tables': [
+            {'RouteTableId': 'rtb-pub', 'VpcId': 'vpc-1',
+             'Associations': [{'SubnetId': 'subnet-pub-a'}, {'SubnetId': 'subnet-pub-b'}],
+             'Routes': [local, {'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}]},
+            {'RouteTableId': 'rtb-app', 'VpcId': 'vpc-1', 'Associations': [{'Main': True}],
+             'Routes': [local, {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1'}]},
+        ],
+        'igws': [{'InternetGatewayId': 'igw-1', 'Attachments': [{'VpcId': 'vpc-1', 'State': 'available'}]}],
+        'nats': [{'NatGatewayId': 'nat-1', 'SubnetId': 'subnet-pub-a', 'VpcId': 'vpc-1', 'State': 'available'}],
+        'instances': [
+            instance('i-1', 'subnet-app-a', '10.0.10.10'),
+            instance('i-2', 'subnet-app-b', '10.0.11.10'),
+            instance('i-3', 'subnet-pub-a', '10.0.0.10', groups=('sg-bastion',)),
+        ],
+        'rds_instances': [db('db-single', 'a'), db('db-multi', 'a', secondary='b')],
+        'load_balancers': [{
+            'LoadBalancerName': 'web', 'Type': 'application', 'Scheme': 'internet-facing', 'VpcId': 'vpc-1',
+            'LoadBalancerArn': 'arn:aws:elasticloadbalancing:ap-northeast-2:111111111111:loadbalancer/app/web/1',
+            'SubnetIds': ('subnet-pub-a', 'subnet-pub-b'), 'SecurityGroups': ('sg-elb',),
+        }],
+        'target_groups': [{
+            'TargetGroupArn': 'arn:tg/web', 'Protocol': 'HTTP', 'Port': 8080, 'TargetType': 'instance',
+            'VpcId': 'vpc-1',
+            'LoadBalancerArns': ('arn:aws:elasticloadbalancing:ap-northeast-2:111111111111:loadbalancer/app/web/1',),
+        }],
+        'network_interfaces': [],
+        'security_groups': [
+            {'GroupId': 'sg-elb', 'VpcId': 'vpc-1', 'EgressRules': all_out,
+             'IngressRules': [{'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443, 'CidrBlocks': ('0.0.0.0/0',)}]},
+            {'GroupId': 'sg-app', 'VpcId': 'vpc-1', 'EgressRules': all_out,
+             'IngressRules': [{'IpProtocol': 'tcp', 'FromPort': 8080, 'ToPort': 8080, 'GroupIds': ('sg-elb',)}]},
+            {'GroupId': 'sg-bastion', 'VpcId': 'vpc-1', 'EgressRules': all_out, 'IngressRules': []},
+            {'GroupId': 'sg-db', 'VpcId': 'vpc-1', 'EgressRules': [],
+             'IngressRules': [{'IpProtocol': 'tcp', 'FromPort': 5432, 'ToPort': 5432, 'GroupIds': ('sg-app',)}]},
+        ],
+        'network_acls': [],
+    }
+    return {name: from_dicts(name, items) for name, items in data.items()}
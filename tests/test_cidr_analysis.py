@@ -0,0 +1,75 @@
+"""CIDR 중복 대역과 VPC 주소 사용률/단편화"""
+from cidr_analysis import analyze_address_space, find_overlaps, free_intervals, interval_arrays, parse_cidr
+from model import from_dicts
+
+
+def _rows(*cidrs):
+    """(CIDR, 소유 VPC 번호) -> find_overlaps/interval_arrays 입력 행"""
+    rows = []
+    for cidr, owner in cidrs:
+        _, start, length = parse_cidr(cidr)
+        rows.append((start, length, owner))
+    return rows
+
+
+def _address(cidr):
+    return parse_cidr(cidr)[1]
+
+
+def test_shared_cidr_is_reported_once_with_all_vpcs():
+    rows = _rows(('172.31.0.0/16', 0), ('172.31.0.0/16', 1), ('172.31.0.0/16', 2), ('10.0.0.0/16', 3))
+
+    assert find_overlaps(rows, 4, ['vpc-a', 'vpc-b', 'vpc-c', 'vpc-d']) == [
+        {'cidr': '172.31.0.0/16', 'vpcs': ['vpc-a', 'vpc-b', 'vpc-c']}]
+
+
+def test_containment_between_vpcs():
+    rows = _rows(('10.0.0.0/8', 0), ('10.1.0.0/16', 1), ('192.168.0.0/16', 2))
+
+    assert find_overlaps(rows, 4, ['vpc-a', 'vpc-b', 'vpc-c']) == [
+        {'cidr': '10.0.0.0/8', 'vpcs': ['vpc-a'], 'contains': '10.1.0.0/16', 'other_vpcs': ['vpc-b']}]
+
+
+def test_secondary_blocks_of_one_vpc_do_not_overlap_themselves():
+    rows = _rows(('10.0.0.0/16', 0), ('10.1.0.0/16', 0), ('10.2.0.0/16', 1))
+
+    assert find_overlaps(rows, 4, ['vpc-a', 'vpc-b']) == []
+
+
+def test_ipv6_overlap():
+    rows = _rows(('2600:1f18:1234:5600::/56', 0), ('2600:1f18:1234:5600::/56', 1))
+
+    assert find_overlaps(rows, 6, ['vpc-a', 'vpc-b']) == [
+        {'cidr': '2600:1f18:1234:5600::/56', 'vpcs': ['vpc-a', 'vpc-b']}]
+
+
+def test_free_intervals_between_subnets():
+    vpc_blocks = interval_arrays(_rows(('10.0.0.0/24', 0), ('10.9.0.0/24', 1)), 32)
+    subnet_blocks = interval_arrays(_rows(('10.0.0.128/26', 0), ('10.0.0.0/26', 0)), 32)
+
+    owners, starts, ends = free_intervals(vpc_blocks, subnet_blocks)
+
+    base = _address('10.0.0.0/24')
+    assert list(zip(owners.tolist(), (starts - base).tolist(), (ends - base).tolist())) == [
+        (0, 64, 128), (0, 192, 256), (1, _address('10.9.0.0/24') - base, _address('10.9.1.0/24') - base)]
+
+
+def test_utilization_and_fragmentation():
+    data = {
+        'vpcs': from_dicts('vpcs', [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/24'},
+                                    {'VpcId': 'vpc-2', 'CidrBlock': '10.0.0.0/24'}]),
+        'subnets': from_dicts('subnets', [
+            {'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/26', 'AvailableIpAddressCount': 50},
+            {'SubnetId': 'subnet-2', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.128/26', 'AvailableIpAddressCount': 59},
+        ]),
+    }
+
+    result = analyze_address_space(data)
+
+    assert result['overlaps'] == [{'cidr': '10.0.0.0/24', 'vpcs': ['vpc-1', 'vpc-2']}]
+    assert result['vpcs']['vpc-1'] == {
+        'total': 256, 'allocated': 128, 'used': 128 - 10 - 109, 'free': 128, 'free_blocks': 2,
+        'largest_free_prefix': 26, 'fragmentation': 0.5,
+    }
+    assert result['vpcs']['vpc-2']['largest_free_prefix'] == 24
+    assert result['vpcs']['vpc-2']['fragmentation'] == 0.0
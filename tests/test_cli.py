@@ -0,0 +1,45 @@
+"""CLI 옵션: 범위 필터(--regions)와 팬아웃 스캔 대상(--scan-regions) 분리"""
+import pytest
+
+from cli import build_parser, main, make_mapper, scope_filters
+
+
+def _parse(*argv):
+    return build_parser().parse_args(list(argv))
+
+
+def test_regions_only_filters_and_never_triggers_fan_out():
+    args = _parse('query', '--offline', '--regions', 'us-east-1,eu-west-1')
+    mapper = make_mapper(args)
+
+    assert scope_filters(args) == {'vpc_ids': [], 'tags': {}, 'regions': ['us-east-1', 'eu-west-1']}
+    assert mapper.regions is None
+    assert mapper.filters['regions'] == ['us-east-1', 'eu-west-1']
+
+
+def test_scan_regions_selects_fan_out_targets_without_filtering():
+    args = _parse('run', '--scan-regions', 'all')
+    mapper = make_mapper(args)
+
+    assert mapper.regions == ['all']
+    assert scope_filters(args) is None
+    assert make_mapper(_parse('collect', '--scan-regions', 'us-east-1')).regions == ['us-east-1']
+
+
+def test_diff_uses_the_shared_region_filter():
+    args = _parse('diff', '--regions', 'us-east-1', '--vpc', 'vpc-1,vpc-2')
+
+    assert scope_filters(args) == {'vpc_ids': ['vpc-1', 'vpc-2'], 'tags': {}, 'regions': ['us-east-1']}
+
+
+def test_lod_is_rejected_for_the_diagrams_backend():
+    args = _parse('run', '--backend', 'diagrams', '--splines', 'curved', '--lod-threshold', '5')
+
+    with pytest.raises(ValueError):
+        make_mapper(args)
+    with pytest.raises(SystemExit):
+        main(['run', '--backend', 'diagrams', '--lod-threshold', '5'])
+
+    mapper = make_mapper(_parse('run', '--backend', 'diagrams', '--splines', 'curved'))
+    assert (mapper.backend, mapper.splines, mapper.lod) == ('diagrams', 'curved', None)
+    assert make_mapper(_parse('run', '--backend', 'diagrams', '--per-vpc', '--lod-threshold', '5')).lod
@@ -0,0 +1,116 @@
+"""수집 엔진: 페이지네이션, 스로틀 후 이어받기, 수집기 오류의 partial 처리"""
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+
+import collector
+from collector import CollectionEngine
+from synthetic_estate import SyntheticResponder, generate_estate
+
+
+class FlakyResponder(SyntheticResponder):
+    """요청 토큰을 기록하고, 지정한 (오퍼레이션, 호출 순번)에서 오류로 응답"""
+
+    def __init__(self, estate, failures=None):
+        super().__init__(estate)
+        self.failures = dict(failures or {})
+        self.requests = []
+
+    def __call__(self, model, params, **kwargs):
+        body = params.get('body') or {}
+        self.requests.append((model.name, body.get('NextToken') or body.get('Marker')))
+        seen = sum(1 for name, _ in self.requests if name == model.name)
+        code = self.failures.get((model.name, seen))
+        if code:
+            return AWSResponse(None, 400, {}, None), {
+                'Error': {'Code': code, 'Message': code}, 'ResponseMetadata': {'HTTPStatusCode': 400},
+            }
+        return super().__call__(model, params, **kwargs)
+
+    def tokens(self, operation):
+        return [token for name, token in self.requests if name == operation]
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(collector, 'backoff', lambda attempt: 0)
+
+
+def _engine(responder, page_sizes=None, monkeypatch=None):
+    if page_sizes:
+        for name, size in page_sizes.items():
+            monkeypatch.setitem(collector.COLLECTORS, name, dict(collector.COLLECTORS[name], page_size=size))
+    session = boto3.session.Session(aws_access_key_id='x', aws_secret_access_key='x')
+    return CollectionEngine(session=session, client_hooks=[responder.attach])
+
+
+def test_iter_pages_follows_tokens_across_pages(monkeypatch):
+    responder = FlakyResponder(generate_estate(vpcs=1, subnets_per_vpc=12))
+    engine = _engine(responder, {'subnets': 5}, monkeypatch)
+
+    pages = list(engine.iter_pages('subnets'))
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert [subnet.SubnetId for page in pages for subnet in page] == [
+        subnet['SubnetId'] for subnet in responder.estate['DescribeSubnets']]
+    assert responder.tokens('DescribeSubnets') == [None, '5', '10']
+
+
+def test_elbv2_marker_pagination(monkeypatch):
+    responder = FlakyResponder(generate_estate(vpcs=2, elbs=5))
+    engine = _engine(responder, {'load_balancers': 2}, monkeypatch)
+
+    names = [lb.LoadBalancerName for page in engine.iter_pages('load_balancers') for lb in page]
+
+    assert names == [f"bench-lb-{e}" for e in range(5)]
+    assert responder.tokens('DescribeLoadBalancers') == [None, '2', '4']
+
+
+def test_throttle_resumes_from_last_page_token(monkeypatch, no_backoff):
+    responder = FlakyResponder(generate_estate(vpcs=1, subnets_per_vpc=12),
+                               failures={('DescribeSubnets', 2): 'RequestLimitExceeded'})
+    engine = _engine(responder, {'subnets': 5}, monkeypatch)
+
+    pages = list(engine.iter_pages('subnets'))
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    # 실패한 두 번째 페이지를 처음부터가 아니라 받은 토큰부터 다시 요청
+    assert responder.tokens('DescribeSubnets') == [None, '5', '5', '10']
+
+
+def test_non_throttle_error_is_raised_without_retry(monkeypatch, no_backoff):
+    responder = FlakyResponder(generate_estate(), failures={('DescribeVpcs', 1): 'UnauthorizedOperation'})
+    engine = _engine(responder)
+
+    with pytest.raises(Exception, match='UnauthorizedOperation'):
+        list(engine.iter_pages('vpcs'))
+    assert responder.tokens('DescribeVpcs') == [None]
+
+
+def test_collect_records_collector_errors_as_partial(monkeypatch, no_backoff):
+    responder = FlakyResponder(generate_estate(vpcs=1, subnets_per_vpc=12),
+                               failures={('DescribeSubnets', 2): 'UnauthorizedOperation'})
+    engine = _engine(responder, {'subnets': 5}, monkeypatch)
+    pages = []
+
+    data = engine.collect(['vpcs', 'subnets', 'instances'], on_page=lambda name, items: pages.append(name))
+
+    assert len(data['vpcs']) == 1
+    assert len(data['instances']) == 6
+    # 실패 전까지 받은 페이지는 유지
+    assert len(data['subnets']) == 5
+    assert set(engine.errors) == {'subnets'}
+    assert 'UnauthorizedOperation' in engine.partial()['subnets']
+    assert pages.count('subnets') == 1
+
+
+def test_collect_resets_errors_between_runs(monkeypatch, no_backoff):
+    responder = FlakyResponder(generate_estate(), failures={('DescribeVpcs', 1): 'UnauthorizedOperation'})
+    engine = _engine(responder)
+
+    engine.collect(['vpcs'])
+    assert set(engine.partial()) == {'vpcs'}
+
+    data = engine.collect(['vpcs'])
+    assert engine.partial() == {}
+    assert len(data['vpcs']) == 1
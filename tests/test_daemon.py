@@ -0,0 +1,117 @@
+"""데몬 조회 API: dispatch 라우팅과 세대별 응답 캐시"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import daemon
+from daemon import ApiError, EstateDaemon, EstateState
+from model import from_dicts
+from queries import resource_index
+from reachability import ReachabilityIndex
+from routing import RouteIndex
+from topology import TopologyIndex
+
+
+def _daemon():
+    """VPC 2개, 서브넷 1개, EC2 1대가 로드된 데몬"""
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available'},
+                 {'VpcId': 'vpc-2', 'CidrBlock': '10.1.0.0/16', 'State': 'available'}],
+        'subnets': [{'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/24',
+                     'AvailabilityZone': 'ap-northeast-2a'}],
+        'instances': [{'InstanceId': 'i-1', 'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'InstanceType': 't3.micro',
+                       'State': 'running'}],
+        'route_tables': [], 'igws': [], 'nats': [], 'rds_instances': [], 'load_balancers': [],
+        'network_interfaces': [],
+    }
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    topology = TopologyIndex(data, classify=lambda subnet: 'private')
+
+    estate_daemon = EstateDaemon(SimpleNamespace(splines='ortho', lod=None))
+    estate_daemon.state = EstateState(
+        data=data, topology=topology, reachability=None, layout=('small', 1.0, 'TB'),
+        resources=resource_index(topology), generation=1, loaded_at=datetime.now(timezone.utc),
+    )
+    return estate_daemon
+
+
+def _get(estate_daemon, target):
+    return asyncio.run(estate_daemon.dispatch('GET', target))
+
+
+def test_json_queries():
+    estate_daemon = _daemon()
+
+    status, _, body = _get(estate_daemon, '/subnets/subnet-1/type')
+    assert status == 200
+    assert b'"subnet_type": "private"' in body
+    with pytest.raises(ApiError) as error:
+        _get(estate_daemon, '/subnets/subnet-x')
+    assert error.value.status == 404
+
+
+def test_not_ready_and_bad_method():
+    estate_daemon = _daemon()
+
+    with pytest.raises(ApiError) as error:
+        _get(estate_daemon, '/diagram?format=gif')
+    assert error.value.status == 400
+    with pytest.raises(ApiError) as error:
+        asyncio.run(estate_daemon.dispatch('DELETE', '/vpcs'))
+    assert error.value.status == 405
+
+    estate_daemon.state = None
+    with pytest.raises(ApiError) as error:
+        _get(estate_daemon, '/vpcs')
+    assert error.value.status == 503
+
+
+def test_cache_key_ignores_query_order_and_unused_parameters():
+    estate_daemon = _daemon()
+
+    first = _get(estate_daemon, '/diagram?format=dot&vpc=vpc-1')
+    second = _get(estate_daemon, '/diagram?vpc=vpc-1&format=dot&nocache=123')
+    _get(estate_daemon, '/vpcs?page=1')
+    _get(estate_daemon, '/vpcs?page=2')
+
+    assert first == second
+    assert first[1].startswith('text/vnd.graphviz')
+    assert list(estate_daemon.state.responses) == [('diagram', 'dot', 'vpc-1'), ('vpcs',)]
+
+
+def test_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(daemon, 'RESPONSE_CACHE_SIZE', 2)
+    estate_daemon = _daemon()
+
+    _get(estate_daemon, '/vpcs/vpc-1')
+    _get(estate_daemon, '/vpcs/vpc-2')
+    _get(estate_daemon, '/vpcs/vpc-1')
+    _get(estate_daemon, '/subnets/subnet-1')
+
+    assert list(estate_daemon.state.responses) == [('vpcs', 'vpc-1'), ('subnets', 'subnet-1')]
+
+
+def test_reach_route_returns_verdict_and_blocking_rule():
+    estate_daemon = _daemon()
+    with pytest.raises(ApiError) as error:
+        _get(estate_daemon, '/reach?from=i-1&to=internet&port=443')
+    assert error.value.status == 503
+
+    state = estate_daemon.state
+    data = dict(state.data, security_groups=[])
+    state.reachability = ReachabilityIndex(data, state.topology, RouteIndex(data['route_tables']))
+
+    status, _, body = _get(estate_daemon, '/reach?to=internet&port=443&from=i-1')
+    result = json.loads(body)
+    assert status == 200
+    assert (result['reachable'], result['blocked_by']['layer']) == (False, 'placement')
+    assert ('reach', 'i-1', 'internet', '443', 'tcp') in state.responses
+
+    for target, status in (('/reach?from=i-1&to=internet', 400), ('/reach?from=i-1&to=internet&port=x', 400),
+                           ('/reach?from=i-x&to=internet&port=443', 404)):
+        with pytest.raises(ApiError) as error:
+            _get(estate_daemon, target)
+        assert error.value.status == status
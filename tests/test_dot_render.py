@@ -0,0 +1,89 @@
+"""DOT 직접 생성: 결정적 출력, 클러스터 구조, 간선"""
+import re
+
+import dot_render
+from dot_render import DotEmitter, node_id
+from lod import LevelOfDetail
+from reachability import ReachabilityIndex
+from routing import RouteIndex
+from topology import TopologyIndex
+
+
+def _emit(data, **options):
+    routes = RouteIndex(data['route_tables'])
+    topology = TopologyIndex(data, classify=routes.classify)
+    reachability = ReachabilityIndex(data, topology, routes)
+    return DotEmitter(reachability=reachability, **options).emit(data, topology)
+
+
+def _edges(dot):
+    return set(re.findall(r'^\s*(\w+) -> (\w+)', dot, re.MULTILINE))
+
+
+def test_same_estate_gives_identical_dot(small_estate, monkeypatch):
+    # 아이콘 경로(diagrams 설치 여부)와 무관하게 비교
+    monkeypatch.setattr(dot_render, 'icon_path', lambda kind: None)
+
+    assert _emit(small_estate) == _emit(small_estate)
+
+
+def test_clusters_nest_vpc_az_and_subnets_with_resources(small_estate, monkeypatch):
+    monkeypatch.setattr(dot_render, 'icon_path', lambda kind: None)
+    dot = _emit(small_estate)
+
+    clusters = re.findall(r'^(\s*)subgraph cluster_(\w+)', dot, re.MULTILINE)
+    assert [(len(indent) // 4, cid) for indent, cid in clusters] == [
+        (1, 'vpc_vpc_1'),
+        (2, 'az_vpc_1_ap_northeast_2a'),
+        (3, 'subnet_subnet_pub_a'), (3, 'subnet_subnet_app_a'),
+        (2, 'az_vpc_1_ap_northeast_2b'),
+        (3, 'subnet_subnet_pub_b'), (3, 'subnet_subnet_app_b'),
+    ]
+    assert '(public)' in dot and '(private)' in dot
+    assert dot.startswith('digraph "AWS Infrastructure Architecture" {')
+    assert dot.endswith('}\n')
+
+
+def test_edges_cover_internet_public_resources_and_reachability(small_estate, monkeypatch):
+    monkeypatch.setattr(dot_render, 'icon_path', lambda kind: None)
+    dot = _emit(small_estate)
+
+    igw, nat = node_id('igw', 'igw-1'), node_id('nat', 'nat-1')
+    elb_a = node_id('elb', 'web_subnet-pub-a')
+    rds_a = node_id('rds', 'db-multi_subnet-app-a')
+    assert _edges(dot) >= {
+        ('internet', igw), (igw, nat), (igw, node_id('ec2', 'i-3')), (igw, elb_a),
+        # 도달성 간선: ELB -> 앱 (대상 그룹 8080), 앱 -> DB, 앱 -> NAT
+        (elb_a, node_id('ec2', 'i-1')), (elb_a, node_id('ec2', 'i-2')),
+        (node_id('ec2', 'i-1'), rds_a), (node_id('ec2', 'i-1'), nat),
+    }
+    # 프라이빗 서브넷 리소스는 IGW와 직접 연결되지 않음
+    assert (igw, node_id('ec2', 'i-1')) not in _edges(dot)
+    # 배스천(sg-bastion)은 DB SG에서 허용되지 않음
+    assert (node_id('ec2', 'i-3'), rds_a) not in _edges(dot)
+    assert 'xlabel="8080"' in dot and 'xlabel="5432"' in dot
+
+
+def test_no_reachability_edges_without_index(small_estate, monkeypatch):
+    monkeypatch.setattr(dot_render, 'icon_path', lambda kind: None)
+    routes = RouteIndex(small_estate['route_tables'])
+    topology = TopologyIndex(small_estate, classify=routes.classify)
+
+    dot = DotEmitter().emit(small_estate, topology)
+    assert 'xlabel' not in dot
+
+
+def test_summary_levels_keep_reachability_between_summary_nodes(small_estate, monkeypatch):
+    monkeypatch.setattr(dot_render, 'icon_path', lambda kind: None)
+
+    # AZ 2개 + Internet/IGW/NAT 3개 = 5 -> AZ 요약 수준
+    dot = _emit(small_estate, lod=LevelOfDetail(max_nodes=5))
+    az_a, az_b = node_id('azsum', 'vpc-1_ap-northeast-2a'), node_id('azsum', 'vpc-1_ap-northeast-2b')
+    assert f"{az_a} [" in dot and f"{az_b} [" in dot
+    # AZ를 넘는 ELB -> EC2 / EC2 -> RDS 간선과 EC2 -> NAT 간선은 요약 노드 사이 간선으로 남음
+    assert {(az_b, az_a), (az_b, node_id('nat', 'nat-1'))} <= _edges(dot)
+
+    # VPC 요약 수준: 모든 리소스가 한 노드이고 NAT 노드가 없으므로 도달성 간선 없음 (의도된 생략)
+    dot = _emit(small_estate, lod=LevelOfDetail(max_nodes=4))
+    assert f"{node_id('vpcsum', 'vpc-1')} [" in dot
+    assert 'xlabel' not in dot
@@ -0,0 +1,58 @@
+"""계정/리전 팬아웃 결과 병합: scan_errors와 partial"""
+import fanout
+from collector import COLLECTORS
+from fanout import merge_results, scan_estate
+from model import from_dicts, pack
+
+
+def _result(account, region, errors=None, **data):
+    return {'account': account, 'region': region, 'errors': errors or {},
+            'data': {name: pack(from_dicts(name, items)) for name, items in data.items()}}
+
+
+def test_merge_results_combines_targets():
+    estate = merge_results([
+        _result('111111111111', 'ap-northeast-2', vpcs=[{'VpcId': 'vpc-1', 'Region': 'ap-northeast-2'}]),
+        _result('222222222222', 'us-east-1', vpcs=[{'VpcId': 'vpc-2', 'Region': 'us-east-1'}]),
+    ])
+
+    assert [vpc['VpcId'] for vpc in estate['vpcs']] == ['vpc-1', 'vpc-2']
+    assert estate['scope'] == {'accounts': ['111111111111', '222222222222'],
+                               'regions': ['ap-northeast-2', 'us-east-1']}
+    assert estate['scan_errors'] == []
+    assert 'partial' not in estate
+
+
+def test_collector_error_marks_only_that_collector_partial():
+    estate = merge_results([
+        _result('111111111111', 'ap-northeast-2', errors={'rds_instances': 'AccessDenied'}),
+    ])
+
+    assert estate['scan_errors'] == [{'account': '111111111111', 'region': 'ap-northeast-2',
+                                      'collector': 'rds_instances', 'error': 'AccessDenied'}]
+    assert list(estate['partial']) == ['rds_instances']
+    assert '111111111111 / ap-northeast-2' in estate['partial']['rds_instances']
+
+
+def test_failed_target_marks_every_collector_partial():
+    estate = merge_results([
+        _result('111111111111', 'ap-northeast-2'),
+        {'account': None, 'region': 'us-east-1', 'error': 'timeout'},
+    ])
+
+    assert estate['scope']['accounts'] == ['111111111111']
+    assert set(estate['partial']) == set(COLLECTORS)
+    assert 'default / us-east-1' in estate['partial']['vpcs']
+
+
+def test_region_lookup_failure_is_recorded(monkeypatch):
+    def fail(regions, account=None):
+        raise RuntimeError('UnauthorizedOperation')
+
+    monkeypatch.setattr(fanout, 'resolve_regions', fail)
+
+    estate = scan_estate(accounts=['prod'], regions=['all'], processes=1)
+
+    assert estate['scan_errors'] == [{'account': 'prod', 'region': None, 'error': 'UnauthorizedOperation'}]
+    assert set(estate['partial']) == set(COLLECTORS)
+    assert 'prod / 전체 리전' in estate['partial']['instances']
@@ -0,0 +1,124 @@
+"""SQLite 이력 저장소: 변경분 기록과 시점/추이 조회"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from history_store import HistoryError, HistoryStore
+from model import from_dicts
+from topology import TopologyIndex
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _estate(*instances, subnet_type='private'):
+    """VPC 하나, 서브넷 둘 - instances는 (인스턴스 ID, 서브넷 ID, 상태)"""
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available'}],
+        'subnets': [{'SubnetId': subnet_id, 'VpcId': 'vpc-1', 'CidrBlock': cidr, 'AvailabilityZone': 'a'}
+                    for subnet_id, cidr in (('subnet-1', '10.0.0.0/24'), ('subnet-2', '10.0.1.0/24'))],
+        'instances': [{'InstanceId': instance_id, 'SubnetId': subnet_id, 'VpcId': 'vpc-1', 'State': state}
+                      for instance_id, subnet_id, state in instances],
+        'route_tables': [], 'igws': [], 'nats': [], 'rds_instances': [], 'load_balancers': [],
+        'network_interfaces': [],
+    }
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    types = {'subnet-1': subnet_type, 'subnet-2': 'private'}
+    return data, TopologyIndex(data, classify=lambda subnet: types[subnet['SubnetId']])
+
+
+def _record(store, hours, *instances, scope=None, **kwargs):
+    data, topology = _estate(*instances, **kwargs)
+    if scope:
+        data['scope'] = scope
+    return store.record(data, topology, {'instances': T0 + timedelta(hours=hours)})
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(str(tmp_path / 'history.sqlite3')) as history:
+        yield history
+
+
+def test_unchanged_snapshot_adds_no_rows(store):
+    _, first = _record(store, 0, ('i-1', 'subnet-1', 'running'))
+    _, second = _record(store, 1, ('i-1', 'subnet-1', 'running'))
+    _, third = _record(store, 2, ('i-1', 'subnet-1', 'stopped'))
+
+    assert first == 4  # VPC, 서브넷 2, EC2 1
+    assert second == 0
+    assert third == 1
+    assert store.stats()['snapshots'] == 3
+
+
+def test_rejects_data_older_than_latest_snapshot(store):
+    _record(store, 1)
+
+    with pytest.raises(HistoryError):
+        _record(store, 0)
+
+
+def test_partial_collection_keeps_previous_versions(store):
+    _record(store, 0, ('i-1', 'subnet-1', 'running'))
+    data, topology = _estate()
+    data['partial'] = {'instances': 'RequestLimitExceeded'}
+    snapshot_id, _ = store.record(data, topology, {'instances': T0 + timedelta(hours=1)})
+
+    assert [i['InstanceId'] for i in store.load_estate(snapshot_id)['instances']] == ['i-1']
+
+
+def test_load_estate_at_each_snapshot(store):
+    first, _ = _record(store, 0, ('i-1', 'subnet-1', 'running'))
+    second, _ = _record(store, 1, ('i-2', 'subnet-2', 'running'))
+
+    assert [i['InstanceId'] for i in store.load_estate(first)['instances']] == ['i-1']
+    assert [i['InstanceId'] for i in store.load_estate(second)['instances']] == ['i-2']
+    assert store.snapshot_at(T0 + timedelta(minutes=30)) == first
+    assert store.snapshot_at(T0 - timedelta(hours=1)) is None
+
+
+def test_subnet_type_changes(store):
+    _record(store, 0)
+    _record(store, 1, subnet_type='public')
+    _record(store, 2, subnet_type='public')
+    _record(store, 3)
+
+    changes = [(change['snapshot_id'], change['subnet_type']) for change in store.subnet_type_changes('subnet-1')]
+    assert changes == [(1, 'private'), (2, 'public'), (4, 'private')]
+    assert store.became('subnet-1', 'public') == T0 + timedelta(hours=1)
+    assert store.became('subnet-2', 'public') is None
+
+
+def test_resource_counts_per_subnet(store):
+    _record(store, 0, ('i-1', 'subnet-1', 'running'))
+    _record(store, 1, ('i-1', 'subnet-1', 'running'), ('i-2', 'subnet-1', 'running'))
+    _record(store, 2, ('i-1', 'subnet-1', 'stopped'), ('i-2', 'subnet-1', 'running'))
+    _record(store, 3, ('i-2', 'subnet-2', 'running'))
+
+    hour = timedelta(hours=1)
+    assert store.resource_counts() == {
+        # 상태 변경(버전 교체)만 있는 스냅샷은 수가 같으므로 생략
+        'subnet-1': [(T0, 1), (T0 + hour, 2), (T0 + 3 * hour, 0)],
+        'subnet-2': [(T0, 0), (T0 + 3 * hour, 1)],
+    }
+    assert store.resource_counts(subnet_id='subnet-2', since=T0 + 2 * hour) == {
+        'subnet-2': [(T0 + 2 * hour, 0), (T0 + 3 * hour, 1)]}
+
+
+def test_runs_with_different_scopes_do_not_close_each_others_rows(store):
+    seoul = {'accounts': [], 'regions': ['ap-northeast-2']}
+    virginia = {'accounts': [], 'regions': ['us-east-1']}
+    first, _ = _record(store, 0, ('i-1', 'subnet-1', 'running'), scope=seoul)
+    # 다른 리전 수집: 같은 모양의 에스테이트지만 ID가 다름
+    data, topology = _estate()
+    data['vpcs'] = from_dicts('vpcs', [{'VpcId': 'vpc-9', 'CidrBlock': '10.9.0.0/16', 'State': 'available'}])
+    data['subnets'] = []
+    data['scope'] = virginia
+    second, added = store.record(data, topology, {'instances': T0 + timedelta(hours=1)})
+    third, unchanged = _record(store, 2, ('i-1', 'subnet-1', 'running'), scope=seoul)
+
+    assert added == 1 and unchanged == 0
+    estate = store.load_estate(third)
+    assert sorted(vpc['VpcId'] for vpc in estate['vpcs']) == ['vpc-1', 'vpc-9']
+    assert [i['InstanceId'] for i in store.load_estate(second)['instances']] == ['i-1']
+    assert [change['subnet_type'] for change in store.subnet_type_changes('subnet-1')] == ['private']
+    assert store.resource_counts() == {'subnet-1': [(T0, 1)]}
@@ -0,0 +1,173 @@
+"""증분 갱신(refresh)과 스냅샷 diff"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+
+import incremental
+from incremental import MAX_LOOKBACK, classify_event, diff_estates, diff_summary, find_changes, refresh
+from model import from_dicts
+
+FETCHED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+NOW = FETCHED + timedelta(minutes=30)
+
+
+class FakeEngine:
+    """collect / iter_pages / partial만 흉내 내는 수집 엔진"""
+
+    def __init__(self, pages=None, error=None, events=()):
+        self.pages = pages or []
+        self.error = error
+        self.filters = None
+        self.requested = []
+        self.errors = {}
+        self.events = list(events)
+        self.lookups = []
+        self.collected = []
+
+    def collect(self, names):
+        self.collected.extend(names)
+        return {name: [] for name in names}
+
+    def client(self, service):
+        return self
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, LookupAttributes, StartTime, EndTime):
+        """CloudTrail lookup_events: 조회 속성과 시작 시각 기록, 쓰기 이벤트만 반환"""
+        self.lookups.append((LookupAttributes, StartTime))
+        return [{'Events': [event for event in self.events if event['EventTime'] >= StartTime]}]
+
+    def partial(self):
+        return {}
+
+    def iter_pages(self, name, filters=None):
+        self.filters = filters
+        self.requested.append(filters[0]['Values'] if filters else None)
+        if self.error:
+            raise self.error
+        yield from self.pages
+
+
+def _instances(*ids):
+    return from_dicts('instances', [{'InstanceId': instance_id, 'State': 'running'} for instance_id in ids])
+
+
+@pytest.fixture
+def run_instances_event(monkeypatch):
+    """RunInstances 한 건 (Resources에 서브넷/SG/AMI ID 포함)"""
+    changes = classify_event('ec2.amazonaws.com', 'RunInstances',
+                             ['i-new', 'subnet-1', 'sg-1', 'ami-1'])
+    monkeypatch.setattr(incremental, 'find_changes', lambda engine, since: changes)
+    return changes
+
+
+def test_classify_event_keeps_only_instance_ids(run_instances_event):
+    assert run_instances_event == {'instances': {'i-new'}}
+    assert classify_event('ec2.amazonaws.com', 'CreateTags', ['sg-1', 'i-2']) == {
+        'security_groups': {'sg-1'}, 'instances': {'i-2'}}
+
+
+def test_targeted_instance_refresh_patches_changed_ids(run_instances_event):
+    engine = FakeEngine(pages=[_instances('i-new')])
+    data = {'instances': _instances('i-old')}
+
+    new_data, refreshed = refresh(engine, data, {'instances': FETCHED}, now=NOW)
+
+    assert engine.filters == [{'Name': 'instance-id', 'Values': ['i-new']}]
+    assert sorted(i['InstanceId'] for i in new_data['instances']) == ['i-new', 'i-old']
+    assert refreshed == ['instances']
+    assert 'partial' not in new_data
+
+
+def test_targeted_instance_refresh_splits_ids_into_filter_sized_batches(monkeypatch):
+    ids = {f"i-{n:04d}" for n in range(450)}
+    monkeypatch.setattr(incremental, 'find_changes', lambda engine, since: {'instances': set(ids)})
+    engine = FakeEngine(pages=[_instances('i-0000')])
+
+    new_data, refreshed = refresh(engine, {'instances': _instances('i-0000', 'i-old')}, {'instances': FETCHED},
+                                  now=NOW)
+
+    # DescribeInstances 필터 Values는 최대 200개
+    assert [len(values) for values in engine.requested] == [200, 200, 50]
+    assert sorted(v for values in engine.requested for v in values) == sorted(ids)
+    assert refreshed == ['instances'] and 'partial' not in new_data
+
+
+def test_targeted_instance_refresh_failure_marks_partial(run_instances_event):
+    error = ClientError({'Error': {'Code': 'RequestLimitExceeded', 'Message': 'slow down'}}, 'DescribeInstances')
+    engine = FakeEngine(error=error)
+    data = {'instances': _instances('i-old')}
+
+    new_data, refreshed = refresh(engine, data, {'instances': FETCHED}, now=NOW)
+
+    assert [i['InstanceId'] for i in new_data['instances']] == ['i-old']
+    assert 'RequestLimitExceeded' in new_data['partial']['instances']
+    assert refreshed == []
+
+
+WRITE_EVENTS = [{'AttributeKey': 'ReadOnly', 'AttributeValue': 'false'}]
+
+
+def _event(source, name, minutes, *resource_ids):
+    return {'EventSource': f"{source}.amazonaws.com", 'EventName': name,
+            'EventTime': FETCHED + timedelta(minutes=minutes),
+            'Resources': [{'ResourceName': resource_id} for resource_id in resource_ids]}
+
+
+def test_find_changes_uses_each_collections_own_fetch_time():
+    engine = FakeEngine(events=[
+        _event('ec2', 'AuthorizeSecurityGroupIngress', -90, 'sg-1'),
+        _event('ec2', 'RunInstances', -90, 'i-old'), _event('ec2', 'RunInstances', 5, 'i-new'),
+        _event('rds', 'ModifyDBInstance', -90, 'db-1'),
+        _event('s3', 'PutBucketPolicy', 5, 'bucket-1'),
+    ])
+    since = {'security_groups': FETCHED - timedelta(hours=2), 'instances': FETCHED,
+             'rds_instances': FETCHED}
+
+    changes = find_changes(engine, since)
+
+    # 쓰기 이벤트만 가장 오래된 수집 시각부터 한 번 조회, 이벤트는 타입별 수집 시각 이후만
+    assert engine.lookups == [(WRITE_EVENTS, FETCHED - timedelta(hours=2, minutes=15))]
+    assert changes == {'security_groups': {'sg-1'}, 'instances': {'i-new'}}
+    assert find_changes(engine, {}) == {} and len(engine.lookups) == 1
+
+
+def test_refresh_recollects_types_older_than_lookback_limit():
+    engine = FakeEngine(events=[_event('ec2', 'RunInstances', 5, 'i-new')], pages=[_instances('i-new')])
+    fetched_at = {'vpcs': NOW - MAX_LOOKBACK - timedelta(minutes=1), 'instances': FETCHED}
+
+    new_data, refreshed = refresh(engine, {'vpcs': [], 'instances': []}, fetched_at, now=NOW)
+
+    # 오래된 vpcs 때문에 조회 범위가 한도를 넘어 늘어나지 않음
+    assert engine.lookups == [(WRITE_EVENTS, FETCHED - timedelta(minutes=15))]
+    assert engine.collected == ['vpcs']
+    assert refreshed == ['vpcs', 'instances']
+    assert new_data['vpcs'] == []
+    assert [i['InstanceId'] for i in new_data['instances']] == ['i-new']
+
+
+def test_refresh_collects_types_missing_from_the_base_snapshot(run_instances_event):
+    engine = FakeEngine(pages=[_instances('i-new')])
+    data = {'instances': _instances('i-old')}
+
+    new_data, refreshed = refresh(engine, data, {'instances': FETCHED}, ['instances', 'network_interfaces'], now=NOW)
+
+    # 기준 스냅샷 이후 추가된 수집기(network_interfaces)는 변경 이벤트와 무관하게 전체 수집
+    assert engine.collected == ['network_interfaces']
+    assert new_data['network_interfaces'] == []
+    assert sorted(refreshed) == ['instances', 'network_interfaces']
+
+
+def test_diff_estates_reports_added_removed_changed():
+    old = {'instances': from_dicts('instances', [
+        {'InstanceId': 'i-1', 'State': 'running'}, {'InstanceId': 'i-2', 'State': 'running'}])}
+    new = {'instances': from_dicts('instances', [
+        {'InstanceId': 'i-1', 'State': 'stopped'}, {'InstanceId': 'i-3', 'State': 'running'}])}
+
+    summary = diff_summary(diff_estates(old, new))
+
+    assert summary['instances'] == (1, 1, 1)
+    assert summary['vpcs'] == (0, 0, 0)
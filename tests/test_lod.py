@@ -0,0 +1,98 @@
+"""상세 수준(LOD): 노드 예산에 맞는 수준 선택과 그룹 집계"""
+from dot_render import DotEmitter, group_node_id
+from lod import LevelOfDetail
+from model import from_dicts
+from topology import TopologyIndex
+
+AZ = 'ap-northeast-2a'
+
+
+def _estate():
+    """서브넷 하나에 EC2 타입 4종, RDS 엔진 2종, ELB 타입 2종 + IGW, NAT"""
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available'}],
+        'subnets': [{'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/24', 'AvailabilityZone': AZ}],
+        'igws': [{'InternetGatewayId': 'igw-1', 'Attachments': [{'VpcId': 'vpc-1', 'State': 'available'}]}],
+        'nats': [{'NatGatewayId': 'nat-1', 'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'State': 'available'}],
+        'instances': [
+            {'InstanceId': f"i-{n}", 'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'InstanceType': instance_type,
+             'State': 'running'}
+            for n, instance_type in enumerate(['m5.large'] * 3 + ['c5.large'] * 2 + ['t3.micro', 't3.small'])
+        ],
+        'rds_instances': [
+            {'DBInstanceIdentifier': f"db-{engine}", 'VpcId': 'vpc-1', 'SubnetIds': ('subnet-1',),
+             'AvailabilityZone': AZ, 'Engine': engine, 'DBInstanceStatus': 'available'}
+            for engine in ('postgres', 'mysql')
+        ],
+        'load_balancers': [
+            {'LoadBalancerName': lb_type, 'LoadBalancerArn': f"arn:lb/{lb_type}", 'VpcId': 'vpc-1',
+             'SubnetIds': ('subnet-1',), 'Type': lb_type, 'Scheme': 'internal'}
+            for lb_type in ('application', 'network')
+        ],
+        'route_tables': [],
+        'network_interfaces': [],
+    }
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    return data, TopologyIndex(data, classify=lambda subnet: 'private')
+
+
+def _group_keys(lod, topology):
+    return [(kind, key) for kind, key, _, _ in lod.groups(topology.resources('subnet-1'))]
+
+
+def test_groups_merge_overflow_into_other_per_kind():
+    _, topology = _estate()
+
+    # 'other' 그룹도 max_groups에 포함
+    assert _group_keys(LevelOfDetail(threshold=1, max_groups=4), topology) == [
+        ('ec2', 'm5.large'), ('ec2', 'other'), ('elb', 'other'), ('rds', 'other')]
+    assert _group_keys(LevelOfDetail(threshold=1, max_groups=6), topology) == [
+        ('ec2', 'm5.large'), ('ec2', 'c5.large'), ('ec2', 't3.micro'), ('ec2', 't3.small'),
+        ('elb', 'other'), ('rds', 'other')]
+    assert len(_group_keys(LevelOfDetail(threshold=1, max_groups=8), topology)) == 8
+
+
+def test_groups_never_exceed_max_groups_unless_kinds_do():
+    _, topology = _estate()
+
+    for max_groups in range(3, 12):
+        assert len(_group_keys(LevelOfDetail(threshold=1, max_groups=max_groups), topology)) <= max_groups
+    # 종류(EC2/RDS/ELB)가 한도보다 많으면 종류별 'other' 하나씩
+    assert _group_keys(LevelOfDetail(threshold=1, max_groups=2), topology) == [
+        ('ec2', 'other'), ('elb', 'other'), ('rds', 'other')]
+
+
+def test_choose_level_counts_other_buckets_and_gateways():
+    _, topology = _estate()
+
+    # 그룹 4개 + Internet/IGW/NAT 3개 = 7
+    assert LevelOfDetail(threshold=1, max_groups=4, max_nodes=7).choose_level(topology) == 'group'
+    assert LevelOfDetail(threshold=1, max_groups=4, max_nodes=6).choose_level(topology) == 'subnet'
+    assert LevelOfDetail(threshold=1, max_groups=4, max_nodes=3).choose_level(topology) == 'vpc'
+
+
+def test_emitted_nodes_stay_within_budget():
+    data, topology = _estate()
+
+    for max_nodes in range(4, 16):
+        emitter = DotEmitter(lod=LevelOfDetail(threshold=1, max_groups=2, max_nodes=max_nodes))
+        emitter.emit(data, topology)
+        assert emitter.node_count <= max_nodes
+
+
+def test_group_keys_that_differ_only_in_punctuation_get_separate_nodes():
+    data, _ = _estate()
+    data['instances'] = from_dicts('instances', [
+        {'InstanceId': f"i-{n}", 'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'InstanceType': 'm5.large',
+         'State': 'running', 'Tags': [{'Key': 'Name', 'Value': name}]}
+        for n, name in enumerate(['web-1', 'web-1', 'web.1'])
+    ])
+    topology = TopologyIndex(data, classify=lambda subnet: 'private')
+    emitter = DotEmitter(lod=LevelOfDetail(threshold=1, group_by='tag'))
+    dot = emitter.emit(data, topology)
+
+    web_dash = group_node_id('ec2', 'subnet-1', 'Name=web-1')
+    web_dot = group_node_id('ec2', 'subnet-1', 'Name=web.1')
+    assert web_dash != web_dot
+    assert f"{web_dash} [" in dot and f"{web_dot} [" in dot
+    assert emitter.resource_nodes[('ec2', 'i-2')] == web_dot
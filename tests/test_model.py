@@ -0,0 +1,87 @@
+"""레코드 모델: dict 호환 접근과 pack/unpack/pickle 왕복"""
+import pickle
+
+import pytest
+
+from model import DBInstance, Instance, Tag, Vpc, from_dicts, pack, unpack
+
+ROUTE_TABLE = {
+    'RouteTableId': 'rtb-1', 'VpcId': 'vpc-1',
+    'Routes': [{'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local', 'State': 'active'},
+               {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1', 'State': 'active'}],
+    'Associations': [{'RouteTableId': 'rtb-1', 'SubnetId': 'subnet-1', 'Main': False}],
+    'Tags': [{'Key': 'Name', 'Value': 'private'}],
+}
+
+
+def _plain(value):
+    """비교용: 목록을 튜플로"""
+    if isinstance(value, list):
+        return tuple(_plain(v) for v in value)
+    if isinstance(value, dict):
+        return {key: _plain(v) for key, v in value.items()}
+    return value
+
+
+def test_in_and_get_match_dict_semantics():
+    item = {'InstanceId': 'i-1', 'State': 'running', 'SubnetId': 'subnet-1', 'SecurityGroups': ['sg-1']}
+    record = from_dicts('instances', [item])[0]
+
+    for key in ('InstanceId', 'State', 'SubnetId', 'PublicIpAddress', 'KeyName', 'NotAField'):
+        assert (key in record) == (key in item)
+        assert record.get(key) == _plain(item.get(key))
+        assert record.get(key, 'fallback') == _plain(item.get(key, 'fallback'))
+    assert record['InstanceId'] == 'i-1'
+
+
+def test_none_is_missing_but_false_and_empty_are_present():
+    vpc = Vpc(VpcId='vpc-1', IsDefault=False)
+
+    assert 'IsDefault' in vpc and vpc.get('IsDefault', True) is False
+    assert 'Tags' in vpc and vpc.get('Tags') == ()
+    assert 'CidrBlock' not in vpc and vpc.get('CidrBlock', '-') == '-'
+    assert vpc.keys() == ['VpcId', 'IsDefault', 'CidrBlocks', 'Ipv6CidrBlocks', 'Tags']
+    with pytest.raises(KeyError):
+        vpc['NotAField']
+    with pytest.raises(KeyError):
+        vpc['NotAField'] = 1
+    vpc['Region'] = 'ap-northeast-2'
+    assert vpc.get('Region') == 'ap-northeast-2'
+
+
+def test_from_dict_builds_nested_records_and_drops_unknown_keys():
+    table = from_dicts('route_tables', [dict(ROUTE_TABLE, PropagatingVgws=[])])[0]
+
+    assert table['Routes'][1]['NatGatewayId'] == 'nat-1'
+    assert 'GatewayId' not in table['Routes'][1]
+    assert table['Tags'] == (Tag('Name', 'private'),)
+    assert not hasattr(table, 'PropagatingVgws')
+    assert _plain(table.to_dict()) == _plain(ROUTE_TABLE)
+
+
+def test_pack_unpack_round_trip_with_nested_records():
+    tables = from_dicts('route_tables', [ROUTE_TABLE, dict(ROUTE_TABLE, RouteTableId='rtb-2', Routes=[])])
+    instances = [Instance(InstanceId='i-1', State='running', Tags=(Tag('Name', 'web'),), SecurityGroups=('sg-1',)),
+                 Instance(InstanceId='i-2')]
+
+    for items in (tables, instances, [DBInstance(DBInstanceIdentifier='db-1', Port=5432)]):
+        cls, rows = pack(items)
+        assert cls is type(items[0])
+        assert all(isinstance(row, tuple) for row in rows)
+        assert unpack(cls, rows) == items
+
+    # 레코드가 아닌 목록과 빈 목록은 그대로
+    assert pack([]) == (None, [])
+    assert unpack(*pack([{'a': 1}])) == [{'a': 1}]
+
+
+def test_records_survive_pickling_for_the_process_pool():
+    tables = from_dicts('route_tables', [ROUTE_TABLE])
+    data = {'route_tables': tables, 'instances': [Instance(InstanceId='i-1', State='running')]}
+
+    restored = pickle.loads(pickle.dumps(data))
+    assert restored == data
+    assert isinstance(restored['route_tables'][0]['Routes'][0], type(tables[0]['Routes'][0]))
+
+    packed = pickle.loads(pickle.dumps(pack(tables)))
+    assert unpack(*packed) == tables
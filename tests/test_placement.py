@@ -0,0 +1,57 @@
+"""ENI 기반 서비스/ELB/RDS 배치"""
+from model import from_dicts
+from placement import InterfacePlacement, classify_interface
+
+
+def _eni(eni_id, subnet_id, description, account='111111111111', region='ap-northeast-2', vpc_id='vpc-1',
+         **extra):
+    return {'NetworkInterfaceId': eni_id, 'SubnetId': subnet_id, 'VpcId': vpc_id, 'Description': description,
+            'AccountId': account, 'Region': region, **extra}
+
+
+def _placement(*raw):
+    """수집기 변환(classify_interface)을 거친 ENI 레코드로 배치 계산"""
+    enis = []
+    for eni in raw:
+        resource_type, resource_id = classify_interface(eni)
+        enis.append(dict(eni, ResourceType=resource_type, ResourceId=resource_id))
+    return InterfacePlacement(from_dicts('network_interfaces', enis))
+
+
+def test_same_named_services_in_other_accounts_and_regions_stay_separate():
+    lambda_eni = 'AWS Lambda VPC ENI-orders-0a1b2c3d-0000-0000-0000-000000000000'
+    placement = _placement(
+        _eni('eni-1', 'subnet-a', lambda_eni),
+        _eni('eni-2', 'subnet-b', lambda_eni),
+        _eni('eni-3', 'subnet-c', lambda_eni, account='222222222222', vpc_id='vpc-2'),
+        _eni('eni-4', 'subnet-d', lambda_eni, region='us-east-1', vpc_id='vpc-3'),
+    )
+
+    services = sorted(placement.services.values(), key=lambda service: service['NetworkInterfaceIds'])
+    assert [service['SubnetIds'] for service in services] == [['subnet-a', 'subnet-b'], ['subnet-c'], ['subnet-d']]
+    assert {service['ServiceId'] for service in services} == {'orders'}
+    assert services[1]['AccountId'] == '222222222222'
+
+
+def test_load_balancer_subnets_follow_node_enis_per_account():
+    placement = _placement(
+        _eni('eni-1', 'subnet-a', 'ELB app/web/1'),
+        _eni('eni-2', 'subnet-x', 'ELB app/web/1', account='222222222222'),
+    )
+    lb = {'LoadBalancerName': 'web', 'VpcId': 'vpc-1', 'AccountId': '111111111111', 'Region': 'ap-northeast-2',
+          'LoadBalancerArn': 'arn:aws:elasticloadbalancing:ap-northeast-2:111111111111:loadbalancer/app/web/1',
+          'SubnetIds': ('subnet-a', 'subnet-b')}
+
+    assert placement.load_balancer_subnets(lb) == ['subnet-a']
+    assert placement.load_balancer_subnets(dict(lb, AccountId='333333333333')) == ('subnet-a', 'subnet-b')
+
+
+def test_single_az_db_is_placed_in_its_az_only():
+    placement = _placement(
+        _eni('eni-1', 'subnet-a', 'RDSNetworkInterface'),
+    )
+    db = {'DBInstanceIdentifier': 'db', 'VpcId': 'vpc-1', 'AccountId': '111111111111', 'Region': 'ap-northeast-2',
+          'SubnetIds': ('subnet-a', 'subnet-b'), 'AvailabilityZone': 'ap-northeast-2a'}
+    subnet_azs = {'subnet-a': 'ap-northeast-2a', 'subnet-b': 'ap-northeast-2b'}
+
+    assert placement.db_subnets(db, subnet_azs) == ['subnet-a']
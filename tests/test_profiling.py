@@ -0,0 +1,46 @@
+"""API 호출 계측 훅: 성공 / ClientError / 전송 오류 집계"""
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.stub import Stubber
+
+from profiling import Profiler
+
+
+def _client(**kwargs):
+    session = boto3.session.Session(aws_access_key_id='x', aws_secret_access_key='x', region_name='ap-northeast-2')
+    return session.client('ec2', **kwargs)
+
+
+def test_success_and_client_error_are_counted():
+    profiler = Profiler()
+    client = _client()
+    profiler.instrument(client)
+
+    with Stubber(client) as stubber:
+        stubber.add_response('describe_vpcs', {'Vpcs': []})
+        stubber.add_client_error('describe_vpcs', service_error_code='UnauthorizedOperation', http_status_code=403)
+        client.describe_vpcs()
+        with pytest.raises(ClientError):
+            client.describe_vpcs()
+
+    stats = profiler.api['ec2.DescribeVpcs']
+    assert stats['calls'] == 2
+    assert stats['errors'] == 1
+    assert [event['args']['error'] for event in profiler.events] == [None, 'UnauthorizedOperation']
+
+
+def test_transport_error_is_counted_without_masking_exception():
+    profiler = Profiler()
+    config = Config(retries={'max_attempts': 1, 'mode': 'standard'}, connect_timeout=1)
+    client = _client(endpoint_url='http://127.0.0.1:9', config=config)
+    profiler.instrument(client)
+
+    with pytest.raises(EndpointConnectionError):
+        client.describe_vpcs()
+
+    stats = profiler.api['ec2.DescribeVpcs']
+    assert stats['calls'] == 1
+    assert stats['errors'] == 1
+    assert profiler.events[0]['args']['error'] == 'EndpointConnectionError'
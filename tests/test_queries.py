@@ -0,0 +1,73 @@
+"""에스테이트 범위 필터(VPC / 태그 / 리전)"""
+from model import from_dicts
+from queries import filter_estate, parse_tags
+
+
+def _estate():
+    """서울 VPC 2개(prod, dev) + 버지니아 VPC 1개, 각 VPC에 서브넷/EC2 하나"""
+    vpcs = [
+        {'VpcId': 'vpc-prod', 'Region': 'ap-northeast-2', 'Tags': ({'Key': 'env', 'Value': 'prod'},)},
+        {'VpcId': 'vpc-dev', 'Region': 'ap-northeast-2', 'Tags': ({'Key': 'env', 'Value': 'dev'},)},
+        {'VpcId': 'vpc-us', 'Region': 'us-east-1', 'Tags': ({'Key': 'team', 'Value': 'data'},)},
+    ]
+    data = {
+        'vpcs': [dict(vpc, CidrBlock='10.0.0.0/16', State='available') for vpc in vpcs],
+        'subnets': [{'SubnetId': f"subnet-{vpc['VpcId']}", 'VpcId': vpc['VpcId'], 'Region': vpc['Region']}
+                    for vpc in vpcs],
+        'instances': [{'InstanceId': f"i-{vpc['VpcId']}", 'VpcId': vpc['VpcId'], 'Region': vpc['Region']}
+                      for vpc in vpcs] + [{'InstanceId': 'i-classic', 'Region': 'ap-northeast-2'}],
+        'igws': [{'InternetGatewayId': 'igw-1', 'Region': 'ap-northeast-2',
+                  'Attachments': [{'VpcId': 'vpc-dev', 'State': 'available'}]}],
+    }
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    data['scope'] = {'accounts': [], 'regions': ['ap-northeast-2', 'us-east-1']}
+    return data
+
+
+def _ids(data, name, key):
+    return sorted(item[key] for item in data[name])
+
+
+def test_no_filter_returns_estate_unchanged():
+    data = _estate()
+
+    assert filter_estate(data) is data
+
+
+def test_filter_by_vpc_id_keeps_only_its_resources():
+    filtered = filter_estate(_estate(), vpc_ids=['vpc-dev'])
+
+    assert _ids(filtered, 'vpcs', 'VpcId') == ['vpc-dev']
+    assert _ids(filtered, 'subnets', 'SubnetId') == ['subnet-vpc-dev']
+    assert _ids(filtered, 'instances', 'InstanceId') == ['i-vpc-dev']
+    assert _ids(filtered, 'igws', 'InternetGatewayId') == ['igw-1']
+
+
+def test_filter_by_tags():
+    data = _estate()
+
+    assert _ids(filter_estate(data, tags=parse_tags(['env=prod'])), 'vpcs', 'VpcId') == ['vpc-prod']
+    assert _ids(filter_estate(data, tags=parse_tags(['env'])), 'vpcs', 'VpcId') == ['vpc-dev', 'vpc-prod']
+    assert filter_estate(data, tags=parse_tags(['env=prod', 'team']))['vpcs'] == []
+
+
+def test_filter_by_region_narrows_scope():
+    filtered = filter_estate(_estate(), regions=['us-east-1'])
+
+    assert _ids(filtered, 'instances', 'InstanceId') == ['i-vpc-us']
+    assert filtered['igws'] == []
+    assert filtered['scope']['regions'] == ['us-east-1']
+
+
+def test_region_defaults_to_scanned_region_for_single_region_estates():
+    data = _estate()
+    for vpc in data['vpcs']:
+        vpc['Region'] = None
+    data['scope'] = {'regions': ['ap-northeast-2']}
+
+    assert len(filter_estate(data, regions=['ap-northeast-2'])['vpcs']) == 3
+    assert filter_estate(data, regions=['us-east-1'])['vpcs'] == []
+
+
+def test_parse_tags():
+    assert parse_tags(['env=prod', 'owner', 'expr=a=b']) == {'env': 'prod', 'owner': None, 'expr': 'a=b'}
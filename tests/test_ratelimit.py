@@ -0,0 +1,181 @@
+"""적응형 토큰 버킷(AIMD)과 botocore 훅 기반 서비스별 속도 제한"""
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+import collector
+import ratelimit
+from collector import CollectionEngine
+from ratelimit import AdaptiveTokenBucket, RateLimiter
+from synthetic_estate import SyntheticResponder, generate_estate
+
+THROTTLE_BODY = (b'<Response><Errors><Error><Code>RequestLimitExceeded</Code>'
+                 b'<Message>Request limit exceeded.</Message></Error></Errors><RequestID>r</RequestID></Response>')
+VPCS_BODY = (b'<DescribeVpcsResponse xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+             b'<requestId>r</requestId><vpcSet/></DescribeVpcsResponse>')
+
+
+class FakeClock:
+    """time.monotonic / time.sleep 대체 (sleep은 시간만 진행)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class RawBody:
+    """AWSResponse.raw 대체 (본문 한 번에 반환)"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+class HttpResponder:
+    """before-send 훅: 전송 직전에 정해진 HTTP 응답을 돌려줘 botocore 재시도 경로를 그대로 탄다"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sends = 0
+
+    def attach(self, client):
+        client.meta.events.register('before-send.*.*', self, unique_id='http-responder')
+
+    def __call__(self, request, **kwargs):
+        status, body = self.responses[min(self.sends, len(self.responses) - 1)]
+        self.sends += 1
+        return AWSResponse(request.url, status, {}, RawBody(body))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, 'time', clock)
+    return clock
+
+
+def _client(max_attempts):
+    # retries.max_attempts는 첫 시도를 뺀 재시도 횟수
+    session = boto3.session.Session(aws_access_key_id='x', aws_secret_access_key='x', region_name='ap-northeast-2')
+    config = Config(retries={'mode': 'standard', 'max_attempts': max_attempts})
+    return session.client('ec2', config=config)
+
+
+def test_throttle_halves_rate_down_to_floor(clock):
+    bucket = AdaptiveTokenBucket(rate=8.0, capacity=4, min_rate=1.0)
+    bucket.on_throttle()
+    assert bucket.rate == 4.0
+    assert bucket.tokens == 0.0
+    for _ in range(5):
+        bucket.on_throttle()
+    assert bucket.rate == 1.0
+    assert bucket.throttles == 6
+
+
+def test_success_recovers_linearly_up_to_quota(clock):
+    bucket = AdaptiveTokenBucket(rate=10.0, capacity=10, recovery=0.1)
+    bucket.on_throttle()
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(6.0)
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(7.0)
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+
+
+def test_acquire_waits_for_refill_at_current_rate(clock):
+    bucket = AdaptiveTokenBucket(rate=2.0, capacity=2)
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.slept == 0.0
+
+    bucket.acquire()
+    assert clock.slept == pytest.approx(0.5)
+
+    bucket.on_throttle()
+    bucket.acquire()
+    assert clock.slept == pytest.approx(1.5)
+
+
+def test_limiter_shares_one_bucket_per_service():
+    limiter = RateLimiter(quotas={'ec2': (3.0, 6)})
+    assert limiter.bucket('ec2') is limiter.bucket('ec2')
+    assert (limiter.bucket('ec2').max_rate, limiter.bucket('ec2').capacity) == (3.0, 6)
+    assert limiter.bucket('rds').max_rate == ratelimit.SERVICE_QUOTAS['rds'][0]
+
+
+def test_hooks_acquire_per_attempt_and_halve_on_each_throttle(clock, monkeypatch):
+    monkeypatch.setattr('botocore.endpoint.time.sleep', lambda seconds: None)
+    limiter = RateLimiter(quotas={'ec2': (16.0, 100)})
+    client = _client(max_attempts=2)
+    limiter.attach(client)
+    responder = HttpResponder((503, THROTTLE_BODY), (503, THROTTLE_BODY), (200, VPCS_BODY))
+    responder.attach(client)
+
+    client.describe_vpcs()
+
+    bucket = limiter.bucket('ec2')
+    assert responder.sends == 3
+    assert bucket.throttles == 2
+    # 스로틀마다 버스트가 비워져 다음 시도는 줄어든 속도(8, 4)로 토큰을 기다림
+    assert clock.slept == pytest.approx(1 / 8 + 1 / 4)
+    # 16 -> 8 -> 4, 성공 응답 한 번으로 16 * 0.05 회복
+    assert bucket.rate == pytest.approx(4.8)
+
+
+def test_exhausted_throttle_does_not_count_as_success(clock, monkeypatch):
+    monkeypatch.setattr('botocore.endpoint.time.sleep', lambda seconds: None)
+    limiter = RateLimiter(quotas={'ec2': (16.0, 100)})
+    client = _client(max_attempts=1)
+    limiter.attach(client)
+    HttpResponder((503, THROTTLE_BODY)).attach(client)
+
+    with pytest.raises(ClientError):
+        client.describe_vpcs()
+
+    bucket = limiter.bucket('ec2')
+    assert bucket.throttles == 2
+    assert bucket.rate == 4.0
+
+
+class AlwaysThrottled(SyntheticResponder):
+    """지정한 오퍼레이션만 항상 스로틀 오류로 응답"""
+
+    def __init__(self, estate, operation):
+        super().__init__(estate)
+        self.operation = operation
+
+    def __call__(self, model, params, **kwargs):
+        if model.name == self.operation:
+            return AWSResponse(None, 400, {}, None), {
+                'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Request limit exceeded.'},
+                'ResponseMetadata': {'HTTPStatusCode': 400},
+            }
+        return super().__call__(model, params, **kwargs)
+
+
+def test_collection_is_partial_when_throttling_wins(monkeypatch):
+    monkeypatch.setattr(collector, 'MAX_PAGE_RETRIES', 2)
+    monkeypatch.setattr(collector, 'backoff', lambda attempt: 0)
+    responder = AlwaysThrottled(generate_estate(), 'DescribeSubnets')
+    session = boto3.session.Session(aws_access_key_id='x', aws_secret_access_key='x')
+    engine = CollectionEngine(session=session, client_hooks=[responder.attach])
+
+    data = engine.collect(['vpcs', 'subnets'])
+
+    assert len(data['vpcs']) == 1
+    assert data['subnets'] == []
+    assert set(engine.partial()) == {'subnets'}
+    assert 'RequestLimitExceeded' in engine.partial()['subnets']
@@ -0,0 +1,187 @@
+"""SG/NACL/라우트 기반 도달성: ELB -> EC2 (대상 그룹 포트), EC2 -> RDS, EC2 -> NAT"""
+from model import from_dicts
+from queries import reach
+from reachability import ReachabilityIndex
+from routing import RouteIndex
+from topology import TopologyIndex
+
+LB_ARN = 'arn:aws:elasticloadbalancing:ap-northeast-2:111111111111:loadbalancer/app/web/1'
+
+
+def _rule(port, cidrs=(), groups=()):
+    return {'IpProtocol': 'tcp', 'FromPort': port, 'ToPort': port, 'CidrBlocks': cidrs, 'GroupIds': groups}
+
+
+def _estate(target_groups=None):
+    """퍼블릭 서브넷(ELB, NAT) + 프라이빗 서브넷(앱 2대, DB): 앱 A만 ELB SG에서 8080 허용"""
+    all_out = [{'IpProtocol': '-1', 'CidrBlocks': ('0.0.0.0/0',)}]
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available'}],
+        'subnets': [
+            {'SubnetId': 'subnet-pub', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/24', 'AvailabilityZone': 'a'},
+            {'SubnetId': 'subnet-app', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.1.0/24', 'AvailabilityZone': 'a'},
+        ],
+        'route_tables': [
+            {'RouteTableId': 'rtb-pub', 'VpcId': 'vpc-1', 'Associations': [{'SubnetId': 'subnet-pub'}],
+             'Routes': [{'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local'},
+                        {'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}]},
+            {'RouteTableId': 'rtb-app', 'VpcId': 'vpc-1', 'Associations': [{'SubnetId': 'subnet-app'}],
+             'Routes': [{'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local'},
+                        {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1'}]},
+        ],
+        'igws': [{'InternetGatewayId': 'igw-1', 'Attachments': [{'VpcId': 'vpc-1', 'State': 'available'}]}],
+        'nats': [{'NatGatewayId': 'nat-1', 'SubnetId': 'subnet-pub', 'VpcId': 'vpc-1', 'State': 'available'}],
+        'instances': [
+            {'InstanceId': 'i-a', 'SubnetId': 'subnet-app', 'VpcId': 'vpc-1', 'State': 'running',
+             'PrivateIpAddress': '10.0.1.10', 'SecurityGroups': ('sg-app-a',)},
+            {'InstanceId': 'i-b', 'SubnetId': 'subnet-app', 'VpcId': 'vpc-1', 'State': 'running',
+             'PrivateIpAddress': '10.0.1.11', 'SecurityGroups': ('sg-app-b',)},
+        ],
+        'rds_instances': [
+            {'DBInstanceIdentifier': 'db-1', 'VpcId': 'vpc-1', 'SubnetIds': ('subnet-app',),
+             'AvailabilityZone': 'a', 'Engine': 'postgres', 'SecurityGroups': ('sg-db',)},
+        ],
+        'load_balancers': [
+            {'LoadBalancerName': 'web', 'LoadBalancerArn': LB_ARN, 'VpcId': 'vpc-1', 'Scheme': 'internet-facing',
+             'SubnetIds': ('subnet-pub',), 'SecurityGroups': ('sg-elb',)},
+        ],
+        'network_interfaces': [],
+        'security_groups': [
+            {'GroupId': 'sg-elb', 'VpcId': 'vpc-1', 'IngressRules': [_rule(443, cidrs=('0.0.0.0/0',))],
+             'EgressRules': all_out},
+            {'GroupId': 'sg-app-a', 'VpcId': 'vpc-1', 'EgressRules': all_out,
+             'IngressRules': [_rule(22, cidrs=('10.0.0.0/8',)), _rule(8080, groups=('sg-elb',))]},
+            {'GroupId': 'sg-app-b', 'VpcId': 'vpc-1', 'EgressRules': all_out,
+             'IngressRules': [_rule(22, cidrs=('10.0.0.0/8',))]},
+            {'GroupId': 'sg-db', 'VpcId': 'vpc-1', 'EgressRules': [],
+             'IngressRules': [_rule(5432, groups=('sg-app-a',))]},
+        ],
+        'network_acls': [],
+    }
+    if target_groups is not None:
+        data['target_groups'] = target_groups
+    return {name: from_dicts(name, items) for name, items in data.items()}
+
+
+def _edges(data):
+    routes = RouteIndex(data['route_tables'])
+    topology = TopologyIndex(data, classify=routes.classify)
+    return set(ReachabilityIndex(data, topology, routes).edges())
+
+
+def _target_group(port, lb_arns=(LB_ARN,), protocol='HTTP', target_type='instance'):
+    return {'TargetGroupArn': f'arn:tg/{port}', 'Protocol': protocol, 'Port': port, 'TargetType': target_type,
+            'VpcId': 'vpc-1', 'LoadBalancerArns': lb_arns}
+
+
+def test_elb_edges_use_target_group_port():
+    edges = _edges(_estate([_target_group(8080)]))
+
+    elb_edges = {edge for edge in edges if edge[0][0] == 'elb'}
+    # 앱 B는 사내망 SSH 규칙만 있으므로 ELB 간선이 없어야 함
+    assert elb_edges == {(('elb', LB_ARN), ('ec2', 'i-a'), 8080)}
+
+
+def test_elb_without_instance_target_groups_has_no_edges():
+    edges = _edges(_estate([_target_group(8080, lb_arns=()), _target_group(80, target_type='lambda')]))
+
+    assert not any(edge[0][0] == 'elb' for edge in edges)
+
+
+def test_fallback_without_target_groups_ignores_cidr_only_ports():
+    edges = _edges(_estate())
+
+    elb_edges = {edge for edge in edges if edge[0][0] == 'elb'}
+    assert elb_edges == {(('elb', LB_ARN), ('ec2', 'i-a'), 8080)}
+
+
+def test_rds_and_nat_edges():
+    edges = _edges(_estate([_target_group(8080)]))
+
+    assert (('ec2', 'i-a'), ('rds', 'db-1'), 5432) in edges
+    assert (('ec2', 'i-b'), ('rds', 'db-1'), 5432) not in edges
+    assert (('ec2', 'i-a'), ('nat', 'nat-1'), 443) in edges
+
+
+def _index(data):
+    routes = RouteIndex(data['route_tables'])
+    return ReachabilityIndex(data, TopologyIndex(data, classify=routes.classify), routes)
+
+
+def test_explain_reports_route_and_blocking_security_group():
+    index = _index(_estate([_target_group(8080)]))
+
+    allowed = reach(index, 'i-a', 'db-1', 5432)
+    assert allowed['reachable'] and allowed['via'] == 'local'
+    assert allowed['blocked_by'] is None
+
+    denied = reach(index, 'i-b', 'db-1', 5432)
+    assert not denied['reachable']
+    assert denied['blocked_by']['layer'] == 'security_group'
+    assert (denied['blocked_by']['direction'], denied['blocked_by']['groups']) == ('ingress', ['sg-db'])
+
+    internet = reach(index, 'i-a', 'internet', 443)
+    assert internet['via'] == 'nat'
+    assert internet['route']['NatGatewayId'] == 'nat-1'
+
+
+def test_explain_reports_nacl_rule_number():
+    data = _estate([_target_group(8080)])
+    data['network_acls'] = from_dicts('network_acls', [{
+        'NetworkAclId': 'acl-app', 'VpcId': 'vpc-1', 'SubnetIds': ('subnet-app',),
+        'Entries': [
+            {'RuleNumber': 90, 'Protocol': '6', 'RuleAction': 'deny', 'Egress': False, 'CidrBlock': '0.0.0.0/0',
+             'FromPort': 8080, 'ToPort': 8080},
+            {'RuleNumber': 100, 'Protocol': '-1', 'RuleAction': 'allow', 'Egress': False, 'CidrBlock': '0.0.0.0/0'},
+            {'RuleNumber': 100, 'Protocol': '-1', 'RuleAction': 'allow', 'Egress': True, 'CidrBlock': '0.0.0.0/0'},
+        ],
+    }])
+    index = _index(data)
+
+    result = reach(index, 'web', 'i-a', 8080)
+    assert not result['reachable']
+    assert result['blocked_by'] == {'layer': 'nacl', 'id': 'acl-app', 'subnet_id': 'subnet-app',
+                                    'direction': 'ingress', 'protocol': 'tcp', 'port': 8080, 'rule': 90}
+    assert not any(edge[0][0] == 'elb' for edge in index.edges())
+
+
+def test_reach_unknown_resource_or_internet_source():
+    index = _index(_estate())
+
+    assert reach(index, 'i-missing', 'db-1', 5432) is None
+    assert reach(index, 'internet', 'i-a', 22) is None
+    assert reach(index, LB_ARN, 'i-a', 8080)['reachable']
+
+
+def _peered_estate(back_route=True):
+    """vpc-1 앱 서브넷과 피어링된 vpc-2 DB (sg-db2는 vpc-1 대역에서 5432 허용)"""
+    data = _estate([_target_group(8080)])
+    routes = [dict(table) for table in data['route_tables']]
+    routes[1]['Routes'] = list(routes[1]['Routes']) + [
+        {'DestinationCidrBlock': '10.1.0.0/16', 'VpcPeeringConnectionId': 'pcx-1'}]
+    back = [{'DestinationCidrBlock': '10.0.0.0/16', 'VpcPeeringConnectionId': 'pcx-1'}] if back_route else []
+    routes.append({'RouteTableId': 'rtb-db', 'VpcId': 'vpc-2', 'Associations': [{'SubnetId': 'subnet-db'}],
+                   'Routes': [{'DestinationCidrBlock': '10.1.0.0/16', 'GatewayId': 'local'}] + back})
+    data['route_tables'] = from_dicts('route_tables', routes)
+    data['vpcs'] = from_dicts('vpcs', list(data['vpcs']) + [
+        {'VpcId': 'vpc-2', 'CidrBlock': '10.1.0.0/16', 'State': 'available'}])
+    data['subnets'] = from_dicts('subnets', list(data['subnets']) + [
+        {'SubnetId': 'subnet-db', 'VpcId': 'vpc-2', 'CidrBlock': '10.1.0.0/24', 'AvailabilityZone': 'a'}])
+    data['rds_instances'] = from_dicts('rds_instances', list(data['rds_instances']) + [
+        {'DBInstanceIdentifier': 'db-2', 'VpcId': 'vpc-2', 'SubnetIds': ('subnet-db',),
+         'AvailabilityZone': 'a', 'Engine': 'postgres', 'SecurityGroups': ('sg-db2',)}])
+    data['security_groups'] = from_dicts('security_groups', list(data['security_groups']) + [
+        {'GroupId': 'sg-db2', 'VpcId': 'vpc-2', 'EgressRules': [],
+         'IngressRules': [_rule(5432, cidrs=('10.0.1.10/32',))]}])
+    return data
+
+
+def test_rds_edges_cross_vpc_peering():
+    edges = _edges(_peered_estate())
+
+    assert (('ec2', 'i-a'), ('rds', 'db-2'), 5432) in edges
+    assert (('ec2', 'i-b'), ('rds', 'db-2'), 5432) not in edges
+    assert (('ec2', 'i-a'), ('rds', 'db-1'), 5432) in edges
+
+    # 돌아오는 라우트가 없으면 피어링 경로로 보지 않음
+    assert not any(edge[1] == ('rds', 'db-2') for edge in _edges(_peered_estate(back_route=False)))
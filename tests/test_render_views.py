@@ -0,0 +1,109 @@
+"""VPC별 뷰 렌더링: 상세 보기 링크 형식과 이전 실행 결과 정리"""
+import os
+import time
+
+from dot_render import DotEmitter
+from lod import LevelOfDetail
+from model import from_dicts
+from render_views import cache_name, prune_cache, prune_outputs, render_cached, render_views
+from topology import TopologyIndex
+
+DAY = 24 * 3600
+
+
+def _estate(*vpc_ids):
+    """VPC마다 서브넷 하나와 EC2 두 대"""
+    data = {'vpcs': [], 'subnets': [], 'instances': [], 'route_tables': [], 'igws': [], 'nats': [],
+            'rds_instances': [], 'load_balancers': [], 'network_interfaces': []}
+    for n, vpc_id in enumerate(vpc_ids):
+        subnet_id = f"subnet-{vpc_id}"
+        data['vpcs'].append({'VpcId': vpc_id, 'CidrBlock': f"10.{n}.0.0/16", 'State': 'available'})
+        data['subnets'].append({'SubnetId': subnet_id, 'VpcId': vpc_id, 'CidrBlock': f"10.{n}.0.0/24",
+                                'AvailabilityZone': 'ap-northeast-2a'})
+        data['instances'].extend({'InstanceId': f"i-{vpc_id}-{i}", 'SubnetId': subnet_id, 'VpcId': vpc_id,
+                                  'InstanceType': 't3.micro', 'State': 'running'} for i in range(2))
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    return data, TopologyIndex(data, classify=lambda subnet: 'private')
+
+
+def _render(tmp_path, *vpc_ids, fmt='png'):
+    data, topology = _estate(*vpc_ids)
+    render_views(data, topology, fmt=fmt, lod=LevelOfDetail(threshold=1),
+                 output_dir=str(tmp_path / 'views'), cache_dir=str(tmp_path / 'cache'), workers=1)
+
+
+def test_drilldown_url_uses_output_format():
+    emitter = DotEmitter(drilldown_dir=os.path.join('views', 'vpc-1_drilldown'), drilldown_format='png')
+
+    assert emitter.drilldown_url('subnet-1') == os.path.join('vpc-1_drilldown', 'subnet-1.png')
+
+
+def test_views_link_drilldowns_in_output_format(tmp_path):
+    _render(tmp_path, 'vpc-1')
+
+    view = (tmp_path / 'views' / 'vpc-1.dot').read_text(encoding='utf-8')
+    assert 'subnet-vpc-1.png' in view
+    assert 'subnet-vpc-1.svg' not in view
+
+
+def test_removed_vpc_outputs_are_pruned(tmp_path):
+    _render(tmp_path, 'vpc-1', 'vpc-2')
+    assert (tmp_path / 'views' / 'vpc-2_drilldown').is_dir()
+
+    _render(tmp_path, 'vpc-1')
+
+    views = tmp_path / 'views'
+    assert not (views / 'vpc-2.dot').exists()
+    assert not (views / 'vpc-2_drilldown').exists()
+    assert (views / 'vpc-1.dot').exists()
+    assert (views / 'vpc-1_drilldown' / 'subnet-vpc-1.dot').exists()
+
+
+def test_prune_outputs_keeps_current_format_and_other_files(tmp_path):
+    for name in ('overview.dot', 'overview.png', 'overview.svg', 'vpc-1.png', 'vpc-gone.png', 'notes.txt'):
+        (tmp_path / name).write_text('')
+
+    removed = prune_outputs(str(tmp_path), {str(tmp_path): {'overview', 'vpc-1'}}, 'png')
+
+    assert removed == 2
+    assert sorted(os.listdir(tmp_path)) == ['notes.txt', 'overview.dot', 'overview.png', 'vpc-1.png']
+
+
+def test_prune_cache_keeps_current_and_recent_entries(tmp_path):
+    now = time.time()
+    ages = {'current.png': 30 * DAY, 'recent.png': DAY, 'stale.png': 8 * DAY, 'older.svg': 9 * DAY}
+    for name, age in ages.items():
+        (tmp_path / name).write_text('')
+        os.utime(tmp_path / name, (now - age, now - age))
+
+    removed = prune_cache(str(tmp_path), {'current.png'}, max_age=7 * DAY, now=now)
+
+    assert removed == 2
+    assert sorted(os.listdir(tmp_path)) == ['current.png', 'recent.png']
+
+
+def test_prune_cache_caps_unused_entries_oldest_first(tmp_path):
+    now = time.time()
+    for n in range(5):
+        (tmp_path / f"{n}.svg").write_text('')
+        os.utime(tmp_path / f"{n}.svg", (now - n, now - n))
+
+    removed = prune_cache(str(tmp_path), {'0.svg'}, max_entries=3, now=now)
+
+    assert removed == 2
+    assert sorted(os.listdir(tmp_path)) == ['0.svg', '1.svg', '2.svg']
+    assert prune_cache(str(tmp_path / 'missing'), set()) == 0
+
+
+def test_cache_hit_rewrites_dot_next_to_output(tmp_path):
+    dot_text = 'digraph { a -> b }\n'
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / cache_name(dot_text, 'svg')).write_text('<svg/>')
+    (tmp_path / 'view.dot').write_text('digraph { stale }\n')
+
+    output, hit = render_cached(dot_text, str(tmp_path / 'view.svg'), 'svg', cache_dir=str(cache_dir))
+
+    assert hit and output == str(tmp_path / 'view.svg')
+    assert (tmp_path / 'view.svg').read_text() == '<svg/>'
+    assert (tmp_path / 'view.dot').read_text() == dot_text
@@ -0,0 +1,98 @@
+"""스트리밍 보고서: 레코드 순서와 Text / JSON Lines / CSV / Markdown 싱크"""
+import csv
+import io
+import json
+
+from model import from_dicts
+from report_writers import SINKS, CsvSink, JsonLinesSink, MarkdownSink, TextSink, report_records, write_report
+from topology import TopologyIndex
+
+LAYOUT = ('small', 1.0, 'TB')
+
+
+def _estate():
+    """VPC 하나, 서브넷 둘 (Lambda ENI 포함), RDS 부분 수집, 리전 조회 실패 한 건"""
+    data = {
+        'vpcs': [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available',
+                  'Tags': ({'Key': 'Name', 'Value': 'prod|main'},)}],
+        'subnets': [
+            {'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/24',
+             'AvailabilityZone': 'ap-northeast-2a', 'AvailableIpAddressCount': 250},
+            {'SubnetId': 'subnet-2', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.1.0/24',
+             'AvailabilityZone': 'ap-northeast-2b'},
+        ],
+        'instances': [{'InstanceId': 'i-1', 'SubnetId': 'subnet-1', 'VpcId': 'vpc-1', 'InstanceType': 't3.micro',
+                       'State': 'running'}],
+        'network_interfaces': [{'NetworkInterfaceId': 'eni-1', 'SubnetId': 'subnet-2', 'VpcId': 'vpc-1',
+                                'ResourceType': 'lambda', 'ResourceId': 'orders'}],
+        'route_tables': [], 'igws': [], 'nats': [], 'rds_instances': [], 'load_balancers': [],
+    }
+    data = {name: from_dicts(name, items) for name, items in data.items()}
+    data['partial'] = {'rds_instances': 'AccessDenied'}
+    data['scan_errors'] = [{'account': 'prod', 'region': None, 'error': 'UnauthorizedOperation'}]
+    return data, TopologyIndex(data, classify=lambda subnet: 'private')
+
+
+def _records():
+    data, topology = _estate()
+    return list(report_records(data, topology, LAYOUT, default_region='ap-northeast-2'))
+
+
+def _write(sink_class):
+    stream = io.StringIO()
+    write_report(iter(_records()), [sink_class(stream)])
+    return stream.getvalue()
+
+
+def test_records_are_ordered_by_section():
+    kinds = [kind for kind, _ in _records()]
+
+    assert kinds[0] == 'header'
+    assert kinds.index('service_count') > kinds.index('count')
+    assert kinds[-5:] == ['partial', 'scan_error', 'vpc', 'subnet', 'subnet']
+
+
+def test_text_sink():
+    text = _write(TextSink)
+
+    assert "Region: ap-northeast-2\n" in text
+    assert "RDS Instances: 0 (PARTIAL)\n" in text
+    assert "prod / all regions: UnauthorizedOperation\n" in text
+    assert "      Available IPs: N/A\n" in text
+    assert "VPC Services: orders (Lambda)" in text
+
+
+def test_jsonl_sink_writes_one_object_per_record():
+    lines = _write(JsonLinesSink).splitlines()
+
+    records = [json.loads(line) for line in lines]
+    assert len(records) == len(_records())
+    assert records[-1] == {**dict(_records()[-1][1]), 'type': 'subnet'}
+
+
+def test_csv_sink_writes_subnet_rows_only():
+    rows = list(csv.DictReader(io.StringIO(_write(CsvSink))))
+
+    assert [row['subnet_id'] for row in rows] == ['subnet-1', 'subnet-2']
+    assert rows[0]['vpc_name'] == 'prod|main'
+    assert rows[0]['available_ips'] == '250'
+    assert rows[1]['available_ips'] == ''
+    assert rows[1]['services'] == 'lambda:orders'
+
+
+def test_markdown_sink_escapes_cells_and_closes_tables():
+    markdown = _write(MarkdownSink)
+
+    assert "## VPC 1: prod\\|main\n" in markdown
+    assert "| RDS Instances (partial) | 0 |\n" in markdown
+    assert "- `prod / all regions`: UnauthorizedOperation\n" in markdown
+    # 섹션이 바뀔 때마다 표가 빈 줄로 끝나야 함
+    assert "| &nbsp;&nbsp;Lambda | 1 |\n\n## ⚠️ Partial Data" in markdown
+
+
+def test_all_sinks_share_one_pass():
+    streams = {name: io.StringIO() for name in SINKS}
+
+    write_report(iter(_records()), [SINKS[name](stream) for name, stream in streams.items()])
+
+    assert all(stream.getvalue() for stream in streams.values())
@@ -0,0 +1,68 @@
+"""라우트 테이블 인덱스: 서브넷 타입 분류와 최장 접두사 일치"""
+import pytest
+
+from model import from_dicts
+from routing import RouteIndex, covers_internet
+
+LOCAL = {'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local'}
+
+
+def _index(*routes, main=False):
+    association = {'Main': True} if main else {'SubnetId': 'subnet-1'}
+    table = {'RouteTableId': 'rtb-1', 'VpcId': 'vpc-1', 'Associations': [association],
+             'Routes': [LOCAL, *routes]}
+    return RouteIndex(from_dicts('route_tables', [table]))
+
+
+def _classify(*routes, **kwargs):
+    return _index(*routes, **kwargs).classify({'SubnetId': 'subnet-1', 'VpcId': 'vpc-1'})
+
+
+@pytest.mark.parametrize('routes, expected', [
+    ([{'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}], 'public'),
+    # 0.0.0.0/0 분할 라우트, 표본 주소에 없는 공인 대역
+    ([{'DestinationCidrBlock': '0.0.0.0/1', 'GatewayId': 'igw-1'},
+      {'DestinationCidrBlock': '128.0.0.0/1', 'GatewayId': 'igw-1'}], 'public'),
+    ([{'DestinationCidrBlock': '198.51.100.0/24', 'GatewayId': 'igw-1'}], 'public'),
+    ([{'DestinationIpv6CidrBlock': '::/0', 'GatewayId': 'igw-1'}], 'public'),
+    # 내용을 수집하지 않는 프리픽스 리스트 -> IGW
+    ([{'DestinationPrefixListId': 'pl-1', 'GatewayId': 'igw-1'}], 'public'),
+    ([{'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1'}], 'private'),
+    ([{'DestinationIpv6CidrBlock': '::/0', 'EgressOnlyInternetGatewayId': 'eigw-1'}], 'private'),
+    # 사설 대역만 IGW로 향하면 인터넷 경로가 아님
+    ([{'DestinationCidrBlock': '192.168.0.0/16', 'GatewayId': 'igw-1'}], 'isolated'),
+    ([{'DestinationCidrBlock': '172.16.0.0/12', 'NetworkInterfaceId': 'eni-1'}], 'isolated'),
+    ([{'DestinationCidrBlock': '10.1.0.0/16', 'TransitGatewayId': 'tgw-1'}], 'transit'),
+    ([{'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1', 'State': 'blackhole'}], 'isolated'),
+    ([{'DestinationPrefixListId': 'pl-s3', 'GatewayId': 'vpce-1'}], 'isolated'),
+    ([], 'isolated'),
+])
+def test_classify(routes, expected):
+    assert _classify(*routes) == expected
+
+
+def test_main_table_applies_to_unassociated_subnet():
+    assert _classify({'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}, main=True) == 'public'
+
+
+def test_unknown_without_route_table():
+    assert RouteIndex([]).classify({'SubnetId': 'subnet-1', 'VpcId': 'vpc-1'}) == 'unknown'
+
+
+def test_lookup_uses_longest_prefix():
+    index = _index({'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1'},
+                   {'DestinationCidrBlock': '10.1.0.0/16', 'VpcPeeringConnectionId': 'pcx-1'},
+                   {'DestinationCidrBlock': '10.1.2.0/24', 'TransitGatewayId': 'tgw-1'})
+    subnet = {'SubnetId': 'subnet-1', 'VpcId': 'vpc-1'}
+
+    assert index.lookup(subnet, '10.1.2.5')['TransitGatewayId'] == 'tgw-1'
+    assert index.lookup(subnet, '10.1.3.5')['VpcPeeringConnectionId'] == 'pcx-1'
+    assert index.lookup(subnet, '10.0.0.5')['GatewayId'] == 'local'
+    assert index.lookup(subnet, '8.8.8.8')['NatGatewayId'] == 'nat-1'
+
+
+def test_covers_internet():
+    assert covers_internet('0.0.0.0/0')
+    assert covers_internet('52.0.0.0/8')
+    assert not covers_internet('10.20.0.0/16')
+    assert not covers_internet('fd00::/8')
@@ -0,0 +1,87 @@
+"""스냅샷 저장/로드, 버전 검사, 타입별 TTL과 부분 수집 재수집 판정"""
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from model import from_dicts
+from snapshot import (SNAPSHOT_FORMAT, SNAPSHOT_VERSION, SnapshotError, latest_snapshot, load_snapshot,
+                      save_snapshot, stale_collections)
+
+NOW = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _data():
+    return {
+        'vpcs': from_dicts('vpcs', [{'VpcId': 'vpc-1', 'CidrBlock': '10.0.0.0/16', 'State': 'available',
+                                     'Tags': [{'Key': 'Name', 'Value': 'main'}]}]),
+        'route_tables': from_dicts('route_tables', [{
+            'RouteTableId': 'rtb-1', 'VpcId': 'vpc-1', 'Associations': [{'SubnetId': 'subnet-1'}],
+            'Routes': [{'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}],
+        }]),
+        'instances': [],
+        'scope': {'regions': ['ap-northeast-2']},
+        'partial': {'instances': 'RequestLimitExceeded'},
+    }
+
+
+def test_round_trip_keeps_records_metadata_and_fetch_times(tmp_path):
+    fetched_at = {'vpcs': NOW - timedelta(hours=2), 'route_tables': NOW}
+    path = save_snapshot(_data(), str(tmp_path), fetched_at=fetched_at)
+
+    data, loaded_at = load_snapshot(path)
+
+    assert latest_snapshot(str(tmp_path)) == path
+    assert [vpc.to_dict() for vpc in data['vpcs']] == [vpc.to_dict() for vpc in _data()['vpcs']]
+    assert data['route_tables'][0]['Routes'][0]['GatewayId'] == 'igw-1'
+    assert data['instances'] == []
+    assert data['scope'] == {'regions': ['ap-northeast-2']}
+    assert data['partial'] == {'instances': 'RequestLimitExceeded'}
+    assert loaded_at['vpcs'] == fetched_at['vpcs']
+    assert loaded_at['route_tables'] == NOW
+    # fetched_at이 없는 컬렉션은 저장 시각
+    assert loaded_at['instances'] > NOW
+
+
+def _write(path, snapshot):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    return str(path)
+
+
+def test_rejects_newer_version_wrong_format_and_corrupt_files(tmp_path):
+    newer = _write(tmp_path / 'newer.json.gz',
+                   {'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION + 1, 'collections': {}})
+    other = _write(tmp_path / 'other.json.gz', {'format': 'something-else', 'version': 1, 'collections': {}})
+    corrupt = tmp_path / 'corrupt.json.gz'
+    corrupt.write_bytes(b'not gzip')
+
+    with pytest.raises(SnapshotError, match='버전'):
+        load_snapshot(newer)
+    with pytest.raises(SnapshotError, match='형식'):
+        load_snapshot(other)
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(corrupt))
+
+
+def test_stale_collections_uses_per_type_ttl():
+    fetched_at = {
+        'vpcs': NOW - timedelta(hours=23),
+        'instances': NOW - timedelta(minutes=16),
+        'route_tables': NOW - timedelta(minutes=59),
+    }
+    names = ['vpcs', 'instances', 'route_tables', 'subnets']
+
+    assert stale_collections(fetched_at, names, now=NOW) == ['instances', 'subnets']
+    assert stale_collections(fetched_at, names, now=NOW + timedelta(hours=2)) == names
+    assert stale_collections(fetched_at, ['vpcs'], ttls={'vpcs': timedelta(hours=1)}, now=NOW) == ['vpcs']
+    # TTL이 정의되지 않은 타입은 항상 재수집
+    assert stale_collections({'unknown': NOW - timedelta(seconds=1)}, ['unknown'], now=NOW) == ['unknown']
+
+
+def test_partial_collections_are_refetched_even_when_fresh():
+    fetched_at = {'vpcs': NOW, 'instances': NOW}
+
+    assert stale_collections(fetched_at, ['vpcs', 'instances'], now=NOW,
+                             partial={'instances': 'RequestLimitExceeded'}) == ['instances']
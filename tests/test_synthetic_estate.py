@@ -0,0 +1,35 @@
+"""합성 에스테이트: 서브넷 CIDR 기반 사설 IP와 VPC별 보안 그룹"""
+import ipaddress
+from collections import Counter
+
+from synthetic_estate import generate_estate
+
+
+def test_private_ips_come_from_their_subnet_cidr():
+    estate = generate_estate(vpcs=3, subnets_per_vpc=4, instances=60, rds=4, elbs=3)
+    subnets = {subnet['SubnetId']: ipaddress.ip_network(subnet['CidrBlock']) for subnet in estate['DescribeSubnets']}
+
+    instances = [instance for reservation in estate['DescribeInstances'] for instance in reservation['Instances']]
+    items = instances + estate['DescribeNetworkInterfaces']
+    addresses = [item['PrivateIpAddress'] for item in items]
+    for item in items:
+        assert ipaddress.ip_address(item['PrivateIpAddress']) in subnets[item['SubnetId']]
+    assert len(set(addresses)) == len(addresses)
+
+    used = Counter(item['SubnetId'] for item in items)
+    for subnet in estate['DescribeSubnets']:
+        assert subnet['AvailableIpAddressCount'] == 251 - used[subnet['SubnetId']]
+
+
+def test_every_vpc_has_its_own_security_groups():
+    estate = generate_estate(vpcs=3, instances=30, rds=3, elbs=3)
+    groups = {group['GroupId']: group['VpcId'] for group in estate['DescribeSecurityGroups']}
+
+    assert Counter(groups.values()) == {vpc['VpcId']: 52 for vpc in estate['DescribeVpcs']}
+    for reservation in estate['DescribeInstances']:
+        instance = reservation['Instances'][0]
+        assert all(groups[sg['GroupId']] == instance['VpcId'] for sg in instance['SecurityGroups'])
+    for db in estate['DescribeDBInstances']:
+        assert groups[db['VpcSecurityGroups'][0]['VpcSecurityGroupId']] == db['DBSubnetGroup']['VpcId']
+    for lb in estate['DescribeLoadBalancers']:
+        assert groups[lb['SecurityGroups'][0]] == lb['VpcId']
@@ -0,0 +1,54 @@
+"""토폴로지 인덱스: 서브넷별 EC2/RDS/ELB/NAT 배치와 리소스 수 집계"""
+from routing import RouteIndex
+from topology import TopologyIndex
+
+
+def _ids(resources, key, id_key):
+    return sorted(resource[id_key] for resource in resources[key])
+
+
+def test_resources_are_placed_per_subnet(small_estate):
+    topology = TopologyIndex(small_estate)
+
+    placed = {
+        subnet_id: (_ids(resources, 'instances', 'InstanceId'),
+                    _ids(resources, 'rds_instances', 'DBInstanceIdentifier'),
+                    _ids(resources, 'load_balancers', 'LoadBalancerName'))
+        for subnet_id, resources in topology.subnet_resources.items()
+    }
+    assert placed == {
+        'subnet-pub-a': (['i-3'], [], ['web']),
+        'subnet-pub-b': ([], [], ['web']),
+        # 단일 AZ DB는 자기 AZ 서브넷에만, Multi-AZ DB는 보조 AZ 서브넷에도
+        'subnet-app-a': (['i-1'], ['db-multi', 'db-single'], []),
+        'subnet-app-b': (['i-2'], ['db-multi'], []),
+    }
+    assert [nat['NatGatewayId'] for nat in topology.subnet_nats['subnet-pub-a']] == ['nat-1']
+    assert [igw['InternetGatewayId'] for igw in topology.vpc_igws['vpc-1']] == ['igw-1']
+
+
+def test_counts_roll_up_subnet_az_and_vpc(small_estate):
+    topology = TopologyIndex(small_estate)
+
+    assert topology.subnet_count('subnet-app-a') == 3
+    assert topology.az_count('vpc-1', 'ap-northeast-2a') == 5
+    assert topology.az_count('vpc-1', 'ap-northeast-2b') == 3
+    assert topology.vpc_count('vpc-1') == 8
+    assert topology.subnet_count('subnet-missing') == 0
+    assert list(topology.vpc_azs['vpc-1']) == ['ap-northeast-2a', 'ap-northeast-2b']
+
+
+def test_subnet_type_is_classified_once(small_estate):
+    routes = RouteIndex(small_estate['route_tables'])
+    calls = []
+
+    def classify(subnet):
+        calls.append(subnet['SubnetId'])
+        return routes.classify(subnet)
+
+    topology = TopologyIndex(small_estate, classify=classify)
+    assert topology.subnet_type('subnet-pub-a') == 'public'
+    assert topology.subnet_type('subnet-app-a') == 'private'
+    assert topology.subnet_type('subnet-pub-a') == 'public'
+    assert calls == ['subnet-pub-a', 'subnet-app-a']
+    assert TopologyIndex(small_estate).subnet_type('subnet-pub-a') == 'unknown'
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""수집 데이터를 VPC -> AZ -> 서브넷 -> 리소스 구조로 한 번에 인덱싱"""
+from collections import defaultdict
+
+from placement import InterfacePlacement
+
+RESOURCE_KEYS = ('instances', 'rds_instances', 'load_balancers', 'services')
+
+
+class TopologyIndex:
+    """수집 직후 한 번 생성하여 다이어그램/보고서/요약이 공유하는 토폴로지 인덱스"""
+
+    def __init__(self, data, classify=None):
+        self.data = data
+        self.classify = classify
+        self.vpcs = {}
+        self.subnets = {}
+        self.vpc_subnets = defaultdict(list)
+        self.vpc_azs = defaultdict(lambda: defaultdict(list))
+        self.vpc_igws = defaultdict(list)
+        self.subnet_nats = defaultdict(list)
+        self.services = []
+        self.subnet_resources = {}
+        self.subnet_counts = {}
+        self.az_counts = defaultdict(int)
+        self.vpc_counts = defaultdict(int)
+        self._subnet_types = {}
+
+        self._build()
+
+    def _build(self):
+        """단일 패스 인덱스 구성 (전체 비용 O(VPC + 서브넷 + 리소스))"""
+        data = self.data
+
+        for vpc in data['vpcs']:
+            self.vpcs[vpc['VpcId']] = vpc
+
+        for subnet in data['subnets']:
+            subnet_id = subnet['SubnetId']
+            self.subnets[subnet_id] = subnet
+            self.vpc_subnets[subnet['VpcId']].append(subnet)
+            self.vpc_azs[subnet['VpcId']][subnet['AvailabilityZone']].append(subnet)
+            self.subnet_resources[subnet_id] = {key: [] for key in RESOURCE_KEYS}
+
+        # RDS / ELB는 실제 ENI가 있는 서브넷에, 나머지 VPC 연결 서비스는 ENI로 배치
+        placement = InterfacePlacement(data.get('network_interfaces', []))
+        subnet_azs = {subnet_id: subnet['AvailabilityZone'] for subnet_id, subnet in self.subnets.items()}
+        self.services = list(placement.services.values())
+
+        for instance in data['instances']:
+            self._place('instances', instance, [instance.get('SubnetId')])
+        for rds in data['rds_instances']:
+            self._place('rds_instances', rds, placement.db_subnets(rds, subnet_azs))
+        for elb in data['load_balancers']:
+            self._place('load_balancers', elb, placement.load_balancer_subnets(elb))
+        for service in self.services:
+            self._place('services', service, service['SubnetIds'])
+
+        for igw in data['igws']:
+            for attachment in igw.get('Attachments', []):
+                if attachment.get('State') == 'available':
+                    self.vpc_igws[attachment.get('VpcId')].append(igw)
+
+        for nat in data['nats']:
+            if nat.get('SubnetId') in self.subnets:
+                self.subnet_nats[nat['SubnetId']].append(nat)
+
+        # 서브넷 -> AZ -> VPC 리소스 수 집계
+        for subnet_id, resources in self.subnet_resources.items():
+            subnet = self.subnets[subnet_id]
+            count = sum(len(items) for items in resources.values())
+            self.subnet_counts[subnet_id] = count
+            self.az_counts[(subnet['VpcId'], subnet['AvailabilityZone'])] += count
+            self.vpc_counts[subnet['VpcId']] += count
+
+    def _place(self, key, resource, subnet_ids):
+        """리소스를 소속 서브넷(들)에 배치"""
+        for subnet_id in subnet_ids:
+            resources = self.subnet_resources.get(subnet_id)
+            if resources is not None:
+                resources[key].append(resource)
+
+    def resources(self, subnet_id):
+        """서브넷의 리소스 (instances / rds_instances / load_balancers / services)"""
+        return self.subnet_resources[subnet_id]
+
+    def subnet_count(self, subnet_id):
+        """서브넷 리소스 수"""
+        return self.subnet_counts.get(subnet_id, 0)
+
+    def az_count(self, vpc_id, az):
+        """VPC 내 AZ별 리소스 수"""
+        return self.az_counts.get((vpc_id, az), 0)
+
+    def vpc_count(self, vpc_id):
+        """VPC 리소스 수"""
+        return self.vpc_counts.get(vpc_id, 0)
+
+    def subnet_type(self, subnet_id):
+        """서브넷 타입 (서브넷당 한 번만 분류)"""
+        if subnet_id not in self._subnet_types:
+            if self.classify is None:
+                self._subnet_types[subnet_id] = 'unknown'
+            else:
+                self._subnet_types[subnet_id] = self.classify(self.subnets[subnet_id])
+        return self._subnet_types[subnet_id]